@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Compare building a Yaco from a large parsed yaml document with
+Yaco.from_data against the per-value update path the constructor
+used before (a Yaco & isinstance dispatch for every nested value)
+
+    python bench/bench_build.py [--keys 50000] [--repeat 3]
+"""
+from __future__ import print_function
+
+import argparse
+import marshal
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Yaco
+
+
+def make_data(keys):
+    """
+    A parsed document with `keys` leaf keys, in sections of 100
+    """
+    data = {}
+    for i in range(keys // 5):
+        section = data.setdefault('section_{0}'.format(i // 20), {})
+        section['key_{0}'.format(i)] = {
+            'name': 'value {0}'.format(i),
+            'number': i * 1.5,
+            'enabled': bool(i % 2),
+            'items': [i, {'nested': i}]}
+    return data
+
+
+class LegacyYaco(Yaco.Yaco):
+
+    """
+    A Yaco built as the constructor did before from_data: through
+    update, _list_parser & a new Yaco for every nested dict
+    """
+
+    def __init__(self, data={}):
+        dict.__init__(self)
+        if data:
+            self.update(data)
+
+    def _branch(self, value={}):
+        return LegacyYaco(value)
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--keys', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    raw = Yaco._yaml_dump(make_data(args.keys))
+    # builds change (trusted) data in place: build from fresh copies
+    blob = marshal.dumps(Yaco._yaml_load(raw))
+    print("{0} keys, {1} bytes of yaml".format(args.keys, len(raw)))
+
+    load = best_of(args.repeat, lambda: Yaco._yaml_load(raw))
+    fresh = best_of(args.repeat, lambda: marshal.loads(blob))
+    legacy = best_of(
+        args.repeat, lambda: LegacyYaco(marshal.loads(blob))) - fresh
+    bulk = best_of(
+        args.repeat, lambda: Yaco.Yaco.from_data(marshal.loads(blob))) - fresh
+    print(" yaml load: {0:8.3f}s".format(load))
+    print("    legacy: {0:8.3f}s".format(legacy))
+    print(" from_data: {0:8.3f}s".format(bulk))
+    print("   speedup: {0:7.1f}x".format(legacy / bulk))
+
+if __name__ == '__main__':
+    main()
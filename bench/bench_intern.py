@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Compare the memory held by a YacoDir loaded with & without interning
+of keys (and short string values) - config files repeat the same keys
+across files & list elements
+
+    python bench/bench_intern.py [--files 200] [--records 100]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Yaco
+
+
+def make_tree(dirname, files, records):
+    """
+    Generate `files` config files, each with a list of `records`
+    records that share their keys
+    """
+    for i in range(files):
+        y = Yaco.Yaco()
+        y.service.name = 'service {0}'.format(i)
+        y.service.hosts = [{
+            'hostname': 'host-{0}-{1}'.format(i, j),
+            'port': 8000 + j,
+            'protocol': ('http', 'https')[j % 2],
+            'healthcheck': {'path': '/health', 'interval': 30},
+            'environment': ('production', 'staging')[j % 2]}
+            for j in range(records)]
+        y.save(os.path.join(dirname, 'file_{0:04d}.config'.format(i)))
+
+
+def measure(dirname):
+    """
+    Return the memory held by a freshly loaded YacoDir, the time it
+    took & the intern statistics
+    """
+    gc.collect()
+    Yaco.intern_stats(reset=True)
+    tracemalloc.start()
+    start = time.time()
+    tree = Yaco.YacoDir(dirname, cache=False)
+    took = time.time() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return size, took, Yaco.intern_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--records', type=int, default=100)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        make_tree(tmpdir, args.files, args.records)
+        print("{0} files, {1} records each".format(args.files, args.records))
+        results = []
+        old = Yaco.INTERN_KEYS, Yaco.INTERN_VALUES
+        for label, keys, values in (('none', False, 0),
+                                    ('keys', True, 0),
+                                    ('keys+values', True, 16)):
+            Yaco.INTERN_KEYS, Yaco.INTERN_VALUES = keys, values
+            results.append((label, measure(tmpdir)))
+        Yaco.INTERN_KEYS, Yaco.INTERN_VALUES = old
+
+        for label, (size, took, stats) in results:
+            print("{0:>12}: {1:8.1f} MiB  {2:6.2f}s  {3} duplicates, "
+                  "{4:.1f} MiB saved".format(
+                      label, size / 1024.0 / 1024, took,
+                      stats['duplicates'],
+                      stats['bytes_saved'] / 1024.0 / 1024))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Compare the memory used by a Yaco and a CompactYaco holding the same
+generated tree (of about a million keys, by default)
+
+    python bench/bench_memory.py [--records 125000]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Yaco
+
+
+def make_data(records):
+    """
+    `records` records of 8 keys each, with a few lists & nested dicts
+    """
+    return dict([
+        ('record_{0}'.format(i), {
+            'id': i,
+            'name': 'record {0}'.format(i % 1000),
+            'enabled': bool(i % 2),
+            'tags': [i % 7, i % 11, i % 13],
+            'position': {'x': i * 0.5, 'y': i * 0.25},
+            'owner': {'name': 'team {0}'.format(i % 10)}})
+        for i in range(records)])
+
+
+def measure(build, data):
+    """
+    Return the memory held by the result of build(data) & the time it
+    took
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    result = build(data)
+    took = time.time() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, took
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--records', type=int, default=125000)
+    args = parser.parse_args()
+
+    data = make_data(args.records)
+    print("{0} records, {1} keys".format(args.records, args.records * 8))
+    results = [
+        ('Yaco', measure(
+            lambda d: Yaco.Yaco.from_data(d, trusted=False), data)),
+        ('CompactYaco', measure(Yaco.CompactYaco, data)),
+    ]
+    for label, (size, took) in results:
+        print("{0:>12}: {1:8.1f} MiB  {2:6.2f}s".format(
+            label, size / 1024.0 / 1024, took))
+    print("{0:>12}: {1:8.1f}x".format(
+        'saving', float(results[0][1][0]) / results[1][1][0]))
+
+
+if __name__ == '__main__':
+    main()
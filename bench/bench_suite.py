@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+"""
+Time the core Yaco operations & loaders on generated trees of growing
+size. Results can be saved as json & compared against an earlier run:
+the exit status is 1 if any benchmark got slower than the threshold
+
+    python bench/bench_suite.py [--sizes 100,1000,10000] [--repeat 5]
+        [--filter dotted] [--output results.json]
+        [--compare baseline.json] [--threshold 0.25]
+
+The results file looks like::
+
+    {"format": 1,
+     "python": "3.11.4",
+     "libyaml": true,
+     "repeat": 5,
+     "results": {"attr_get[1000]": 0.00031, ...}}
+
+with the best time (in seconds) of each benchmark & size. Sizes are
+numbers of records - 4 leaf keys & a list each, in sections of 100.
+import_yaco (without a size) is the import time of Yaco, as reported
+by python -X importtime.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import marshal
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+import Yaco
+
+RESULTS_FORMAT = 1
+
+timer = getattr(time, 'perf_counter', time.time)
+
+BENCHMARKS = []
+STARTUP_BENCHMARKS = []
+
+
+def benchmark(func):
+    """
+    Register a benchmark: func(ctx) returns a function to time &
+    (optionally) a function that prepares its argument for every run,
+    untimed. If the timed function returns a float, that is used as its
+    time (e.g. a time reported by a subprocess).
+    """
+    BENCHMARKS.append(func)
+    return func
+
+
+def startup_benchmark(func):
+    """
+    Register a benchmark that does not depend on the tree size: func()
+    returns a function to time
+    """
+    STARTUP_BENCHMARKS.append(func)
+    return func
+
+
+def run_python(code, *args):
+    """
+    Run code in a new python process (with Yaco on its path) - return
+    its stderr
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [SRC] + [p for p in [env.get('PYTHONPATH')] if p])
+    proc = subprocess.Popen(
+        [sys.executable] + list(args) + ['-c', code],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise Exception("python failed: {0}".format(err))
+    return err
+
+
+class Context(object):
+
+    """
+    The generated tree (as data, as a Yaco & its keys) of one size,
+    and a directory to write files to
+    """
+
+    def __init__(self, size, tmpdir):
+        self.size = size
+        self.tmpdir = tmpdir
+        self.data = make_data(size)
+        self.tree = Yaco.Yaco.from_data(self.data, trusted=False)
+        self.paths = [(section, key)
+                      for section in sorted(self.data)
+                      for key in sorted(self.data[section])]
+
+    def path(self, *parts):
+        path = os.path.join(self.tmpdir, *parts)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        return path
+
+    def save_sections(self, dirname):
+        """
+        Save every section as a config file of its own
+        """
+        for section, data in self.data.items():
+            # the constructor converts the lists of data in place
+            Yaco.Yaco.from_data(data, trusted=False).save(
+                self.path(dirname, '{0}.config'.format(section)))
+
+
+def make_data(size):
+    """
+    A parsed document of `size` records, in sections of 100
+    """
+    data = {}
+    for i in range(size):
+        section = data.setdefault('section_{0}'.format(i // 100), {})
+        section['key_{0}'.format(i)] = {
+            'name': 'value {0}'.format(i),
+            'number': i * 1.5,
+            'enabled': bool(i % 2),
+            'items': [i, {'nested': i}]}
+    return data
+
+
+@startup_benchmark
+def import_yaco():
+    def run(arg):
+        err = run_python('import Yaco', '-X', 'importtime')
+        for line in err.splitlines():
+            # import time: self [us] | cumulative | imported package
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == 'Yaco':
+                return int(fields[1]) / 1e6
+        raise Exception("no import time reported for Yaco")
+    return run
+
+
+@benchmark
+def startup_cached(ctx):
+    # a short running program: start python, import Yaco & load a
+    # cached YacoDir
+    ctx.save_sections('startup')
+    dirname = ctx.path('startup')
+    Yaco.YacoDir(dirname)
+    code = 'import Yaco; Yaco.YacoDir({0!r})'.format(dirname)
+
+    def run(arg):
+        run_python(code)
+    return run
+
+
+@benchmark
+def attr_get(ctx):
+    tree = ctx.tree
+
+    def run(arg):
+        for section, key in ctx.paths:
+            getattr(getattr(tree, section), key).name
+    return run
+
+
+@benchmark
+def attr_set(ctx):
+    tree = ctx.tree.copy()
+
+    def run(arg):
+        for section, key in ctx.paths:
+            getattr(getattr(tree, section), key).name = 'changed'
+    return run
+
+
+@benchmark
+def dotted_get(ctx):
+    tree = ctx.tree
+    keys = ['{0}.{1}.name'.format(*path) for path in ctx.paths]
+
+    def run(arg):
+        for key in keys:
+            tree[key]
+    return run
+
+
+@benchmark
+def dotted_set(ctx):
+    tree = ctx.tree.copy()
+    keys = ['{0}.{1}.name'.format(*path) for path in ctx.paths]
+
+    def run(arg):
+        for key in keys:
+            tree[key] = 'changed'
+    return run
+
+
+@benchmark
+def update(ctx):
+    # update converts the lists in data in place: use fresh copies
+    blob = marshal.dumps(ctx.data)
+
+    def run(data):
+        Yaco.Yaco().update(data)
+    return run, lambda: marshal.loads(blob)
+
+
+@benchmark
+def soft_update(ctx):
+    blob = marshal.dumps(ctx.data)
+
+    def run(arg):
+        tree, data = arg
+        tree.soft_update(data)
+    return run, lambda: (ctx.tree.copy(), marshal.loads(blob))
+
+
+@benchmark
+def get_data(ctx):
+    return lambda arg: ctx.tree.get_data()
+
+
+@benchmark
+def dump(ctx):
+    return lambda arg: ctx.tree.dump()
+
+
+@benchmark
+def save(ctx):
+    filename = ctx.path('save', 'tree.config')
+    return lambda arg: ctx.tree.save(filename)
+
+
+@benchmark
+def yacofile_load(ctx):
+    filename = ctx.path('file', 'tree.config')
+    ctx.tree.save(filename)
+    return lambda arg: Yaco.YacoFile(filename)
+
+
+@benchmark
+def yacodir_load(ctx):
+    ctx.save_sections('dir')
+    dirname = ctx.path('dir')
+    return lambda arg: Yaco.YacoDir(dirname, cache=False)
+
+
+@benchmark
+def yacodir_aload(ctx):
+    # all files parsed at the same time in the default executor
+    import asyncio
+    ctx.save_sections('dir_async')
+    dirname = ctx.path('dir_async')
+    return lambda arg: asyncio.run(Yaco.YacoDir.aload(dirname, cache=False))
+
+
+@benchmark
+def yacodir_cached(ctx):
+    ctx.save_sections('dir_cached')
+    dirname = ctx.path('dir_cached')
+    Yaco.YacoDir(dirname)
+    return lambda arg: Yaco.YacoDir(dirname)
+
+
+@benchmark
+def yacopkg_load(ctx):
+    pkg_name = 'yaco_bench_{0}'.format(ctx.size)
+    open(ctx.path('pkg', pkg_name, '__init__.py'), 'w').close()
+    ctx.save_sections(os.path.join('pkg', pkg_name, 'etc'))
+    if ctx.path('pkg') not in sys.path:
+        sys.path.insert(0, ctx.path('pkg'))
+    return lambda arg: Yaco.YacoPkg(pkg_name, 'etc/')
+
+
+@benchmark
+def yacopkg_indexed(ctx):
+    pkg_name = 'yaco_bench_indexed_{0}'.format(ctx.size)
+    open(ctx.path('pkg', pkg_name, '__init__.py'), 'w').close()
+    ctx.save_sections(os.path.join('pkg', pkg_name, 'etc'))
+    if ctx.path('pkg') not in sys.path:
+        sys.path.insert(0, ctx.path('pkg'))
+    Yaco.build_pkg_index(pkg_name)
+    return lambda arg: Yaco.YacoPkg(pkg_name, 'etc/')
+
+
+@benchmark
+def polyyaco_load(ctx):
+    # 4 layers, each overriding the names of a quarter of the records
+    files = []
+    for layer in range(4):
+        y = Yaco.Yaco(ctx.data)
+        for section, key in ctx.paths[layer::4]:
+            y[section][key].name = 'layer {0}'.format(layer)
+        files.append(ctx.path('poly', 'layer_{0}.config'.format(layer)))
+        y.save(files[-1])
+    return lambda arg: Yaco.PolyYaco(files=files)
+
+
+def best_of(repeat, run, prepare=None):
+    timings = []
+    for _ in range(repeat):
+        arg = prepare() if prepare is not None else None
+        start = timer()
+        took = run(arg)
+        end = timer()
+        timings.append(took if isinstance(took, float) else end - start)
+    return min(timings)
+
+
+def run_suite(sizes, repeat, selection=None):
+    """
+    Return {'name[size]': best time} for all (selected) benchmarks
+    """
+    results = {}
+    for func in STARTUP_BENCHMARKS:
+        name = func.__name__
+        if selection and selection not in name:
+            continue
+        results[name] = best_of(repeat, func())
+        print("{0:>24}: {1:10.5f}s".format(name, results[name]))
+    for size in sizes:
+        tmpdir = tempfile.mkdtemp()
+        try:
+            ctx = Context(size, tmpdir)
+            for func in BENCHMARKS:
+                name = '{0}[{1}]'.format(func.__name__, size)
+                if selection and selection not in name:
+                    continue
+                bench = func(ctx)
+                if not isinstance(bench, tuple):
+                    bench = (bench, None)
+                results[name] = best_of(repeat, *bench)
+                print("{0:>24}: {1:10.5f}s".format(name, results[name]))
+        finally:
+            shutil.rmtree(tmpdir)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the results against the baseline - return the names of the
+    benchmarks that are more than threshold (a fraction) slower
+    """
+    slower = []
+    print()
+    print("{0:>24}  {1:>10}  {2:>10}  {3:>6}".format(
+        'benchmark', 'baseline', 'now', 'ratio'))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name] / baseline[name] if baseline[name] else 1.0
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  SLOWER'
+            slower.append(name)
+        print("{0:>24}  {1:10.5f}  {2:10.5f}  {3:6.2f}{4}".format(
+            name, baseline[name], results[name], ratio, flag))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--sizes', default='100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--filter', help='only run benchmarks matching this')
+    parser.add_argument('--output', help='save the results (json)')
+    parser.add_argument('--compare', help='a results file to compare to')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown (fraction) - default 0.25')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = run_suite(sizes, args.repeat, args.filter)
+
+    if args.output:
+        with open(args.output, 'w') as F:
+            json.dump({'format': RESULTS_FORMAT,
+                       'python': platform.python_version(),
+                       'libyaml': Yaco._use_libyaml(),
+                       'repeat': args.repeat,
+                       'results': results}, F, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as F:
+            baseline = json.load(F)
+        if baseline.get('format') != RESULTS_FORMAT:
+            sys.exit("unknown results format in {0}".format(args.compare))
+        slower = compare(results, baseline['results'], args.threshold)
+        if slower:
+            print("{0} benchmark(s) more than {1:.0%} slower".format(
+                len(slower), args.threshold))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
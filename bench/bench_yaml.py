@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Compare the libyaml (C) and the pure python yaml loader & dumper on a
+generated configuration tree
+
+    python bench/bench_yaml.py [--files 200] [--keys 50] [--repeat 3]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Yaco
+
+
+def make_tree(dirname, files, keys):
+    """
+    Generate `files` config files, spread over a few subdirectories,
+    each with `keys` nested keys
+    """
+    for i in range(files):
+        sub = os.path.join(dirname, 'sub_{0}'.format(i % 10))
+        if not os.path.exists(sub):
+            os.makedirs(sub)
+        y = Yaco.Yaco()
+        for j in range(keys):
+            y['section_{0}.key_{1}'.format(j % 5, j)] = {
+                'name': 'value {0} {1}'.format(i, j),
+                'number': j * 1.5,
+                'enabled': bool(j % 2),
+                'items': list(range(j % 7))}
+        y.save(os.path.join(sub, 'file_{0:04d}.config'.format(i)))
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--keys', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not Yaco._use_libyaml():
+        print("PyYAML is not built with libyaml - nothing to compare")
+        return
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        make_tree(tmpdir, args.files, args.keys)
+        tree = Yaco.YacoDir(tmpdir, cache=False)
+        print("{0} files, {1} keys each".format(args.files, args.keys))
+        results = {}
+        for label, use_libyaml in (('python', False), ('libyaml', True)):
+            Yaco.USE_LIBYAML = use_libyaml
+            results[label] = (
+                best_of(args.repeat,
+                        lambda: Yaco.YacoDir(tmpdir, cache=False)),
+                best_of(args.repeat, tree.dump))
+        Yaco.USE_LIBYAML = None
+
+        for label in ('python', 'libyaml'):
+            load, dump = results[label]
+            print("{0:>8}: load {1:8.3f}s  dump {2:8.3f}s".format(
+                label, load, dump))
+        print(" speedup: load {0:7.1f}x  dump {1:7.1f}x".format(
+            results['python'][0] / results['libyaml'][0],
+            results['python'][1] / results['libyaml'][1]))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
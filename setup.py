@@ -16,8 +16,6 @@ import sys
 from distutils.core import setup
 
 extra = {}
-if sys.version_info >= (3,):
-    extra['use_2to3'] = True
 
 class Tox(TestCommand):
     def finalize_options(self):
@@ -39,6 +37,10 @@ setup(name='Yaco',
       url='https://github.com/mfiers/Yaco',
       include_package_data=True,
       packages=['Yaco'],
+      # the prebuilt YacoPkg index (python -m Yaco build-index Yaco)
+      # is a hidden file - list it, so it is installed as well
+      package_data={'Yaco': ['etc/*.config', 'etc/*/*.config',
+                             'etc/.yacopkg_index']},
       package_dir={'': 'src'},
       install_requires = ['PyYAML>=3.0'],
       tests_require = ['tox', 'PyYAML>=3.0'],
@@ -57,18 +57,60 @@ branches is:
 
    >>> x = Yaco()
    >>> assert(not 'a' in x)
+   >>> assert(not 'a.b.c' in x)
+   >>> x.get_path('a.b.c', 'default')
+   'default'
 
-Todo: Need to find a more elegant way of testing without introducing
-data structures
+Dotted keys with `in` and `get_path` never create branches. To stop
+creating branches altogether (e.g. for a tree that is only read
+from), see `Yaco.set_missing`.
 
 """
+import array
+import contextlib
 import fnmatch
+import functools
+import itertools
 import logging
+import marshal
+import mmap
+import operator
 import os
-import pkg_resources
 import re
+import struct
 import sys
-import yaml
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    from functools import lru_cache
+except ImportError:
+    # python 2
+    lru_cache = None
+
+# yaml, its libyaml based loader & dumper (None if PyYAML is built
+# without libyaml) & the Yaco loaders & dumpers are set up on first
+# use, by _import_yaml - importing yaml takes a noticeable part of the
+# startup of a short running program that may only need a snapshot
+yaml = None
+CSafeLoader = CSafeDumper = None
+_YacoSafeLoader = _YacoCSafeLoader = None
+_YacoSafeDumper = _YacoCSafeDumper = None
+_YAML_LOCK = threading.Lock()
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    # python 2
+    _intern = intern
 
 lg = logging.getLogger(__name__)
 # lg.setLevel(logging.DEBUG)
@@ -76,6 +118,26 @@ lg = logging.getLogger(__name__)
 if sys.version_info[0] == 2:
     import codecs
 
+#: Use the libyaml (C) based yaml loader & dumper. None: use them
+#: when PyYAML is built with libyaml, True: always use them (fail if
+#: not available), False: always use the pure python implementation
+USE_LIBYAML = None
+
+# number of parsed dotted keys to remember
+PATH_CACHE_SIZE = 4096
+
+#: Intern the keys of loaded yaml & of data passed to update, so a key
+#: repeated across nodes, files & list elements is a single string.
+#: Saves memory on large trees with repetitive keys - at a cost for
+#: every key that is loaded or set
+INTERN_KEYS = False
+
+#: Also intern loaded string values up to this length (0: none)
+INTERN_VALUES = 0
+
+# marks a missing value (None is a valid value)
+_NOTHING = object()
+
 ITEM_INVALID = 0
 ITEM_FILE = 1
 ITEM_WEB = 2
@@ -83,6 +145,474 @@ ITEM_STRING = 3
 
 ROOT_LEAF_PREFIX = "_"
 YACODIR_CACHEFILE = '.yacodir_cache'
+YACODIR_CACHE_VERSION = 2
+
+# prebuilt YacoPkg data - a resource in the loaded package directory,
+# see build_pkg_index
+YACOPKG_INDEX = '.yacopkg_index'
+YACOPKG_INDEX_VERSION = 1
+
+SNAPSHOT_MAGIC = b'YACOSNAP'
+# an indexed snapshot starts with the index (a snapshot of its own)
+# of the snapshots of all top level keys that follow
+SNAPSHOT_INDEX_MAGIC = b'YACOSIDX'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MARSHAL = 1
+SNAPSHOT_PICKLE = 2
+# pickle protocol of portable snapshots (see build_pkg_index) - readable
+# by all python versions
+SNAPSHOT_PICKLE_PROTOCOL = 2
+
+# magic, format version, codec, python major & minor (the marshal
+# format is python version specific), crc32 & length of the payload
+_SNAPSHOT_HEADER = struct.Struct('>8sBBBBIQ')
+
+# sort key of (key, value) pairs
+_first = operator.itemgetter(0)
+
+# os.replace overwrites the target on all platforms (python >= 3.3)
+_replace = getattr(os, 'replace', os.rename)
+
+
+# strings interned (by the loaders & update) & the bytes saved by
+# dropping the duplicates - see intern_stats
+_INTERN_STATS = {'keys': 0, 'values': 0, 'duplicates': 0, 'bytes_saved': 0}
+# files are loaded from several threads at once (see YacoDir)
+_INTERN_LOCK = threading.Lock()
+
+
+def _intern_str(value, kind='keys'):
+    """
+    Return the interned version of a string & count it
+    """
+    interned = _intern(value)
+    with _INTERN_LOCK:
+        stats = _INTERN_STATS
+        stats[kind] += 1
+        if interned is not value:
+            stats['duplicates'] += 1
+            stats['bytes_saved'] += sys.getsizeof(value)
+    return interned
+
+
+def intern_stats(reset=False):
+    """
+    Return the number of keys & string values interned since the
+    start (or the last reset), how many of those were duplicates of
+    an already interned string & the bytes saved by dropping them
+    (see INTERN_KEYS & INTERN_VALUES)
+
+    >>> _ = intern_stats(reset=True)
+    >>> _ = Yaco("{a: {b: 1}, c: {b: 2}}")
+    >>> intern_stats()['keys']
+    0
+    """
+    with _INTERN_LOCK:
+        stats = dict(_INTERN_STATS)
+        if reset:
+            for key in _INTERN_STATS:
+                _INTERN_STATS[key] = 0
+    return stats
+
+
+# load profiling - off unless a hook is registered (add_load_hook) or
+# profile_loads is on: when off, loaders only check _profiling
+_profiling = False
+_recording = False
+_LOAD_HOOKS = []
+_LOAD_EVENTS = []
+_LOOKUPS = {'autovivified': 0, 'missed': 0}
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+
+def add_load_hook(hook):
+    """
+    Call hook(event) for every source loaded by Yaco.load, YacoFile,
+    YacoDir, YacoPkg & PolyYaco. The event is a dict with the loader
+    (class name), the source (file name), the seconds spent on stat,
+    read, parse & merge, the bytes read & the number of keys loaded.
+    Loads from a cache or index have cached=True.
+
+    >>> events = []
+    >>> add_load_hook(events.append)
+    >>> y = Yaco()
+    >>> y.load(os.path.join(os.path.dirname(__file__), 'etc',
+    ...                     '__root__.config'))
+    >>> remove_load_hook(events.append)
+    >>> [(e['loader'], e['keys'], e['cached']) for e in events]
+    [('Yaco', 1, False)]
+    """
+    _LOAD_HOOKS.append(hook)
+    _set_profiling()
+
+
+def remove_load_hook(hook):
+    _LOAD_HOOKS.remove(hook)
+    _set_profiling()
+
+
+def profile_loads(enable=True):
+    """
+    Start (or stop) recording the loads & missing key lookups for
+    load_report
+    """
+    global _recording
+    _recording = bool(enable)
+    _set_profiling()
+
+
+def _set_profiling():
+    global _profiling
+    _profiling = _recording or bool(_LOAD_HOOKS)
+
+
+def load_report(reset=False):
+    """
+    Summarize the loads recorded since profile_loads was switched on
+    (or the last reset): all sources, slowest first, the totals & the
+    number of lookups of missing keys that created a branch
+    (autovivified) or did not (missed)
+
+    >>> profile_loads()
+    >>> y = YacoPkg('Yaco', 'etc/')
+    >>> report = load_report(reset=True)
+    >>> sorted(e['source'] for e in report['sources'])
+    ['etc/__root__.config', 'etc/subset_a/__root__.config']
+    >>> report['total']['keys']
+    2
+    >>> y.x.y
+    {}
+    >>> profile_loads(False)
+    >>> load_report(reset=True)['lookups']
+    {'autovivified': 2, 'missed': 0}
+    """
+    events = sorted(_LOAD_EVENTS, key=_load_time, reverse=True)
+    total = dict([(k, 0.0) for k in ('stat', 'read', 'parse', 'merge')])
+    total.update({'bytes': 0, 'keys': 0, 'sources': len(events)})
+    for event in events:
+        for key in ('stat', 'read', 'parse', 'merge', 'bytes', 'keys'):
+            total[key] += event[key]
+    rv = {'sources': events, 'total': total, 'lookups': dict(_LOOKUPS)}
+    if reset:
+        del _LOAD_EVENTS[:]
+        for key in _LOOKUPS:
+            _LOOKUPS[key] = 0
+    return rv
+
+
+def _load_time(event):
+    return event['stat'] + event['read'] + event['parse'] + event['merge']
+
+
+def _load_event(loader, source, cached=False):
+    return {'loader': loader, 'source': source, 'cached': cached,
+            'stat': 0.0, 'read': 0.0, 'parse': 0.0, 'merge': 0.0,
+            'bytes': 0, 'keys': 0}
+
+
+def _emit_load(event, data=None):
+    """
+    Count the keys in data & pass the event on
+    """
+    if data is not None:
+        event['keys'] = _count_keys(data)
+    if _recording:
+        _LOAD_EVENTS.append(event)
+    for hook in list(_LOAD_HOOKS):
+        hook(event)
+
+
+def _count_keys(data):
+    """
+    Return the number of keys in (nested) dicts & lists
+    """
+    count = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            count += len(node)
+            stack.extend(dict.values(node))
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return count
+
+
+def _read_profiled(filename, event):
+    """
+    Stat, read & parse a yaml file - recording the times in event
+    """
+    start = _timer()
+    os.stat(filename)
+    stat = _timer()
+    with open(filename, 'rb') as F:
+        raw = F.read()
+    read = _timer()
+    data = _yaml_load(raw)
+    event['stat'] = stat - start
+    event['read'] = read - stat
+    event['parse'] = _timer() - read
+    event['bytes'] = len(raw)
+    return data
+
+
+class _YacoConstructor(object):
+
+    """
+    Mixin for the yaml loaders: interns mapping keys (& short string
+    values) before they are constructed
+    """
+
+    def construct_mapping(self, node, deep=False):
+        intern_values = INTERN_VALUES
+        if INTERN_KEYS or intern_values:
+            for key_node, value_node in node.value:
+                if INTERN_KEYS:
+                    _intern_node(key_node, 'keys', None)
+                if intern_values:
+                    _intern_node(value_node, 'values', intern_values)
+        return super(_YacoConstructor, self).construct_mapping(node, deep)
+
+    def construct_sequence(self, node, deep=False):
+        intern_values = INTERN_VALUES
+        if intern_values:
+            for item_node in node.value:
+                _intern_node(item_node, 'values', intern_values)
+        return super(_YacoConstructor, self).construct_sequence(node, deep)
+
+
+def _intern_node(node, kind, max_length):
+    """
+    Intern the value of a yaml string node (of up to max_length)
+    """
+    if node.tag == 'tag:yaml.org,2002:str':
+        value = node.value
+        if type(value) is str and (
+                max_length is None or len(value) <= max_length):
+            node.value = _intern_str(value, kind)
+
+
+def _import_yaml():
+    """
+    Import yaml & define the Yaco loaders & dumpers - once
+    """
+    global yaml, CSafeLoader, CSafeDumper
+    global _YacoSafeLoader, _YacoCSafeLoader, _YacoSafeDumper, _YacoCSafeDumper
+    if yaml is not None:
+        return yaml
+    with _YAML_LOCK:
+        if yaml is not None:
+            return yaml
+        import yaml as module
+
+        class _YacoSafeLoader(_YacoConstructor, module.SafeLoader):
+            pass
+
+        class _YacoSafeDumper(module.SafeDumper):
+            pass
+
+        try:
+            from yaml import CSafeLoader, CSafeDumper
+        except ImportError:
+            # PyYAML is built without libyaml
+            pass
+        else:
+            class _YacoCSafeLoader(_YacoConstructor, CSafeLoader):
+                pass
+
+            class _YacoCSafeDumper(CSafeDumper):
+                pass
+
+        for dumper in (_YacoSafeDumper, _YacoCSafeDumper):
+            if dumper is not None:
+                # tuples were written as python specific tags before -
+                # dump them as plain lists so the output is always
+                # safe to load
+                dumper.add_representer(
+                    tuple, module.SafeDumper.represent_list)
+        # last - other threads do not wait for the lock once it is set
+        yaml = module
+    return yaml
+
+
+def _use_libyaml():
+    """
+    Determine if the libyaml based loader/dumper should be used
+    """
+    _import_yaml()
+    if USE_LIBYAML is None:
+        return CSafeLoader is not None
+    if USE_LIBYAML and CSafeLoader is None:
+        raise Exception("PyYAML is not built with libyaml")
+    return bool(USE_LIBYAML)
+
+
+def _yaml_loader():
+    """
+    Return the yaml Loader class to use
+    """
+    return _YacoCSafeLoader if _use_libyaml() else _YacoSafeLoader
+
+
+def _yaml_dumper():
+    """
+    Return the yaml Dumper class to use
+    """
+    return _YacoCSafeDumper if _use_libyaml() else _YacoSafeDumper
+
+
+def _yaml_load(stream):
+    """
+    Parse a yaml document from a string, bytes or an open file
+    """
+    loader = _yaml_loader()
+    return yaml.load(stream, Loader=loader)
+
+
+def _yaml_load_all(stream):
+    """
+    Generate the documents of a yaml stream, parsed one at a time
+    """
+    loader = _yaml_loader()
+    return yaml.load_all(stream, Loader=loader)
+
+
+def _yaml_dump(data, stream=None, **kwargs):
+    """
+    Dump data as (block style) yaml
+    """
+    kwargs.setdefault('default_flow_style', False)
+    dumper = _yaml_dumper()
+    return yaml.dump(data, stream, Dumper=dumper, **kwargs)
+
+
+class YacoKeyError(KeyError, AttributeError):
+
+    """
+    Raised for missing keys in 'raise' mode (see Yaco.set_missing)
+    """
+
+
+class _Missing(object):
+
+    """
+    The value of missing keys in 'sentinel' mode (see
+    Yaco.set_missing): empty, false & every key of it is missing
+    as well.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, key):
+        if key[:2] == '__':
+            raise AttributeError(key)
+        return self
+
+    def __getitem__(self, key):
+        return self
+
+    def __setattr__(self, key, value):
+        raise TypeError("cannot set {0} on a missing key".format(key))
+
+    __setitem__ = __setattr__
+
+    def __contains__(self, key):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def keys(self):
+        return []
+
+    def get(self, key, default=None):
+        return default
+
+    def get_path(self, key, default=_NOTHING):
+        if default is _NOTHING:
+            raise KeyError(key)
+        return default
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+def _split_path(key):
+    """
+    Split a dotted key - cached, as the same keys tend to be used
+    over and over again
+
+    >>> _split_path('a.b.c')
+    ('a', 'b', 'c')
+    """
+    if key == '':
+        return ()
+    return tuple(key.split('.'))
+
+
+class YacoPath(object):
+
+    """
+    A precompiled dotted key - see Yaco.compile_path
+    """
+
+    __slots__ = ('key', 'parts')
+
+    def __init__(self, key):
+        self.key = key
+        self.parts = _split_path(key)
+
+    def get(self, tree, default=_NOTHING):
+        """
+        Return the value in tree - or the default if it is not there
+        (it is never created). Raises a KeyError if there is no
+        default.
+        """
+        if type(tree) is not Yaco:
+            # subclasses may need to do work on access
+            return tree.get_path(self, default)
+        node = tree
+        try:
+            for k in self.parts:
+                node = dict.__getitem__(node, k)
+        except (KeyError, TypeError):
+            if default is not _NOTHING:
+                return default
+            raise KeyError(self.key)
+        return node
+
+    __call__ = get
+
+    def set(self, tree, value):
+        """
+        Set the value in tree
+        """
+        tree.set_path(self, value)
+
+    def __repr__(self):
+        return 'YacoPath({0!r})'.format(self.key)
+
+
+_compile_path = YacoPath
+if lru_cache is not None:
+    _split_path = lru_cache(maxsize=PATH_CACHE_SIZE)(_split_path)
+    _compile_path = lru_cache(maxsize=PATH_CACHE_SIZE)(YacoPath)
+
 
 #    db    db  .d8b.   .o88b.  .d88b.
 #    `8b  d8' d8' `8b d8P  Y8 .8P  Y8.
@@ -108,6 +638,9 @@ class Yaco(dict):
 
     """
 
+    # what to do with missing keys - see set_missing
+    _missing_mode = None
+
     def __init__(self, data={}, leaf=None):
         """
         Constructor
@@ -120,18 +653,43 @@ class Yaco(dict):
 
         if not data == {}:
             to_update = None
+            # the yaml loader interns keys itself
+            intern_keys = None
             if isinstance(data, dict):
                 to_update = data
             elif isinstance(data, str) or isinstance(data, bytes):
-                to_update = yaml.load(data)
+                to_update = _yaml_load(data)
+                intern_keys = False
             else:
                 raise Exception('cannot parse %s' % type(data))
 
             if leaf is None or leaf == '':
-                self.update(to_update)
+                _build(self, to_update, intern_keys=intern_keys)
             else:
                 self[leaf].update(to_update)
 
+    @classmethod
+    def from_data(cls, data, trusted=True):
+        """
+        Build a Yaco from (parsed) data in one iterative pass - all
+        dicts become Yaco objects, no matter how deep they are nested.
+
+        If trusted, the data is owned by the new Yaco: its lists are
+        reused (and their dicts replaced by Yaco objects) in place, as
+        the normal constructor does. Otherwise data is left untouched.
+
+        >>> d = {'a': [1, {'b': 2}], 'c': {'d': {'e': 3}}}
+        >>> y = Yaco.from_data(d, trusted=False)
+        >>> (y.a[1].b, y.c.d.e, isinstance(d['a'][1], Yaco))
+        (2, 3, False)
+        >>> y = Yaco.from_data(d)
+        >>> (y.a is d['a'], isinstance(d['a'][1], Yaco))
+        (True, True)
+        """
+        rv = cls()
+        _build(rv, data, trusted)
+        return rv
+
     def __str__(self):
         """
         Map the structure to a string
@@ -183,7 +741,7 @@ class Yaco(dict):
             elif isinstance(value, Yaco):
                 super(Yaco, self).__setitem__(key, value)
             else:
-                super(Yaco, self).__setitem__(key, Yaco(value))
+                super(Yaco, self).__setitem__(key, self._branch(value))
 
         elif isinstance(value, list):
             # parse the list to see if there are dicts - which need to
@@ -201,11 +759,79 @@ class Yaco(dict):
         >>> assert(isinstance(v.a, int))
         """
         try:
-            return super(Yaco, self).__getitem__(key)
+            rv = super(Yaco, self).__getitem__(key)
         except KeyError:
-            rv = Yaco()
-            super(Yaco, self).__setitem__(key, rv)
-            return rv
+            if isinstance(key, str) and key[:2] == '__':
+                # special names (e.g. __deepcopy__) are never keys
+                raise YacoKeyError(key)
+            mode = self._missing_mode
+            if _profiling:
+                _LOOKUPS['missed' if mode else 'autovivified'] += 1
+            if mode is None:
+                rv = Yaco()
+                super(Yaco, self).__setitem__(key, rv)
+                return rv
+            elif mode == 'sentinel':
+                return MISSING
+            raise YacoKeyError(key)
+        return rv
+
+    def set_missing(self, mode, recursive=True):
+        """
+        Set what happens when a missing key is looked up:
+
+        - 'create': the default - create (and return) an empty branch
+        - 'sentinel': return MISSING, which is empty & false, and of
+          which every key is MISSING as well. Nothing is created.
+        - 'raise': raise a YacoKeyError (both a KeyError & an
+          AttributeError)
+
+        If recursive, the mode is set for all branches of this Yaco.
+        New branches inherit the mode of the Yaco they are created in.
+
+        >>> y = Yaco({'a': {'b': 1}})
+        >>> y.set_missing('sentinel')
+        >>> y.x.y.z
+        MISSING
+        >>> assert(not y.a.c)
+        >>> sorted(y.keys()), sorted(y.a.keys())
+        (['a'], ['b'])
+        >>> y.d = {'e': 1}
+        >>> y.d.f
+        MISSING
+        >>> y.set_missing('raise')
+        >>> y.a.c  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        ...
+        YacoKeyError: 'c'
+        >>> getattr(y, 'c', None)
+        """
+        if mode not in ('create', 'sentinel', 'raise'):
+            raise ValueError("invalid missing key mode {0}".format(mode))
+        value = None if mode == 'create' else mode
+        seen = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, Yaco):
+                node.__dict__['_missing_mode'] = value
+                if recursive:
+                    stack.extend(dict.values(node))
+            elif isinstance(node, list) and recursive:
+                stack.extend(node)
+
+    def _branch(self, value={}):
+        """
+        Create a new branch (from value) - which inherits the missing
+        key mode of this Yaco
+        """
+        rv = Yaco(value)
+        if self._missing_mode is not None:
+            rv.set_missing(self._missing_mode)
+        return rv
 
     def has_key(self, key):
         """
@@ -219,18 +845,24 @@ class Yaco(dict):
         >>> assert(y.has_key('b.c'))
 
         """
-        if '.' in key:
-            first, second = key.split('.', 1)
-            return self[first].has_key(second)
-        else:
-            return key in self.keys()
+        return self.__contains__(key)
 
     def __contains__(self, key):
-        if not '.' in key:
+        """
+        Check if a (dotted) key exists - without creating it
+
+        >>> y = Yaco({'a': {'b': 0}})
+        >>> assert('a.b' in y)
+        >>> assert(not 'a.c.d' in y)
+        >>> assert(not 'c' in y.a)
+        """
+        if not isinstance(key, str) or not '.' in key:
             return super(Yaco, self).__contains__(key)
-        else:
-            keya, keyb = key.split('.', 1)
-            return self[keya][keyb]
+        try:
+            self.get_path(key)
+        except KeyError:
+            return False
+        return True
 
     def __delattr__(self, name):
         return super(Yaco, self).__delitem__(name)
@@ -253,18 +885,98 @@ class Yaco(dict):
         elif not '.' in key:
             return self.__getattr__(key)
         else:
-            k1, k2 = key.split('.', 1)
-            return self.__getattr__(k1)[k2]
+            node = self
+            for k in _split_path(key):
+                if isinstance(node, Yaco):
+                    node = node.__getattr__(k)
+                else:
+                    node = node[k]
+            return node
 
     def __setitem__(self, key, value):
         """
         as setattr, except for when there is a dot in the key
         """
-        if not '.' in key:
+        if not isinstance(key, str) or not '.' in key:
             return self.__setattr__(key, value)
         else:
-            k1, k2 = key.split('.', 1)
-            self.__getattr__(k1)[k2] = value
+            parts = _split_path(key)
+            node = self
+            for k in parts[:-1]:
+                if isinstance(node, Yaco):
+                    node = node.__getattr__(k)
+                else:
+                    node = node[k]
+            node[parts[-1]] = value
+
+    @staticmethod
+    def compile_path(key):
+        """
+        Return a precompiled accessor (a YacoPath) for a dotted key -
+        for keys that are looked up over and over again
+
+        >>> p = Yaco.compile_path('a.b.c')
+        >>> y = Yaco()
+        >>> p.set(y, 1)
+        >>> p.get(y)
+        1
+        >>> y.a.b.c
+        1
+        """
+        return _compile_path(key)
+
+    def get_path(self, key, default=_NOTHING):
+        """
+        Fast lookup of a (dotted) key or YacoPath. Unlike normal
+        access, this never creates missing keys - but returns the
+        default, or raises a KeyError if no default is given
+
+        >>> y = Yaco({'a': {'b': {'c': 1}}})
+        >>> y.get_path('a.b.c')
+        1
+        >>> y.get_path('a.x.c')
+        Traceback (most recent call last):
+        ...
+        KeyError: 'a.x.c'
+        >>> y.get_path('a.x.c', None)
+        >>> 'x' in y.a
+        False
+        """
+        if isinstance(key, YacoPath):
+            parts = key.parts
+        else:
+            parts = _split_path(key)
+        node = self
+        try:
+            for k in parts:
+                node = dict.__getitem__(node, k)
+        except (KeyError, TypeError):
+            if default is not _NOTHING:
+                return default
+            raise KeyError(key if isinstance(key, str) else key.key)
+        return node
+
+    def set_path(self, key, value):
+        """
+        Set a value for a (dotted) key or YacoPath - creating
+        intermediate levels if need be. The value is treated as with
+        normal assignment (dicts are converted to Yaco objects)
+        """
+        if isinstance(key, YacoPath):
+            parts = key.parts
+        else:
+            parts = _split_path(key)
+        if not parts:
+            raise KeyError(key)
+        node = self
+        for k in parts[:-1]:
+            try:
+                child = dict.__getitem__(node, k)
+            except KeyError:
+                child = node._branch()
+                dict.__setitem__(node, k, child)
+            node = child
+        node.__setattr__(parts[-1], value)
 
     __delitem__ = __delattr__
 
@@ -283,21 +995,7 @@ class Yaco(dict):
         >>> assert(isinstance(s['y'], dict))
         >>> assert(not isinstance(s['y'], Yaco))
         """
-
-        def _returnSimple(item):
-            if isinstance(item, (str, bool, int, float)):
-                return item
-            elif isinstance(item, list):
-                return [_returnSimple(x) for x in item]
-            elif isinstance(item, tuple):
-                return (_returnSimple(x) for x in item)
-            elif isinstance(item, dict):
-                return dict([(k, _returnSimple(item[k]))
-                             for k in item])
-            else:
-                return str(item)
-
-        return _returnSimple(self)
+        return _export(self, simple=True)
 
     def _list_parser(self, old_list):
         """
@@ -305,11 +1003,12 @@ class Yaco(dict):
         """
         for i, item in enumerate(old_list):
             if isinstance(item, dict):
-                old_list[i] = Yaco(item)
+                old_list[i] = self._branch(item)
             elif isinstance(item, list):
                 old_list[i] = self._list_parser(item)
-            else:
-                pass
+            elif INTERN_VALUES and type(item) is str and \
+                    len(item) <= INTERN_VALUES:
+                old_list[i] = _intern_str(item, 'values')
         return old_list
 
     def soft_update(self, data):
@@ -332,8 +1031,11 @@ class Yaco(dict):
         if not data:
             return
 
+        intern_keys = INTERN_KEYS
         for key, value in list(data.items()):
 
+            if intern_keys and type(key) is str:
+                key = _intern_str(key)
             old_value = super(Yaco, self).get(key, None)
 
             if isinstance(value, dict):
@@ -344,7 +1046,7 @@ class Yaco(dict):
                     continue
                 else:
                     # no old value - overwrite all you like
-                    super(Yaco, self).__setitem__(key, Yaco(value))
+                    super(Yaco, self).__setitem__(key, self._branch(value))
             elif isinstance(value, list):
                 # parse the list to see if there are dicts - which
                 # need to be translated to Yaco objects
@@ -368,15 +1070,18 @@ class Yaco(dict):
         if not data:
             return
 
+        intern_keys = INTERN_KEYS
         for key, value in list(data.items()):
 
+            if intern_keys and type(key) is str:
+                key = _intern_str(key)
             old_value = super(Yaco, self).get(key, None)
 
             if isinstance(value, dict):
                 if old_value and isinstance(old_value, Yaco):
                     old_value.update(value)
                 else:
-                    super(Yaco, self).__setitem__(key, Yaco(value))
+                    super(Yaco, self).__setitem__(key, self._branch(value))
             elif isinstance(value, list):
                 # parse the list to see if there are dicts - which
                 # need to be translated to Yaco objects
@@ -386,8 +1091,48 @@ class Yaco(dict):
                 super(Yaco, self).__setitem__(key, value)
 
     def copy(self):
-        ch = Yaco(self)
-        return ch
+        """
+        Return a copy of this Yaco
+
+        All branches & lists are copied in one go, so that no mutable
+        node is shared between the two trees. Frozen branches (and all
+        other values) are shared - they cannot change. There is no
+        shallow copy (it could not be isolated from the original): for
+        cheap overlays of large trees, use freeze() and
+        FrozenYaco.updated instead, which share all unchanged branches.
+
+        >>> y = Yaco({'a': {'b': 1}, 'c': [{'d': 2}]})
+        >>> z = y.copy()
+        >>> z.a.b = 3
+        >>> z.c[0].d = 4
+        >>> z.c.append(5)
+        >>> (y.a.b, y.c, z.a.b, len(z.c))
+        (1, [{'d': 2}], 3, 2)
+        """
+        return _copy_tree(self)
+
+    def compact(self):
+        """
+        Return a memory efficient copy of this Yaco - see CompactYaco
+
+        >>> c = Yaco({'a': {'b': list(range(8))}}).compact()
+        >>> c.a.b
+        array('q', [0, 1, 2, 3, 4, 5, 6, 7])
+        """
+        return CompactYaco(self)
+
+    def freeze(self):
+        """
+        Return an immutable & hashable copy of this Yaco - see
+        FrozenYaco
+
+        >>> y = Yaco({'a': {'b': [1, 2]}})
+        >>> f = y.freeze()
+        >>> f.a.b
+        (1, 2)
+        >>> assert(f == y.freeze() and hash(f) == hash(y.freeze()))
+        """
+        return FrozenYaco(self)
 
     def load(self, from_file, leaf=None):
         """
@@ -410,24 +1155,94 @@ class Yaco(dict):
         """
         from_file = os.path.expanduser(
             os.path.abspath(os.path.expanduser(from_file)))
-        if sys.version_info[0] == 2:
+        event = None
+        if _profiling:
+            event = _load_event(type(self).__name__, from_file)
+            data = _read_profiled(from_file, event)
+            start = _timer()
+        elif sys.version_info[0] == 2:
             with codecs.open(from_file, encoding='utf-8') as F:
-                data = yaml.load(F.read())
+                data = _yaml_load(F.read())
         else:
             with open(from_file, encoding='utf8') as F:
-                data = yaml.load(F)
+                data = _yaml_load(F)
 
         if leaf is None or leaf == '':
             self.update(data)
         else:
             self[leaf].update(data)
+        if event is not None:
+            event['merge'] = _timer() - start
+            _emit_load(event, data)
+
+    def aload(self, from_file, leaf=None, executor=None):
+        """
+        As load, for asyncio (python 3.7+): `await y.aload(from_file)`
+
+        The file is read & parsed in executor (by default, the default
+        executor of the running loop) - only the merge into this Yaco
+        runs on the event loop.
+
+        >>> import asyncio, tempfile
+        >>> tf = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        >>> _ = tf.write("a: {b: 1}\\n")
+        >>> tf.close()
+        >>> y = Yaco()
+        >>> asyncio.run(y.aload(tf.name, 'leaf'))
+        >>> y.leaf.a.b
+        1
+        >>> os.unlink(tf.name)
+        """
+        from Yaco import _aio
+        return _aio.load(self, from_file, leaf, executor)
+
+    def load_all(self, from_file, leaf=None):
+        """
+        Load all documents of a (multi-document) yaml file into this
+        dict - or in a leaf (as load). The documents are merged in one
+        at a time, as they are parsed: only one parsed document is in
+        memory at any time.
+
+        >>> import tempfile
+        >>> tf = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        >>> _ = tf.write("a: 1\\nb: {c: 2}\\n---\\nb: {d: 3}\\n")
+        >>> tf.close()
+        >>> y = Yaco()
+        >>> y.load_all(tf.name, 'leaf')
+        >>> (y.leaf.a, y.leaf.b.c, y.leaf.b.d)
+        (1, 2, 3)
+        >>> os.unlink(tf.name)
+        """
+        if leaf is None or leaf == '':
+            target = self
+        else:
+            target = self[leaf]
+        for data in _iter_documents(from_file):
+            target.update(data)
+
+    @staticmethod
+    def iter_documents(from_file):
+        """
+        Generate a Yaco for every document in a (multi-document) yaml
+        file - parsed as the generator is consumed. Empty documents
+        become empty Yaco objects.
+
+        >>> import tempfile
+        >>> tf = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        >>> _ = tf.write("a: 1\\n---\\n---\\na: 3\\n")
+        >>> tf.close()
+        >>> [y.get('a') for y in Yaco.iter_documents(tf.name)]
+        [1, None, 3]
+        >>> os.unlink(tf.name)
+        """
+        for data in _iter_documents(from_file):
+            yield Yaco.from_data(data)
 
     def pretty(self):
         """
         Return data as a pprint.pformatted string
         """
-        return yaml.dump(self.get_data(), encoding='utf-8',
-                         default_flow_style=False).rstrip()
+        return _yaml_dump(self.get_data(), encoding='utf-8').rstrip()
 
     def get_data(self):
         """
@@ -448,64 +1263,1164 @@ class Yaco(dict):
         >>> assert(not 'b' in d)
         >>> assert(not '_c' in d)
         """
-        data = {}
-        _priv = self.get('_private', [])
-
-        def check_data(v):
-            if isinstance(v, Yaco):
-                v = v.get_data()
-            elif isinstance(v, list):
-                v = [check_data(x) for x in v]
-            return v
-
-        for k in list(self.keys()):
-            if k in _priv:
-                continue
-            if isinstance(k, (str)) and k and k[0] == '_':
-                continue
-            # print self.keys()
-            # print k, 'x' * 30
-            data[k] = check_data(self[k])
-        return data
+        return _export(self)
 
     def dump(self):
-        if sys.version_info[0] == 2:
-            return yaml.safe_dump(self.get_data(),
-                                  default_flow_style=False)
-        elif sys.version_info[0] == 3:
-            return yaml.dump(self.get_data(), default_flow_style=False)
+        return _yaml_dump(self.get_data())
 
     def save(self, to_file, doNotSave=[]):
         """
-        """
+        Save this Yaco as yaml - leaving out the top level keys in
+        doNotSave, and all private keys (see get_data).
 
-        data = self.get_data()
+        The yaml is streamed from the tree to a temporary file, which
+        is renamed to to_file when done - readers never see a partially
+        written file.
+
+        >>> import tempfile
+        >>> tf = tempfile.NamedTemporaryFile(delete=True)
+        >>> tf.close()
+        >>> x = Yaco({'a': {'b': [1, {'c': None}], '_d': 1}, 'e': 2})
+        >>> x.save(tf.name, doNotSave=['e'])
+        >>> print(open(tf.name).read().strip())
+        a:
+          b:
+          - 1
+          - c: null
+        """
         to_file = os.path.expanduser(to_file)
-        for k in list(data.keys()):
-            if k in doNotSave:
-                del data[k]
-        with open(to_file, 'w') as F:
-            F.write(self.dump())
+        with _atomic_open(to_file) as F:
+            _emit_yaml(self, F, doNotSave)
 
+    def asave(self, to_file, doNotSave=[], executor=None):
+        """
+        As save, for asyncio (python 3.7+): `await y.asave(to_file)`
 
-#    db    db  .d8b.   .o88b.  .d88b.  d88888b d888888b db      d88888b
-#    `8b  d8' d8' `8b d8P  Y8 .8P  Y8. 88'       `88'   88      88'
-#     `8bd8'  88ooo88 8P      88    88 88ooo      88    88      88ooooo
-#       88    88~~~88 8b      88    88 88~~~      88    88      88~~~~~
-#       88    88   88 Y8b  d8 `8b  d8' 88        .88.   88booo. 88.
-#       YP    YP   YP  `Y88P'  `Y88P'  YP      Y888888P Y88888P Y88888P
+        The yaml is written in executor (by default, the default
+        executor of the running loop). What is saved is this Yaco as
+        it was when asave was called: the data is exported (see
+        get_data) before asave returns, so the Yaco can be changed
+        while the save is running - those changes are not saved.
+        """
+        from Yaco import _aio
+        # export on the calling thread - the executor only sees plain
+        # data that nothing else has
+        data = self.get_data()
+        for key in doNotSave:
+            data.pop(key, None)
+        return _aio.save(data, to_file, executor)
 
+    def save_snapshot(self, to_file, index=False):
+        """
+        Save the exported data (see get_data) to a binary snapshot
+        file - which is a lot faster to load than yaml.
 
-class YacoFile(Yaco):
+        If index, the top level keys are stored separately, behind an
+        index - so a MappedYaco can look them up without loading the
+        rest.
 
-    """
-    As Yaco, but loads from a file - or returns an emtpy object if it
-    cannot find the file
-    """
+        >>> import tempfile
+        >>> tf = tempfile.NamedTemporaryFile(delete=True)
+        >>> tf.close()
+        >>> x = Yaco({'a': [1, 2, {'b': 3}], 'c': {'d': 'e'}})
+        >>> x.save_snapshot(tf.name)
+        >>> y = Yaco()
+        >>> y.load_snapshot(tf.name)
+        >>> assert(y.a[2].b == 3)
+        >>> assert(y.c.d == 'e')
+        """
+        to_file = os.path.expanduser(to_file)
+        _write_snapshot(to_file, self.get_data(), index)
 
-    def __init__(self, filename):
+    def load_snapshot(self, from_file, leaf=None):
         """
-        Constructor
+        Load a snapshot written by save_snapshot (indexed or not) into
+        this dict - or in a leaf (as load).
+
+        Raises a ValueError if the file is not a valid snapshot
+        """
+        from_file = os.path.expanduser(from_file)
+        data = _read_snapshot(from_file)
+        if leaf is None or leaf == '':
+            self.update(data)
+        else:
+            self[leaf].update(data)
+
+
+#    d88888b d8888b.  .d88b.  d88888D d88888b d8b   db
+#    88'     88  `8D .8P  Y8. YP  d8' 88'     888o  88
+#    88ooo   88oobY' 88    88    d8'  88ooooo 88V8o 88
+#    88~~~   88`8b   88    88   d8'   88~~~~~ 88 V8o88
+#    88      88 `88. `8b  d8'  d8' db 88.     88  V888
+#    YP      88   YD  `Y88P'  d88888P Y88888P VP   V8P
+
+
+class FrozenYaco(Yaco):
+
+    """
+    An immutable & hashable Yaco: dicts become FrozenYaco objects,
+    lists become tuples. Missing keys are never created, but are
+    MISSING (see Yaco.set_missing).
+
+    Frozen branches are never copied, so trees derived from each
+    other (with updated or with_path) share all branches they do
+    not change - and can be handed to other threads, or used as a
+    cache key, as they are.
+
+    >>> f = FrozenYaco({'a': {'b': 1}, 'c': {'d': [1, {'e': 2}]}})
+    >>> f.c.d[1].e
+    2
+    >>> f.x.y
+    MISSING
+    >>> f.a.b = 2
+    Traceback (most recent call last):
+    ...
+    TypeError: a FrozenYaco cannot be changed
+    >>> g = f.with_path('a.b', 2)
+    >>> (f.a.b, g.a.b, g.c is f.c)
+    (1, 2, True)
+    >>> assert(f != g and len(set([f, g, f.with_path('a.b', 1)])) == 2)
+    """
+
+    _missing_mode = 'sentinel'
+
+    # hash cache
+    _hash = None
+
+    def __init__(self, data={}):
+        """
+        :param data: data to freeze
+        :type data: dict or yaml formatted string
+        """
+        dict.__init__(self)
+        if isinstance(data, str) or isinstance(data, bytes):
+            data = _yaml_load(data)
+        elif not isinstance(data, dict):
+            raise Exception('cannot parse %s' % type(data))
+        if data:
+            dict.update(self, [(k, _freeze(v)) for k, v in data.items()])
+
+    @classmethod
+    def from_data(cls, data, trusted=True):
+        return cls(data)
+
+    @classmethod
+    def _from_frozen(cls, items):
+        """
+        Create a FrozenYaco from (key, value) pairs of which the values
+        are frozen already
+        """
+        rv = dict.__new__(cls)
+        dict.update(rv, items)
+        return rv
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError("a FrozenYaco cannot be changed")
+
+    __setattr__ = __setitem__ = __delattr__ = __delitem__ = _frozen
+    update = soft_update = set_path = set_missing = _frozen
+    pop = popitem = clear = setdefault = _frozen
+    load = load_snapshot = _frozen
+
+    def __hash__(self):
+        rv = self._hash
+        if rv is None:
+            rv = hash(frozenset(dict.items(self)))
+            self.__dict__['_hash'] = rv
+        return rv
+
+    def __reduce__(self):
+        return (FrozenYaco, (dict(self),))
+
+    def copy(self):
+        return self
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        """
+        Return a (mutable) Yaco copy of this tree
+
+        >>> y = FrozenYaco({'a': [1, {'b': 2}]}).thaw()
+        >>> y.a[1].b = 3
+        >>> y.get_data()
+        {'a': [1, {'b': 3}]}
+        """
+        return Yaco(_thaw(self))
+
+    def updated(self, data):
+        """
+        Return a new FrozenYaco - this tree updated with data (as
+        Yaco.update). Unchanged branches are shared.
+
+        >>> f = FrozenYaco({'a': {'b': 1, 'c': 2}, 'd': {'e': 3}})
+        >>> g = f.updated({'a': {'b': 4}})
+        >>> (g.a.b, g.a.c, g.d is f.d)
+        (4, 2, True)
+        >>> f.updated({'a': {'b': 1}}) is f
+        True
+        """
+        items = dict(dict.items(self))
+        changed = False
+        for key, value in data.items():
+            old_value = items.get(key, _NOTHING)
+            if isinstance(value, dict) and isinstance(old_value, FrozenYaco):
+                value = old_value.updated(value)
+            else:
+                value = _freeze(value)
+            if value is old_value or (
+                    type(value) is type(old_value) and value == old_value):
+                continue
+            items[key] = value
+            changed = True
+        if not changed:
+            return self
+        return FrozenYaco._from_frozen(items)
+
+    def soft_updated(self, data):
+        """
+        Return a new FrozenYaco - this tree updated with data, but only
+        for keys that do not have a value (as Yaco.soft_update)
+
+        >>> f = FrozenYaco({'a': {'b': 1}, 'd': {'e': 3}})
+        >>> g = f.soft_updated({'a': {'b': 2, 'c': 2}, 'x': 1})
+        >>> (g.a.b, g.a.c, g.x, g.d is f.d)
+        (1, 2, 1, True)
+        """
+        items = dict(dict.items(self))
+        changed = False
+        for key, value in data.items():
+            old_value = items.get(key)
+            if old_value and isinstance(old_value, FrozenYaco) and \
+                    isinstance(value, dict):
+                value = old_value.soft_updated(value)
+                if value is old_value:
+                    continue
+            elif old_value:
+                continue
+            else:
+                value = _freeze(value)
+            items[key] = value
+            changed = True
+        if not changed:
+            return self
+        return FrozenYaco._from_frozen(items)
+
+    def with_path(self, key, value):
+        """
+        Return a new FrozenYaco with the (dotted) key set to value.
+        Only the branches on the path to the key are new.
+
+        >>> f = FrozenYaco({'a': {'b': 1}, 'c': {'d': 2}})
+        >>> g = f.with_path('a.x.y', [3])
+        >>> (g.a.x.y, g.a.b, g.c is f.c, f.a.x)
+        ((3,), 1, True, MISSING)
+        """
+        parts = key.parts if isinstance(key, YacoPath) else _split_path(key)
+        if not parts:
+            raise ValueError("cannot set the root of a FrozenYaco")
+        nodes = [self]
+        for k in parts[:-1]:
+            child = dict.get(nodes[-1], k)
+            if not isinstance(child, FrozenYaco):
+                child = _EMPTY_FROZEN
+            nodes.append(child)
+        value = _freeze(value)
+        for node, k in reversed(list(zip(nodes, parts))):
+            items = dict(dict.items(node))
+            items[k] = value
+            value = FrozenYaco._from_frozen(items)
+        return value
+
+    def without_path(self, key):
+        """
+        Return a new FrozenYaco without the (dotted) key - raises a
+        KeyError if it does not exist
+
+        >>> f = FrozenYaco({'a': {'b': 1, 'c': 2}, 'd': {'e': 3}})
+        >>> g = f.without_path('a.b')
+        >>> (sorted(g.a.keys()), g.d is f.d, f.a.b)
+        (['c'], True, 1)
+        """
+        parts = key.parts if isinstance(key, YacoPath) else _split_path(key)
+        nodes = [self]
+        for k in parts[:-1]:
+            child = dict.get(nodes[-1], k)
+            if not isinstance(child, FrozenYaco):
+                raise KeyError(key)
+            nodes.append(child)
+        if not parts or parts[-1] not in nodes[-1]:
+            raise KeyError(key)
+        value = _NOTHING
+        for node, k in reversed(list(zip(nodes, parts))):
+            items = dict(dict.items(node))
+            if value is _NOTHING:
+                del items[k]
+            else:
+                items[k] = value
+            value = FrozenYaco._from_frozen(items)
+        return value
+
+
+_EMPTY_FROZEN = FrozenYaco()
+
+
+def _freeze(value):
+    """
+    Return an immutable version of value - frozen branches are
+    returned as they are
+    """
+    if isinstance(value, FrozenYaco):
+        return value
+    elif isinstance(value, dict):
+        return FrozenYaco(value)
+    elif isinstance(value, (list, tuple)):
+        return tuple([_freeze(x) for x in value])
+    elif isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class ConcurrentYaco(object):
+
+    """
+    A Yaco to share between threads: readers take no lock & never
+    change anything, writers never change what a reader can see.
+
+    The tree is a FrozenYaco. A write (update, soft_update, setting or
+    deleting a - dotted - key, apply) builds the changed branches on
+    the side, sharing all others, and publishes the new tree by
+    replacing a single reference. Writes are serialized by a lock.
+
+    A read sees either the old or the new tree - never a half applied
+    update. Several reads of the same version are made on a snapshot.
+    Missing keys are MISSING, as in a FrozenYaco.
+
+    >>> c = ConcurrentYaco({'db': {'host': 'a', 'port': 1}})
+    >>> s = c.snapshot()
+    >>> c.update({'db': {'host': 'b', 'port': 2}})
+    >>> (s.db.host, s.db.port, c.db.host, c['db.port'])
+    ('a', 1, 'b', 2)
+    >>> c['db.user'] = 'x'
+    >>> c.apply(lambda tree: tree.with_path('db.port', tree.db.port + 1))
+    >>> c.db.port, c.db.user, c.x.y
+    (3, 'x', MISSING)
+    >>> del c['db.user']
+    >>> c.get_data()
+    {'db': {'host': 'b', 'port': 3}}
+    """
+
+    def __init__(self, data={}):
+        """
+        :param data: data to initialize the structure with
+        :type data: dict (or Yaco) or yaml formatted string
+        """
+        self.__dict__['_lock'] = threading.Lock()
+        self.__dict__['_root'] = _freeze(
+            data if isinstance(data, dict) else FrozenYaco(data))
+
+    def snapshot(self):
+        """
+        Return the current (immutable) tree
+        """
+        return self._root
+
+    def __getattr__(self, key):
+        if key[:2] == '__':
+            raise AttributeError(key)
+        return getattr(self._root, key)
+
+    def __getitem__(self, key):
+        return self._root[key]
+
+    def get(self, key, default=None):
+        return self._root.get(key, default)
+
+    def get_path(self, key, default=_NOTHING):
+        return self._root.get_path(key, default)
+
+    def __contains__(self, key):
+        return key in self._root
+
+    def __iter__(self):
+        return iter(self._root)
+
+    def __len__(self):
+        return len(self._root)
+
+    def keys(self):
+        return self._root.keys()
+
+    def values(self):
+        return self._root.values()
+
+    def items(self):
+        return self._root.items()
+
+    def __repr__(self):
+        return "ConcurrentYaco({0!r})".format(dict(self._root))
+
+    def get_data(self):
+        return self._root.get_data()
+
+    def simple(self):
+        return self._root.simple()
+
+    def dump(self):
+        return self._root.dump()
+
+    def save(self, to_file, doNotSave=[]):
+        self._root.save(to_file, doNotSave)
+
+    def _publish(self, func, *args):
+        """
+        Replace the tree by func(tree, *args) - one writer at a time
+        """
+        with self._lock:
+            self.__dict__['_root'] = func(self._root, *args)
+
+    def apply(self, func):
+        """
+        Replace the tree by func(tree) - func gets the current tree &
+        returns the new one (e.g. with FrozenYaco.with_path), while
+        other writers wait: a read-modify-write that loses no updates
+        """
+        self._publish(lambda tree: _freeze(func(tree)))
+
+    def replace(self, data):
+        """
+        Replace the whole tree
+        """
+        new = _freeze(data if isinstance(data, dict) else FrozenYaco(data))
+        self._publish(lambda tree: new)
+
+    def update(self, data):
+        # freeze outside of the lock - writers wait less
+        self._publish(FrozenYaco.updated, _freeze(data))
+
+    def soft_update(self, data):
+        self._publish(FrozenYaco.soft_updated, _freeze(data))
+
+    def set_path(self, key, value):
+        self._publish(FrozenYaco.with_path, key, _freeze(value))
+
+    __setitem__ = __setattr__ = set_path
+
+    def __delitem__(self, key):
+        self._publish(FrozenYaco.without_path, key)
+
+    __delattr__ = __delitem__
+
+
+def _build(root, data, trusted=True, intern_keys=None):
+    """
+    Fill the (empty) root with data, converting all dicts to Yaco
+    objects - iteratively, so there is no recursion limit. If
+    trusted, lists in data are converted in place. String keys are
+    interned if intern_keys (default: INTERN_KEYS) is set.
+    """
+    if intern_keys is None:
+        intern_keys = INTERN_KEYS
+    # skips Yaco.__init__, there is nothing to initialize
+    node = functools.partial(dict.__new__, Yaco)
+    stack = [(root, data)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        dst, src = pop()
+        if type(dst) is list:
+            if dst is not src:
+                dst.extend(src)
+            items = enumerate(src)
+            setitem = list.__setitem__
+        else:
+            if type(src) is not dict and type(src) is not Yaco:
+                # subclasses may need to do work on access
+                src = dict(src.items())
+            if intern_keys:
+                src = dict((_intern_str(k) if type(k) is str else k, v)
+                           for k, v in dict.items(src))
+            dict.update(dst, src)
+            items = dict.items(src)
+            setitem = dict.__setitem__
+        for key, value in items:
+            kind = type(value)
+            if kind is dict:
+                new = node()
+            elif kind is list:
+                new = value if trusted else []
+            elif kind is str or kind is int or kind is float:
+                continue
+            elif isinstance(value, (dict, CompactYaco)):
+                new = node()
+            elif isinstance(value, list):
+                new = value if trusted else []
+            elif isinstance(value, array.array):
+                new = []
+            else:
+                continue
+            setitem(dst, key, new)
+            push((new, value))
+
+
+def _iter_documents(from_file):
+    """
+    Generate the documents of a (multi-document) yaml file - each a
+    dict, empty documents are empty dicts
+    """
+    from_file = os.path.expanduser(
+        os.path.abspath(os.path.expanduser(from_file)))
+    if sys.version_info[0] == 2:
+        F = codecs.open(from_file, encoding='utf-8')
+    else:
+        F = open(from_file, encoding='utf8')
+    with F:
+        for data in _yaml_load_all(F):
+            if data is None:
+                data = {}
+            elif not isinstance(data, dict):
+                raise Exception('cannot parse %s' % type(data))
+            yield data
+
+
+def _public_items(node, skip=()):
+    """
+    Return the (key, value) pairs of a Yaco branch that are exported:
+    not the private keys (starting with an underscore or listed in
+    `_private`), nor the keys in skip
+    """
+    if type(node) is Yaco:
+        items = dict.items(node)
+    else:
+        # subclasses may need to do work on access
+        items = node.items()
+    private = node.get('_private', None) or ()
+    return [(k, v) for k, v in items
+            if not (isinstance(k, str) and k[:1] == '_')
+            and not k in private and not k in skip]
+
+
+def _export(tree, simple=False):
+    """
+    Export a Yaco to plain dicts, lists & tuples - iteratively, so
+    there is no recursion limit.
+
+    By default (get_data) private keys (starting with an underscore
+    or listed in `_private`) of all branches are left out. If simple,
+    all keys of all dicts are exported, and all values but str, bool,
+    int & float are converted to strings.
+    """
+    root = {}
+    stack = [(tree, root)]
+    pop = stack.pop
+    push = stack.append
+    # tuples are built as lists first - and converted, innermost
+    # first, once all is done
+    tuples = []
+    while stack:
+        src, dst = pop()
+        if type(dst) is list:
+            dst.extend(src)
+            items = enumerate(src)
+        elif not simple:
+            items = _public_items(src)
+        elif type(src) is Yaco:
+            items = dict.items(src)
+        else:
+            items = src.items()
+        for key, value in items:
+            kind = type(value)
+            if kind is str or kind is int or kind is float or kind is bool:
+                dst[key] = value
+                continue
+            elif isinstance(value, (Yaco, CompactYaco)) or (
+                    simple and isinstance(value, dict)):
+                new = {}
+            elif isinstance(value, (list, array.array)):
+                new = []
+            elif isinstance(value, tuple):
+                new = []
+                tuples.append((dst, key, new))
+            elif simple and not isinstance(value, (str, bool, int, float)):
+                dst[key] = str(value)
+                continue
+            else:
+                dst[key] = value
+                continue
+            dst[key] = new
+            push((value, new))
+    for dst, key, new in reversed(tuples):
+        dst[key] = tuple(new)
+    return root
+
+
+def _copy_tree(tree):
+    """
+    Deep copy a Yaco (or list) - frozen branches and all other
+    values are shared
+    """
+    root = [] if isinstance(tree, list) else Yaco()
+    stack = [(tree, root)]
+    while stack:
+        src, dst = stack.pop()
+        if isinstance(dst, list):
+            dst.extend(src)
+            items = enumerate(src)
+            setitem = list.__setitem__
+        else:
+            mode = src.__dict__.get('_missing_mode')
+            if mode is not None:
+                dst.__dict__['_missing_mode'] = mode
+            dict.update(dst, src)
+            items = dict.items(src)
+            setitem = dict.__setitem__
+        for key, value in items:
+            kind = type(value)
+            if kind is Yaco:
+                new = Yaco()
+            elif kind is list:
+                new = []
+            elif kind is not FrozenYaco and isinstance(value, Yaco):
+                new = Yaco()
+            else:
+                continue
+            setitem(dst, key, new)
+            stack.append((value, new))
+    return root
+
+
+def _thaw(value):
+    """
+    Return a mutable (plain) version of a frozen value
+    """
+    if isinstance(value, dict):
+        return dict([(k, _thaw(v)) for k, v in dict.items(value)])
+    elif isinstance(value, tuple):
+        return [_thaw(x) for x in value]
+    return value
+
+
+#    .88b  d88.  .d8b.  d8888b. d8888b. d88888b d8888b.
+#    88'YbdP`88 d8' `8b 88  `8D 88  `8D 88'     88  `8D
+#    88  88  88 88ooo88 88oodD' 88oodD' 88ooooo 88   88
+#    88  88  88 88~~~88 88~~~   88~~~   88~~~~~ 88   88
+#    88  88  88 88   88 88      88      88.     88  .8D
+#    YP  YP  YP YP   YP 88      88      Y88888P Y8888D'
+
+class MappedYaco(object):
+
+    """
+    Read-only access to an indexed snapshot (see Yaco.save_snapshot)
+    through a memory map. Opening one only reads the index - a top
+    level key is decoded, straight from the mapped file, when it is
+    first looked up. Branches are returned as FrozenYaco objects (and
+    lists as tuples): looking up a missing key - at the top level or
+    in a branch - returns MISSING, and leaves the view as it is.
+
+    >>> import tempfile
+    >>> tf = tempfile.NamedTemporaryFile(delete=True)
+    >>> tf.close()
+    >>> Yaco({'a': {'b': [1, {'c': 2}]}, 'd': 3}).save_snapshot(
+    ...     tf.name, index=True)
+    >>> with MappedYaco(tf.name) as m:
+    ...     (sorted(m.keys()), m.d, m.a.b[1].c, m.get_path('a.x', None),
+    ...      m.a.x.y, m.x, m['a.x'], 'x' in m.a)
+    (['a', 'd'], 3, 2, None, MISSING, MISSING, MISSING, False)
+    """
+
+    _map = None
+    _view = None
+
+    def __init__(self, filename):
+        """
+        :param filename: indexed snapshot to open. Raises a ValueError
+           if it is not valid
+        """
+        filename = os.path.expanduser(filename)
+        with open(filename, 'rb') as F:
+            try:
+                self._map = mmap.mmap(
+                    F.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file cannot be mapped
+                raise ValueError("snapshot is truncated")
+        try:
+            self._view = memoryview(self._map)
+        except TypeError:
+            # python 2: slices of the map are copies
+            self._view = self._map
+        try:
+            self._index, self._start = _load_index(self._view)
+        except:
+            self.close()
+            raise
+        self._filename = filename
+        self._branches = {}
+
+    def _get(self, key):
+        """
+        Return the value of a top level key - decoded on first use
+        """
+        try:
+            return self._branches[key]
+        except KeyError:
+            pass
+        offset, length = self._index[key]
+        if self._view is None:
+            raise ValueError("{0} is closed".format(self))
+        offset += self._start
+        value = _freeze(_load_snapshot(self._view[offset:offset + length]))
+        self._branches[key] = value
+        return value
+
+    def get_path(self, key, default=_NOTHING):
+        """
+        As Yaco.get_path
+        """
+        if isinstance(key, YacoPath):
+            parts = key.parts
+        elif isinstance(key, str):
+            parts = _split_path(key)
+        else:
+            parts = (key,)
+        try:
+            node = self._get(parts[0])
+            for k in parts[1:]:
+                node = dict.__getitem__(node, k)
+        except (KeyError, TypeError, IndexError):
+            if default is not _NOTHING:
+                return default
+            raise KeyError(key.key if isinstance(key, YacoPath) else key)
+        return node
+
+    def get(self, key, default=None):
+        return self.get_path(key, default)
+
+    def __getitem__(self, key):
+        return self.get_path(key, MISSING)
+
+    def __getattr__(self, key):
+        if key[:2] == '__':
+            raise AttributeError(key)
+        return self.get_path(key, MISSING)
+
+    def __contains__(self, key):
+        try:
+            self.get_path(key)
+        except KeyError:
+            return False
+        return True
+
+    def keys(self):
+        return list(self._index.keys())
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_data(self):
+        """
+        Return all data (as Yaco.get_data)
+        """
+        return _read_snapshot(self._filename)
+
+    def close(self):
+        """
+        Unmap the snapshot - branches looked up remain valid
+        """
+        if self._map is not None:
+            try:
+                if self._view is not self._map:
+                    self._view.release()
+                self._map.close()
+            except BufferError:
+                # slices are still referenced (e.g. by a traceback) -
+                # it is unmapped when those are gone
+                pass
+            self._map = self._view = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "<MappedYaco {0} ({1} keys)>".format(
+            self._filename, len(self._index))
+
+
+#     .o88b.  .d88b.  .88b  d88. d8888b.  .d8b.   .o88b. d888888b
+#    d8P  Y8 .8P  Y8. 88'YbdP`88 88  `8D d8' `8b d8P  Y8 `~~88~~'
+#    8P      88    88 88  88  88 88oodD' 88ooo88 8P         88
+#    8b      88    88 88  88  88 88~~~   88~~~88 8b         88
+#    Y8b  d8 `8b  d8' 88  88  88 88      88   88 Y8b  d8    88
+#     `Y88P'  `Y88P'  YP  YP  YP 88      YP   YP  `Y88P'    YP
+
+class _Layout(object):
+
+    """
+    The keys of CompactYaco nodes - shared by all nodes with the same
+    keys (in the same order)
+    """
+
+    __slots__ = ('keys', 'index', 'added', '__weakref__')
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = dict([(k, i) for i, k in enumerate(keys)])
+        # layouts with one more key - for as long as they are in use
+        self.added = weakref.WeakValueDictionary()
+
+    def add(self, key):
+        rv = self.added.get(key)
+        if rv is None:
+            rv = self.added[key] = _layout(self.keys + (key,))
+        return rv
+
+
+# all layouts in use
+_LAYOUTS = weakref.WeakValueDictionary()
+
+# lists of ints or floats from this size on are stored as arrays
+COMPACT_ARRAY_SIZE = 8
+
+
+def _layout(keys):
+    """
+    Return the (shared) layout for a tuple of keys
+    """
+    keys = tuple([_intern(k) if type(k) is str else k for k in keys])
+    try:
+        return _LAYOUTS[keys]
+    except KeyError:
+        rv = _LAYOUTS[keys] = _Layout(keys)
+        return rv
+
+
+class CompactYaco(object):
+
+    """
+    A memory efficient Yaco for large trees: nodes have no dict of
+    their own, but a tuple of values and a layout - the (interned)
+    keys, shared by all nodes with the same keys. Lists of only ints
+    or only floats (of at least COMPACT_ARRAY_SIZE items) are stored
+    as arrays.
+
+    It is meant for large trees that are mostly read: writes replace
+    the tuple of values of a node.
+
+    Keys are read & written as with a Yaco - as attributes, items or
+    dotted keys - and missing keys are created (as empty branches) on
+    access. Use get_path, get or `in` to look up keys without creating
+    them.
+
+    >>> c = CompactYaco({'a': {'b': 1, 'c': [0.5, 1.5]},
+    ...                  'd': [{'b': 2}, {'b': 3}]})
+    >>> (c.a.b, c['a.c'][1], c.d[1].b, c.d[0]._layout is c.d[1]._layout)
+    (1, 1.5, 3, True)
+    >>> c.a.e = {'f': 'g'}
+    >>> c['a.e.f']
+    'g'
+    >>> c.x.y = 1
+    >>> c.get_data()['a'], c.get_data()['x']
+    ({'b': 1, 'c': [0.5, 1.5], 'e': {'f': 'g'}}, {'y': 1})
+    >>> c.to_yaco() == c
+    True
+    """
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, data={}):
+        """
+        :param data: data to initialize the structure with
+        :type data: dict (or Yaco) or yaml formatted string
+        """
+        if isinstance(data, str) or isinstance(data, bytes):
+            data = _yaml_load(data)
+        elif not isinstance(data, (dict, CompactYaco)):
+            raise Exception('cannot parse %s' % type(data))
+        keys, values = _compact_items(data)
+        object.__setattr__(self, '_layout', _layout(keys))
+        object.__setattr__(self, '_values', values)
+        _compact(self)
+
+    def __getattr__(self, key):
+        # only called for keys - the slots are always set
+        if isinstance(key, str) and key[:2] == '__':
+            raise AttributeError(key)
+        i = self._layout.index.get(key)
+        if i is None:
+            # new branch - added as it is (assigning would copy it)
+            rv = CompactYaco()
+            object.__setattr__(self, '_layout', self._layout.add(key))
+            object.__setattr__(self, '_values', self._values + (rv,))
+            return rv
+        return self._values[i]
+
+    def __setattr__(self, key, value):
+        value = _compact_value(value)
+        values = self._values
+        i = self._layout.index.get(key)
+        if i is None:
+            object.__setattr__(self, '_layout', self._layout.add(key))
+            values = values + (value,)
+        else:
+            values = values[:i] + (value,) + values[i + 1:]
+        object.__setattr__(self, '_values', values)
+
+    def __delattr__(self, key):
+        i = self._layout.index.get(key)
+        if i is None:
+            raise YacoKeyError(key)
+        keys = self._layout.keys
+        values = self._values
+        object.__setattr__(self, '_layout', _layout(keys[:i] + keys[i + 1:]))
+        object.__setattr__(self, '_values', values[:i] + values[i + 1:])
+
+    def __getitem__(self, key):
+        if not isinstance(key, str) or not '.' in key:
+            return self.__getattr__(key)
+        node = self
+        for k in _split_path(key):
+            node = node[k]
+        return node
+
+    def __setitem__(self, key, value):
+        if isinstance(key, str) and '.' in key:
+            self.set_path(key, value)
+        else:
+            self.__setattr__(key, value)
+
+    __delitem__ = __delattr__
+
+    def get_path(self, key, default=_NOTHING):
+        """
+        As Yaco.get_path
+        """
+        if isinstance(key, YacoPath):
+            parts = key.parts
+        elif isinstance(key, str):
+            parts = _split_path(key)
+        else:
+            parts = (key,)
+        node = self
+        try:
+            for k in parts:
+                node = node._values[node._layout.index[k]]
+        except (KeyError, AttributeError):
+            if default is not _NOTHING:
+                return default
+            raise KeyError(key.key if isinstance(key, YacoPath) else key)
+        return node
+
+    def set_path(self, key, value):
+        """
+        As Yaco.set_path
+        """
+        parts = key.parts if isinstance(key, YacoPath) else _split_path(key)
+        if not parts:
+            raise KeyError(key)
+        node = self
+        for k in parts[:-1]:
+            i = node._layout.index.get(k)
+            if i is None:
+                node.__setattr__(k, CompactYaco())
+                i = node._layout.index[k]
+            node = node._values[i]
+        node.__setattr__(parts[-1], value)
+
+    def get(self, key, default=None):
+        return self.get_path(key, default)
+
+    def __contains__(self, key):
+        try:
+            self.get_path(key)
+        except KeyError:
+            return False
+        return True
+
+    def keys(self):
+        return list(self._layout.keys)
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return list(zip(self._layout.keys, self._values))
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "CompactYaco({0!r})".format(dict(self.items()))
+
+    def __eq__(self, other):
+        """
+        Equal to a CompactYaco or dict (Yaco) with the same data -
+        arrays are equal to lists with the same numbers
+        """
+        if isinstance(other, CompactYaco):
+            other = dict(other.items())
+        elif not isinstance(other, dict):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for key, value in self.items():
+            other_value = dict.get(other, key, _NOTHING)
+            if other_value is _NOTHING or \
+                    not _compact_equal(value, other_value):
+                return False
+        return True
+
+    def __ne__(self, other):
+        rv = self.__eq__(other)
+        return rv if rv is NotImplemented else not rv
+
+    __hash__ = None
+
+    def get_data(self):
+        """
+        As Yaco.get_data - arrays are exported as lists
+        """
+        return _export(self)
+
+    def simple(self):
+        return _export(self, simple=True)
+
+    def dump(self):
+        return _yaml_dump(self.get_data())
+
+    def save(self, to_file, doNotSave=[]):
+        """
+        As Yaco.save
+        """
+        to_file = os.path.expanduser(to_file)
+        with _atomic_open(to_file) as F:
+            _emit_yaml(self, F, doNotSave)
+
+    def to_yaco(self):
+        """
+        Return a (normal) Yaco copy of this tree
+        """
+        return Yaco.from_data(self, trusted=False)
+
+
+def _compact_items(data):
+    """
+    Return the keys & (a list of) values of a dict-like
+    """
+    if type(data) is dict or type(data) is Yaco:
+        return tuple(data), list(dict.values(data))
+    # subclasses may need to do work on access
+    items = list(data.items())
+    return tuple([k for k, v in items]), [v for k, v in items]
+
+
+def _compact_equal(value, other):
+    """
+    Compare a value of a CompactYaco - arrays as lists
+    """
+    if isinstance(value, array.array):
+        value = value.tolist()
+    if isinstance(other, array.array):
+        other = other.tolist()
+    if isinstance(value, list) and isinstance(other, list):
+        return len(value) == len(other) and all(
+            [_compact_equal(a, b) for a, b in zip(value, other)])
+    return value == other
+
+
+def _compact_list(value):
+    """
+    Return an array for a (long enough) list of only ints or only
+    floats - or a (new) list
+    """
+    if len(value) >= COMPACT_ARRAY_SIZE:
+        kind = type(value[0])
+        if kind is int or kind is float:
+            for x in value:
+                if type(x) is not kind:
+                    break
+            else:
+                try:
+                    return array.array('q' if kind is int else 'd', value)
+                except OverflowError:
+                    pass
+    return list(value)
+
+
+def _compact_value(value):
+    """
+    Return the compact version of a value
+    """
+    if isinstance(value, (dict, CompactYaco)):
+        return CompactYaco(value)
+    elif isinstance(value, list):
+        rv = _compact_list(value)
+        if type(rv) is list:
+            _compact(rv)
+        return rv
+    return value
+
+
+def _compact(root):
+    """
+    Convert the dicts & lists in the values (a list, for now) of a new
+    compact node (or in a list) - iteratively, so there is no
+    recursion limit
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        values = node._values if type(node) is CompactYaco else node
+        for i, value in enumerate(values):
+            if isinstance(value, (dict, CompactYaco)):
+                keys, child = _compact_items(value)
+                new = object.__new__(CompactYaco)
+                object.__setattr__(new, '_layout', _layout(keys))
+                object.__setattr__(new, '_values', child)
+            elif isinstance(value, list):
+                new = _compact_list(value)
+                if type(new) is not list:
+                    values[i] = new
+                    continue
+            elif isinstance(value, array.array):
+                values[i] = array.array(value.typecode, value)
+                continue
+            else:
+                continue
+            values[i] = new
+            stack.append(new)
+        if values is not node:
+            # the (converted) children are filled in later on
+            object.__setattr__(node, '_values', tuple(values))
+
+
+#    db    db  .d8b.   .o88b.  .d88b.  d88888b d888888b db      d88888b
+#    `8b  d8' d8' `8b d8P  Y8 .8P  Y8. 88'       `88'   88      88'
+#     `8bd8'  88ooo88 8P      88    88 88ooo      88    88      88ooooo
+#       88    88~~~88 8b      88    88 88~~~      88    88      88~~~~~
+#       88    88   88 Y8b  d8 `8b  d8' 88        .88.   88booo. 88.
+#       YP    YP   YP  `Y88P'  `Y88P'  YP      Y888888P Y88888P Y88888P
+
+
+class YacoFile(Yaco):
+
+    """
+    As Yaco, but loads from a file - or returns an emtpy object if it
+    cannot find the file
+    """
+
+    def __init__(self, filename):
+        """
+        Constructor
 
         :param filename: filename to load
         :type filename: string
@@ -519,6 +2434,7 @@ class YacoFile(Yaco):
         """
         Load from the defined filename
         """
+        self.__dict__['_signature'] = _path_signature(self._filename)
         super(YacoFile, self).load(self._filename)
 
     def save(self):
@@ -527,6 +2443,41 @@ class YacoFile(Yaco):
         """
         super(YacoFile, self).save(self._filename)
 
+    @classmethod
+    def aload(cls, filename, executor=None):
+        """
+        Create a YacoFile from asyncio (python 3.7+) - as the
+        constructor, but reading & parsing the file in executor (see
+        Yaco.aload): `y = await YacoFile.aload(filename)`
+        """
+        from Yaco import _aio
+        return _aio.load_file(cls, filename, executor)
+
+    def asave(self, executor=None):
+        """
+        Save to the defined filename, from asyncio (see Yaco.asave)
+        """
+        return super(YacoFile, self).asave(self._filename,
+                                           executor=executor)
+
+    def _reloaded(self):
+        """
+        If the file changed, return a function that returns the
+        reloaded tree (a fresh copy) & the changed keys - None
+        otherwise
+        """
+        if _path_signature(self._filename) == \
+                self.__dict__.get('_signature'):
+            return None
+        new = YacoFile(self._filename)
+        return (lambda: new), _diff_keys(_raw_data(self), _raw_data(new), '')
+
+    def _source_signature(self):
+        return _path_signature(self._filename)
+
+    def _watch_paths(self):
+        return _watch_dirs(self._filename)
+
 
 def _get_leaf(leaf, d, pattern):
     """
@@ -569,12 +2520,25 @@ class YacoDir(Yaco):
         y.sub.x == 1
 
 
-    Note, YacoDir will try to cache itself in a .yacodir.cache file in
-    the root of the dirname if the modification date of this file is
-    the same as the directory - that will be loaded instead.
+    Note, YacoDir caches the merged tree as a binary snapshot (see
+    Yaco.save_snapshot) in a .yacodir_cache file in the root of the
+    directory, together with a manifest of the path, size and
+    modification time of each file that went into it. On the next
+    load the directory is only stat'ed - if the manifest still
+    matches, the cache is loaded instead of parsing every file.
     """
 
-    def __init__(self, dirname, pattern='*.config'):
+    # loading state - kept as instance attributes, not as keys
+    _dirname = None
+    _pattern = None
+    _entries = None
+    _pending = None
+    _parsed = None
+    _parallel = None
+    _root_keys = None
+
+    def __init__(self, dirname, pattern='*.config', cache=True,
+                 lazy=False, workers=None, executor='thread'):
         """
         Constructor
 
@@ -582,59 +2546,1099 @@ class YacoDir(Yaco):
         :type dirname: string
         :param glob: a glob describing what files to load
         :type glob: string
+        :param cache: use (and write) the directory cache
+        :type cache: bool
+        :param lazy: parse files loaded into a leaf only when that
+            leaf is first accessed
+        :type lazy: bool
+        :param workers: number of files to parse in parallel
+        :type workers: int
+        :param executor: 'thread' or 'process' pool for parallel
+            parsing
+        :type executor: string
         """
         dict.__init__(self)
-        #print("loading", dirname, pattern)
-        self.load(dirname, pattern)
+        self.load(dirname, pattern, cache=cache, lazy=lazy,
+                  workers=workers, executor=executor)
 
-    def load(self, dirname, pattern):
+    def load(self, dirname, pattern, cache=True, lazy=False,
+             workers=None, executor='thread'):
         """
         Load from the defined directory
+
+        In lazy mode only the files in the root of the directory that
+        load into the root (starting with an underscore) are parsed
+        immediately. All other files are grouped per top level key
+        (e.g. all files under `sub/` end up in `sub`), and a top level
+        key is only parsed when it is first accessed. The result is
+        the same as a normal load. A lazy load does not write the
+        cache (it would need to parse all files), but does use a
+        valid cache.
+
+        With workers > 1, files are parsed in parallel in a thread
+        pool - or a process pool with executor='process', which is
+        faster for CPU bound parsing as yaml parsing holds the GIL.
+        Files are always merged one by one in the normal order, so
+        the result does not change.
+        """
+
+        profiling = _profiling
+        if profiling:
+            start = _timer()
+        cachefile = os.path.join(dirname, YACODIR_CACHEFILE)
+        to_load = _scan_dir(dirname, pattern)
+        manifest = _dir_manifest(pattern, to_load)
+        self._set_entries(dirname, pattern, to_load, (workers, executor))
+
+        if cache:
+            if profiling:
+                event = _load_event('YacoDir', cachefile, cached=True)
+                event['stat'] = _timer() - start
+                start = _timer()
+            data = _read_cache(cachefile, manifest)
+            if data is not None:
+                lg.debug("YacoDir loading from cache {0}".format(cachefile))
+                if profiling:
+                    event['read'] = _timer() - start
+                    start = _timer()
+                self.__dict__['_root_keys'] = None
+                self.update(data)
+                if profiling:
+                    event['merge'] = _timer() - start
+                    _emit_load(event, data)
+                return
+
+        if lazy:
+            self._load_lazy()
+            return
+
+        parse = _parse_file_profiled if profiling else _parse_file
+        parsed = _map_parallel(parse, [e[1] for e in to_load],
+                               workers, executor)
+        for entry, y in zip(to_load, parsed):
+            event = None
+            if profiling:
+                y, event = y
+            self._merge_file(entry, y, event)
+
+        if self and cache:
+            # after loading - save to cache!
+            _write_cache(cachefile, manifest, _raw_data(self))
+
+    def _set_entries(self, dirname, pattern, to_load, parallel):
+        """
+        Set the loading state, for the entries (see _scan_dir) to load
+        """
+        self.__dict__['_dirname'] = dirname
+        self.__dict__['_pattern'] = pattern
+        self.__dict__['_entries'] = to_load
+        self.__dict__['_parallel'] = parallel
+        self.__dict__['_root_keys'] = {}
+
+    def _merge_file(self, entry, data, event=None):
+        """
+        Merge the parsed data of a file (an entry of _scan_dir) into
+        its leaf - & emit its load event, if given
+        """
+        lg.debug("YacoDir loading {0}".format(entry[1]))
+        if event is not None:
+            start = _timer()
+        nleaf = entry[2]
+        if nleaf == '':
+            self._root_keys[entry[0]] = _keys(data)
+            self.update(data)
+        else:
+            self[nleaf].update(data)
+        if event is not None:
+            event['merge'] = _timer() - start
+            _emit_load(event, data)
+
+    def _load_lazy(self):
+        """
+        Parse the root files & register all other top level keys as
+        pending
+        """
+        pending = set()
+        for relname, fullname, nleaf, size, mtime_ns in self._entries:
+            if nleaf != '':
+                pending.add(nleaf.split('.', 1)[0])
+
+        parsed = {}
+        roots = [e for e in self._entries if e[2] == '']
+        for entry, y in zip(roots, self._parse([e[1] for e in roots])):
+            relname = entry[0]
+            lg.debug("YacoDir loading {0}".format(entry[1]))
+            self._root_keys[relname] = _keys(y)
+            if not y:
+                continue
+            # keys that are also loaded from other files are merged,
+            # in order, when they are loaded
+            Yaco.update(self, dict([(k, v) for k, v in y.items()
+                                    if k not in pending]))
+            parsed[relname] = dict([(k, v) for k, v in y.items()
+                                    if k in pending])
+
+        for key in pending:
+            dict.__setitem__(self, key, Yaco())
+        self.__dict__['_parsed'] = parsed
+        self.__dict__['_pending'] = pending
+
+    def _load_key(self, key):
+        """
+        Load all files that contribute to a pending top level key - in
+        the same order as a normal load
+        """
+        self._pending.discard(key)
+        dict.__delitem__(self, key)
+        entries = [e for e in self._entries
+                   if e[2] == '' or e[2].split('.', 1)[0] == key]
+        to_parse = [e[1] for e in entries if e[2] != '']
+        parsed = self._parse(to_parse)
+        for relname, fullname, nleaf, size, mtime_ns in entries:
+            if nleaf == '':
+                y = self._parsed.get(relname)
+                if y and key in y:
+                    Yaco.update(self, {key: y.pop(key)})
+            else:
+                lg.debug("YacoDir loading {0}".format(fullname))
+                Yaco.__getitem__(self, nleaf).update(next(parsed))
+
+    def refresh(self):
+        """
+        Bring this YacoDir up to date with the directory.
+
+        Only files that were added, changed or removed are detected
+        (by their size & modification time), and only the top level
+        keys these files contribute to are rebuilt - from all files
+        that contribute to them, in the normal merge order. Each key
+        is built on the side and then swapped in as a whole, so
+        readers never see a key that is missing or half built.
+
+        Returns a sorted list of the dotted keys that changed. Keys
+        that were never accessed in lazy mode are reported as a
+        whole (they are rebuilt, but there is no old value to compare
+        with).
+        """
+        plan = self._refresh_plan()
+        if plan is None:
+            return []
+        return self._refresh_apply(plan)
+
+    def _refresh_plan(self):
+        """
+        Parse the changed files & build the top level keys they
+        contribute to - without changing this YacoDir. Returns None
+        if no file changed, otherwise the new state (see
+        _refresh_apply) with the sorted changed keys as last item
+        """
+        old_entries = dict([(e[0], e) for e in self._entries])
+        new_entries = _scan_dir(self._dirname, self._pattern)
+        new_names = set([e[0] for e in new_entries])
+        changed = set(old_entries) ^ new_names
+        for entry in new_entries:
+            old = old_entries.get(entry[0])
+            if old is not None and old[3:] != entry[3:]:
+                changed.add(entry[0])
+        if not changed:
+            return None
+
+        affected = set()
+        old_root_keys = self._root_keys
+        for relname in changed:
+            old = old_entries.get(relname)
+            if old is not None:
+                if old[2] != '':
+                    affected.add(old[2].split('.', 1)[0])
+                elif old_root_keys is not None and relname in old_root_keys:
+                    affected.update(old_root_keys[relname])
+                else:
+                    # unknown what this file contributed
+                    affected.update(dict.keys(self))
+
+        # files parsed during this refresh - each is parsed once
+        parsed = {}
+        root_keys = dict(old_root_keys or {})
+        for entry in new_entries:
+            if entry[0] not in changed:
+                continue
+            if entry[2] == '':
+                root_keys[entry[0]] = _keys(self._file_data(entry, parsed))
+                affected.update(root_keys[entry[0]])
+            else:
+                affected.add(entry[2].split('.', 1)[0])
+        for relname in changed - new_names:
+            root_keys.pop(relname, None)
+
+        built = {}
+        rv = []
+        for key in sorted(affected, key=str):
+            new = self._build_key(key, new_entries, parsed, root_keys)
+            built[key] = new
+            if self._pending and key in self._pending:
+                rv.append(str(key))
+            else:
+                old = _raw_data(dict.get(self, key, _NOTHING))
+                rv.extend(_diff_keys(old, _raw_data(new), str(key)))
+        return new_entries, root_keys, changed, built, sorted(rv)
+
+    def _refresh_apply(self, plan):
+        """
+        Swap in the keys built by _refresh_plan - one at a time, each
+        as a whole. Returns the changed keys.
+        """
+        new_entries, root_keys, changed, built, rv = plan
+        self.__dict__['_entries'] = new_entries
+        self.__dict__['_root_keys'] = root_keys
+        if self._parsed:
+            for relname in changed:
+                self._parsed.pop(relname, None)
+        for key, value in built.items():
+            if value is _NOTHING:
+                if dict.__contains__(self, key):
+                    dict.__delitem__(self, key)
+            else:
+                dict.__setitem__(self, key, value)
+            if self._pending:
+                self._pending.discard(key)
+        return rv
+
+    def _reloaded(self):
+        """
+        If any of the files changed, return a function that returns an
+        up to date YacoDir, & the changed keys - None otherwise.
+
+        This YacoDir is never changed: the new one is a shallow copy
+        of its top level, that shares the unchanged branches & takes
+        the rebuilt keys (see refresh).
+        """
+        plan = self._refresh_plan()
+        if plan is None:
+            return None
+
+        def apply():
+            new = self._shallow_copy()
+            new._refresh_apply(plan)
+            return new
+        return apply, plan[-1]
+
+    def _shallow_copy(self):
+        """
+        Copy the top level of this YacoDir (sharing all branches),
+        and its loading state
+        """
+        new = dict.__new__(type(self))
+        dict.update(new, self)
+        state = dict(self.__dict__)
+        for name in ('_pending', '_root_keys'):
+            if state.get(name) is not None:
+                state[name] = state[name].copy()
+        if state.get('_parsed') is not None:
+            state['_parsed'] = dict([(k, dict(v)) for k, v
+                                     in state['_parsed'].items()])
+        new.__dict__.update(state)
+        return new
+
+    def _source_signature(self):
+        return _scan_dir(self._dirname, self._pattern)
+
+    def _watch_paths(self):
+        return _watch_dirs(self._dirname)
+
+    def _build_key(self, key, entries, parsed, root_keys=None):
+        """
+        Build a top level key from all entries that contribute to it,
+        on the side - returns its value, or _NOTHING if no file
+        contributes to it. Files are parsed once, into parsed.
+
+        Root files that do not contribute to the key according to
+        root_keys (the keys of each root file) are not parsed - root
+        files missing from root_keys (e.g. after loading from the
+        cache) always are.
+        """
+        scratch = self._branch()
+        for entry in entries:
+            nleaf = entry[2]
+            if nleaf == '':
+                if root_keys is not None and entry[0] in root_keys \
+                        and key not in root_keys[entry[0]]:
+                    continue
+                y = self._file_data(entry, parsed)
+                if y and key in y:
+                    Yaco.update(scratch, {key: y[key]})
+            elif nleaf.split('.', 1)[0] == key:
+                Yaco.__getitem__(scratch, nleaf).update(
+                    self._file_data(entry, parsed))
+        return dict.get(scratch, key, _NOTHING)
+
+    def _file_data(self, entry, parsed):
+        """
+        Return the parsed data of a file - parsing it if it is not in
+        parsed yet
+        """
+        relname, fullname = entry[0], entry[1]
+        if relname in parsed:
+            return parsed[relname]
+        lg.debug("YacoDir loading {0}".format(fullname))
+        if _profiling:
+            data = _emit_parsed(*_parse_file_profiled(fullname))
+        else:
+            data = _parse_file(fullname)
+        parsed[relname] = data
+        return data
+
+    def _parse(self, filenames):
+        """
+        Parse files - in parallel if so configured
+        """
+        workers, executor = self._parallel or (None, 'thread')
+        if not _profiling:
+            return _map_parallel(_parse_file, filenames, workers, executor)
+        # lazily loaded files are merged in parts - the event is sent
+        # without a merge time
+        parsed = _map_parallel(
+            _parse_file_profiled, filenames, workers, executor)
+        return (_emit_parsed(data, event) for data, event in parsed)
+
+    def _load_all(self):
         """
+        Load all pending keys
+        """
+        if self._pending:
+            for key in list(self._pending):
+                self._load_key(key)
+
+    def __getattr__(self, key):
+        if self._pending and key in self._pending:
+            self._load_key(key)
+        return super(YacoDir, self).__getattr__(key)
+
+    def __setattr__(self, key, value):
+        if self._pending and key in self._pending:
+            self._load_key(key)
+        super(YacoDir, self).__setattr__(key, value)
+
+    def __delattr__(self, key):
+        if self._pending:
+            self._pending.discard(key)
+        return super(YacoDir, self).__delattr__(key)
+
+    __delitem__ = __delattr__
+
+    def get(self, key, default=None):
+        if self._pending and key in self._pending:
+            self._load_key(key)
+        return super(YacoDir, self).get(key, default)
+
+    def _load_path(self, key):
+        """
+        Load the pending top level key of a dotted key or YacoPath
+        """
+        parts = key.parts if isinstance(key, YacoPath) else _split_path(key)
+        if parts and parts[0] in self._pending:
+            self._load_key(parts[0])
+
+    def get_path(self, key, default=_NOTHING):
+        if self._pending:
+            self._load_path(key)
+        return super(YacoDir, self).get_path(key, default)
+
+    def set_path(self, key, value):
+        if self._pending:
+            self._load_path(key)
+        return super(YacoDir, self).set_path(key, value)
+
+    def _load_keys(self, data):
+        """
+        Load the pending keys that are about to be merged into
+        """
+        if self._pending and data:
+            for key in list(data.keys()):
+                if key in self._pending:
+                    self._load_key(key)
+
+    def update(self, data):
+        self._load_keys(data)
+        super(YacoDir, self).update(data)
+
+    def soft_update(self, data):
+        self._load_keys(data)
+        super(YacoDir, self).soft_update(data)
+
+    def items(self):
+        self._load_all()
+        return super(YacoDir, self).items()
+
+    def values(self):
+        self._load_all()
+        return super(YacoDir, self).values()
+
+    def copy(self):
+        self._load_all()
+        return super(YacoDir, self).copy()
+
+    def pop(self, key, *args):
+        if self._pending and key in self._pending:
+            self._load_key(key)
+        return super(YacoDir, self).pop(key, *args)
+
+    def __eq__(self, other):
+        self._load_all()
+        return super(YacoDir, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._load_all()
+        return super(YacoDir, self).__repr__()
+
+    def save(self):
+        """
+        Save is disabled.
+        """
+        raise Exception("Cannot save to a YacoDir")
+
+    def asave(self, *args, **kwargs):
+        raise Exception("Cannot save to a YacoDir")
+
+    @classmethod
+    def aload(cls, dirname, pattern='*.config', cache=True, executor=None):
+        """
+        Create a YacoDir from asyncio (python 3.7+):
+        `y = await YacoDir.aload(dirname)`
+
+        As the constructor - but the directory is scanned & the cache
+        is read (or written) in the default executor of the running
+        loop, and all files are read & parsed at the same time in
+        executor (by default, that same default executor). The parsed
+        files are merged on the event loop, in order, as they come in.
+        """
+        from Yaco import _aio
+        return _aio.load_dir(cls, dirname, pattern, cache, executor)
+
+
+def _map_parallel(func, items, workers=None, executor='thread'):
+    """
+    Generate func(item) for all items, in order. If workers > 1, the
+    calls are made in a thread or process pool (executor is 'thread'
+    or 'process').
+    """
+    if executor not in ('thread', 'process'):
+        raise Exception("invalid executor {0}".format(executor))
+    futures = None
+    if workers and workers > 1 and len(items) > 1:
+        try:
+            from concurrent import futures
+        except ImportError:
+            # python 2 without the futures backport - no parallel loading
+            pass
+    if futures is None:
+        for item in items:
+            yield func(item)
+        return
+    if executor == 'process':
+        pool = futures.ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = futures.ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        for rv in pool.map(func, items):
+            yield rv
+
+
+def _keys(data):
+    """
+    Return the keys of parsed data - if it is a dict
+    """
+    return set(data) if isinstance(data, dict) else set()
+
+
+def _diff_keys(old, new, prefix):
+    """
+    Return the dotted keys that differ between two (plain) data
+    structures
+
+    >>> _diff_keys({'a': 1, 'b': {'c': 2, 'd': 3}},
+    ...            {'a': 1, 'b': {'c': 2, 'd': 4}, 'e': 5}, 'x')
+    ['x.b.d', 'x.e']
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        rv = []
+        for k in set(old) | set(new):
+            key = '{0}.{1}'.format(prefix, k) if prefix else str(k)
+            rv.extend(_diff_keys(old.get(k, _NOTHING),
+                                 new.get(k, _NOTHING), key))
+        return sorted(rv)
+    if type(old) is type(new) and old == new:
+        return []
+    return [prefix]
+
+
+def _parse_file(fullname):
+    """
+    Parse a single yaml file
+    """
+    with open(fullname, 'rb') as F:
+        return _yaml_load(F)
+
+
+def _parse_file_profiled(fullname):
+    """
+    As _parse_file, but return a (YacoDir) load event as well
+    """
+    event = _load_event('YacoDir', fullname)
+    return _read_profiled(fullname, event), event
+
+
+def _emit_parsed(data, event):
+    _emit_load(event, data)
+    return data
+
+
+def _raw_data(item):
+    """
+    Convert a Yaco structure to plain dicts & lists - as get_data,
+    but keeping private (underscore) keys
+    """
+    if isinstance(item, dict):
+        return dict([(k, _raw_data(v)) for k, v in item.items()])
+    elif isinstance(item, list):
+        return [_raw_data(x) for x in item]
+    return item
+
+
+def _stat_signature(st):
+    """
+    Return the (size, mtime_ns) signature of a stat result
+    """
+    mtime_ns = getattr(st, 'st_mtime_ns', None)
+    if mtime_ns is None:
+        mtime_ns = int(st.st_mtime * 1e9)
+    return st.st_size, mtime_ns
+
+
+def _scan_dir(dirname, pattern):
+    """
+    Walk a directory & return all files matching pattern in merge
+    order (alphanumerical, a directory before its subdirectories).
+
+    Each file is returned as a tuple of (relative name, full name,
+    leaf, size, mtime_ns).
+    """
+    rv = []
+    for root, dirs, files in os.walk(dirname):
+        dirs.sort()
+        to_parse = sorted(fnmatch.filter(files, pattern))
+        base = root.replace(dirname, '').strip('/')
+        base = base.replace('/', '.')
+        for filename in to_parse:
+            if filename == YACODIR_CACHEFILE:
+                continue
+            fullname = os.path.join(root, filename)
+            try:
+                size, mtime_ns = _stat_signature(os.stat(fullname))
+            except OSError:
+                # file disappeared while walking
+                continue
+            rv.append((os.path.relpath(fullname, dirname), fullname,
+                       _get_leaf(base, filename, pattern),
+                       size, mtime_ns))
+    return rv
+
+
+def _dir_manifest(pattern, to_load):
+    """
+    Build the cache manifest for a list of files returned by
+    _scan_dir. The order of the files is the merge order.
+    """
+    return {'version': YACODIR_CACHE_VERSION,
+            'pattern': pattern,
+            'files': [[relname, size, mtime_ns]
+                      for relname, _, _, size, mtime_ns in to_load]}
+
+
+def _read_cache(cachefile, manifest):
+    """
+    Return the cached data if the cache manifest matches - None
+    otherwise. The cache lives next to the config files - it is only
+    read if it is marshalled: unpickling it could run any code.
+    """
+    if not os.path.exists(cachefile):
+        return None
+    try:
+        cached = _read_snapshot(cachefile, pickled=False)
+    except (IOError, OSError, ValueError) as e:
+        lg.debug("cannot read cache {0}: {1}".format(cachefile, e))
+        return None
+    if not isinstance(cached, dict) or \
+            cached.get('manifest') != manifest:
+        lg.debug("cache {0} is stale".format(cachefile))
+        return None
+    return cached.get('data')
+
+
+def _write_cache(cachefile, manifest, data):
+    """
+    Write the cache - marshalled only (see _read_cache). Failing to
+    write the cache (read only directory, data that cannot be
+    marshalled, e.g. dates) is not an error.
+    """
+    try:
+        _write_snapshot(cachefile, {'manifest': manifest, 'data': data},
+                        pickled=False)
+    except (IOError, OSError, ValueError) as e:
+        lg.debug("cannot write cache {0}: {1}".format(cachefile, e))
+
+
+def _dump_snapshot(data, magic=SNAPSHOT_MAGIC, pickled=True,
+                   portable=False):
+    """
+    Serialize data to the binary snapshot format. Marshal is used
+    when possible (fastest), pickle otherwise (e.g. for dates) - if
+    pickled. Otherwise, a ValueError is raised.
+
+    A portable snapshot is always pickled, with a fixed protocol: the
+    marshal format differs between python versions.
+    """
+    if portable:
+        codec = SNAPSHOT_PICKLE
+        payload = pickle.dumps(data, SNAPSHOT_PICKLE_PROTOCOL)
+    else:
+        try:
+            codec = SNAPSHOT_MARSHAL
+            payload = marshal.dumps(data)
+        except ValueError:
+            if not pickled:
+                raise
+            codec = SNAPSHOT_PICKLE
+            payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    header = _SNAPSHOT_HEADER.pack(
+        magic, SNAPSHOT_VERSION, codec,
+        sys.version_info[0], sys.version_info[1],
+        zlib.crc32(payload) & 0xffffffff, len(payload))
+    return header + payload
+
+
+def _load_snapshot(raw, magic=SNAPSHOT_MAGIC, pickled=True):
+    """
+    Deserialize a binary snapshot (bytes or any buffer, e.g. a slice
+    of a memory map) - raises a ValueError if it is not valid (or not
+    readable by this python version), or if it is pickled and pickled
+    snapshots are not accepted
+    """
+    hsize = _SNAPSHOT_HEADER.size
+    if len(raw) < hsize:
+        raise ValueError("snapshot is truncated")
+    found, version, codec, major, minor, crc, length = \
+        _SNAPSHOT_HEADER.unpack(raw[:hsize])
+    if found != magic:
+        raise ValueError("not a Yaco snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError("unsupported snapshot version {0}".format(version))
+    payload = raw[hsize:]
+    if len(payload) != length or \
+            zlib.crc32(payload) & 0xffffffff != crc:
+        raise ValueError("snapshot checksum mismatch")
+    if codec == SNAPSHOT_MARSHAL:
+        if (major, minor) != tuple(sys.version_info[:2]):
+            raise ValueError("snapshot was written by python {0}.{1}"
+                             .format(major, minor))
+        return marshal.loads(payload)
+    elif codec == SNAPSHOT_PICKLE:
+        if not pickled:
+            raise ValueError("refusing to unpickle snapshot")
+        return pickle.loads(payload)
+    raise ValueError("unknown snapshot codec {0}".format(codec))
+
+
+def _load_index(raw):
+    """
+    Deserialize the index of an indexed snapshot - returns the index
+    ({key: (offset, length)}) & the offset the keys are relative to
+    """
+    hsize = _SNAPSHOT_HEADER.size
+    if len(raw) < hsize:
+        raise ValueError("snapshot is truncated")
+    end = hsize + _SNAPSHOT_HEADER.unpack(raw[:hsize])[-1]
+    return _load_snapshot(raw[:end], SNAPSHOT_INDEX_MAGIC), end
+
+
+def _write_snapshot(to_file, data, index=False, pickled=True):
+    if not index:
+        _atomic_write(to_file, _dump_snapshot(data, pickled=pickled))
+        return
+    offsets = {}
+    blobs = []
+    offset = 0
+    for key, value in data.items():
+        blob = _dump_snapshot(value, pickled=pickled)
+        offsets[key] = (offset, len(blob))
+        offset += len(blob)
+        blobs.append(blob)
+    with _atomic_open(to_file, 'wb') as F:
+        F.write(_dump_snapshot(offsets, SNAPSHOT_INDEX_MAGIC))
+        for blob in blobs:
+            F.write(blob)
+
+
+def _read_snapshot(from_file, pickled=True):
+    with open(from_file, 'rb') as F:
+        raw = F.read()
+    if raw[:len(SNAPSHOT_INDEX_MAGIC)] != SNAPSHOT_INDEX_MAGIC:
+        return _load_snapshot(raw, pickled=pickled)
+    view = memoryview(raw)
+    index, start = _load_index(view)
+    data = {}
+    for key, (offset, length) in index.items():
+        offset += start
+        data[key] = _load_snapshot(view[offset:offset + length],
+                                   pickled=pickled)
+    return data
+
+
+def _pkg_path(pkg_name, path):
+    """
+    Return the filesystem path of a package resource - None if the
+    package cannot be found or does not live on the filesystem
+    """
+    try:
+        __import__(pkg_name)
+    except ImportError:
+        return None
+    base = os.path.dirname(
+        getattr(sys.modules[pkg_name], '__file__', None) or '')
+    if not base or not os.path.isdir(base):
+        return None
+    return os.path.join(base, path.strip('/'))
+
+
+def _pkg_resource(pkg_name, path):
+    """
+    Return the importlib.resources Traversable of a path in a package
+    - or None when pkg_resources has to be used instead
+    """
+    try:
+        # imported here - importlib.resources is not cheap to import
+        from importlib.resources import files
+    except ImportError:
+        # python < 3.9
+        return None
+    try:
+        resource = files(pkg_name)
+    except TypeError:
+        # a module, not a package (python < 3.12)
+        return None
+    for part in path.split('/'):
+        if part:
+            resource = resource.joinpath(part)
+    return resource
+
+
+def _pkg_resources():
+    """
+    Return pkg_resources - imported on first use, as importing it
+    scans all installed distributions
+    """
+    import pkg_resources
+    return pkg_resources
+
+
+def _resource_isdir(pkg_name, path):
+    resource = _pkg_resource(pkg_name, path)
+    if resource is None:
+        return _pkg_resources().resource_isdir(pkg_name, path)
+    return resource.is_dir()
+
+
+def _resource_listdir(pkg_name, path):
+    resource = _pkg_resource(pkg_name, path)
+    if resource is None:
+        return _pkg_resources().resource_listdir(pkg_name, path)
+    return [child.name for child in resource.iterdir()]
+
+
+def _resource_string(pkg_name, path):
+    resource = _pkg_resource(pkg_name, path)
+    if resource is None:
+        return _pkg_resources().resource_string(pkg_name, path)
+    return resource.read_bytes()
+
+
+def _pkg_signature(pkg_name, path, pattern, txt_pattern):
+    """
+    Return a list of [name, size, mtime_ns] for all files that a
+    YacoPkg would read from a package (or the zip file the package
+    lives in). Returns 'missing' if the package or resource does not
+    exist and None if it can not be determined.
+    """
+    try:
+        __import__(pkg_name)
+    except ImportError:
+        return 'missing'
+    mod = sys.modules[pkg_name]
+    base = os.path.dirname(getattr(mod, '__file__', None) or '')
+    if not base:
+        return None
+
+    if os.path.isdir(base):
+        resource = _pkg_path(pkg_name, path)
+        if os.path.isfile(resource):
+            return [[path] + list(_stat_signature(os.stat(resource)))]
+        elif not os.path.isdir(resource):
+            return 'missing'
+        rv = []
+        for root, dirs, files in os.walk(resource):
+            dirs.sort()
+            for filename in sorted(files):
+                if not (fnmatch.fnmatch(filename, pattern) or
+                        fnmatch.fnmatch(filename, txt_pattern)):
+                    continue
+                fullname = os.path.join(root, filename)
+                try:
+                    sig = _stat_signature(os.stat(fullname))
+                except OSError:
+                    continue
+                rv.append([os.path.relpath(fullname, resource)] + list(sig))
+        return rv
+
+    # zipped package - the archive signature will do
+    archive = getattr(getattr(mod, '__loader__', None), 'archive', None)
+    if archive and os.path.isfile(archive):
+        return [[archive] + list(_stat_signature(os.stat(archive)))]
+    return None
+
+
+def _pkg_index_files(dirname, pattern, txt_pattern):
+    """
+    Return [name, size, crc32] for all files in a package directory
+    that a YacoPkg would read - the contents are checked as the
+    modification times change when a package is installed
+    """
+    rv = []
+    for root, dirs, files in os.walk(dirname):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename == YACOPKG_INDEX or not (
+                    fnmatch.fnmatch(filename, pattern) or
+                    fnmatch.fnmatch(filename, txt_pattern)):
+                continue
+            with open(os.path.join(root, filename), 'rb') as F:
+                raw = F.read()
+            name = os.path.relpath(os.path.join(root, filename), dirname)
+            rv.append([name.replace(os.sep, '/'), len(raw),
+                       zlib.crc32(raw) & 0xffffffff])
+    return rv
+
+
+def build_pkg_index(pkg_name, path='etc/', pattern='*.config',
+                    txt_pattern='*.txt', to_file=None):
+    """
+    Load a package directory as YacoPkg does & store the result as a
+    snapshot (by default in the package directory, as YACOPKG_INDEX)
+    that YacoPkg loads in a single read - to be run before packaging,
+    e.g. with `python -m Yaco build-index PKG_NAME [PATH]`. Returns
+    the name of the file written.
+
+    When the package lives on the filesystem, YacoPkg checks the index
+    against the files it was built from, and walks the directory
+    instead if any of them changed.
+
+    The index is a hidden file: list it in the package_data (and
+    MANIFEST.in) of the package, or it is not installed. It is
+    pickled (see SNAPSHOT_PICKLE_PROTOCOL), so that it can be read
+    by any python version the package is installed for.
+    """
+    dirname = _pkg_path(pkg_name, path)
+    if dirname is None or not os.path.isdir(dirname):
+        raise Exception("cannot find directory {0} in package {1}".format(
+            path, pkg_name))
+    if to_file is None:
+        to_file = os.path.join(dirname, YACOPKG_INDEX)
+    data = YacoPkg(pkg_name, path, pattern=pattern,
+                   txt_pattern=txt_pattern, index=False)
+    manifest = {'version': YACOPKG_INDEX_VERSION,
+                'pattern': pattern,
+                'txt_pattern': txt_pattern,
+                'files': _pkg_index_files(dirname, pattern, txt_pattern)}
+    _atomic_write(to_file, _dump_snapshot(
+        {'manifest': manifest, 'data': _raw_data(data)}, portable=True))
+    return to_file
+
+
+def _read_pkg_index(pkg_name, path, pattern, txt_pattern):
+    """
+    Return the data in the prebuilt index of a package directory -
+    None if there is none, or if it is stale
+    """
+    try:
+        raw = _resource_string(pkg_name, path.rstrip('/') + '/' +
+                               YACOPKG_INDEX)
+        index = _load_snapshot(raw)
+    except ImportError:
+        return None
+    except (IOError, OSError, ValueError) as e:
+        lg.debug("no index for {0} {1}: {2}".format(pkg_name, path, e))
+        return None
+    manifest = index.get('manifest') if isinstance(index, dict) else None
+    if not manifest or manifest.get('version') != YACOPKG_INDEX_VERSION or \
+            manifest.get('pattern') != pattern or \
+            manifest.get('txt_pattern') != txt_pattern:
+        lg.debug("index of {0} {1} does not match".format(pkg_name, path))
+        return None
+    dirname = _pkg_path(pkg_name, path)
+    if dirname is not None and os.path.isdir(dirname) and \
+            _pkg_index_files(dirname, pattern, txt_pattern) != \
+            manifest.get('files'):
+        # a zipped package cannot change - one on the filesystem can
+        lg.debug("index of {0} {1} is stale".format(pkg_name, path))
+        return None
+    return index.get('data')
+
+
+def _umask():
+    """
+    Return the umask of this process - without changing it, which
+    would affect files created by other threads at the same time.
+    None if it cannot be read (it is only exposed by Linux)
+    """
+    try:
+        with open('/proc/self/status') as F:
+            for line in F:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+@contextlib.contextmanager
+def _atomic_open(to_file, mode='w'):
+    """
+    Open a temporary file next to to_file for writing - which is
+    renamed into place when done, or removed on errors. The file gets
+    the permissions of the file it replaces. A new file gets the
+    default permissions if the umask can be read, and is only
+    accessible to its owner otherwise.
 
-        cachefile = os.path.join(dirname, YACODIR_CACHEFILE)
+    If to_file is a symlink, the file it points to is replaced.
+    """
+    to_file = os.path.realpath(to_file)
+    dirname = os.path.dirname(to_file)
+    try:
+        perms = os.stat(to_file).st_mode & 0o7777
+    except OSError:
+        umask = _umask()
+        perms = None if umask is None else 0o666 & ~umask
+    fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.yaco_tmp_')
+    try:
+        with os.fdopen(fd, mode) as F:
+            yield F
+        if perms is not None:
+            os.chmod(tmpname, perms)
+        _replace(tmpname, to_file)
+    except:
+        os.unlink(tmpname)
+        raise
+
+
+def _atomic_write(to_file, data):
+    """
+    Write data to a temporary file next to to_file and rename it
+    into place
+    """
+    with _atomic_open(to_file, 'wb' if isinstance(data, bytes) else 'w') as F:
+        F.write(data)
 
-        # TODO: get caching to work properly :(
-        # if os.path.exists(cachefile):
-        #     if os.path.getmtime(dirname) == \
-        #             os.path.getmtime(cachefile):
-        # load cache
-        #         super(YacoDir, self).load(cachefile)
-        #         return
-
-        for root, dirs, files in os.walk(dirname):
-            #print('-' * 80)
-            ##import sh
-            #print(sh.ls("-l", dirname))
-            #print(root, dirs, files, pattern)
-            to_parse = sorted(fnmatch.filter(files, pattern))
-            base = root.replace(dirname, '').strip('/')
-            base = base.replace('/', '.')
-            #lg.critical("{0} {1}".format(root, dirs))
-            for filename in to_parse:
-                fullname = os.path.join(root, filename)
-                lg.debug("YacoDir loading {0}".format(fullname))
-                #print ("loadlaod", filename, fullname)
-                nleaf = _get_leaf(base, filename, pattern)
 
-                with open(fullname) as F:
-                    y = yaml.load(F.read())
+def _emit_yaml(tree, stream, skip=()):
+    """
+    Write a Yaco as (block style) yaml to stream - as dump does, but
+    the yaml events are emitted while walking the tree: there is no
+    exported copy (see get_data), nor a yaml string in memory. The
+    top level keys in skip are left out.
+    """
+    dumper = _yaml_dumper()(stream, default_flow_style=False)
+    try:
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(explicit=False))
+        for event in _yaml_events(dumper, tree, skip):
+            dumper.emit(event)
+        dumper.emit(yaml.DocumentEndEvent(explicit=False))
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+
+def _yaml_events(dumper, tree, skip=()):
+    """
+    Generate the yaml events for a tree - iteratively. Branches are
+    exported as get_data does, keys are sorted as yaml.dump does.
+    """
+    map_tag = dumper.DEFAULT_MAPPING_TAG
+    seq_tag = dumper.DEFAULT_SEQUENCE_TAG
+    stack = [iter((tree,))]
+    ends = []
+    while stack:
+        for value in stack[-1]:
+            if isinstance(value, (Yaco, CompactYaco)):
+                items = _public_items(value, skip if value is tree else ())
+            elif isinstance(value, dict):
+                items = list(value.items())
+            elif isinstance(value, (list, tuple, array.array)):
+                yield yaml.SequenceStartEvent(
+                    None, seq_tag, True, flow_style=False)
+                stack.append(iter(value))
+                ends.append(yaml.SequenceEndEvent)
+                break
+            else:
+                for event in _node_events(
+                        dumper, dumper.represent_data(value)):
+                    yield event
+                continue
+            try:
+                items.sort(key=_first)
+            except TypeError:
+                pass
+            yield yaml.MappingStartEvent(
+                None, map_tag, True, flow_style=False)
+            stack.append(itertools.chain.from_iterable(items))
+            ends.append(yaml.MappingEndEvent)
+            break
+        else:
+            stack.pop()
+            if ends:
+                yield ends.pop()()
 
-                if nleaf == '':
-                    self.update(y)
-                else:
-                    self[nleaf].update(y)
-        #print('*' * 80)
-        # print self.pretty()
-        if self:
-            # after loading - save to cache!
-            super(YacoDir, self).save(cachefile)
 
-    def save(self):
-        """
-        Save is disabled.
-        """
-        raise Exception("Cannot save to a YacoDir")
+def _node_events(dumper, node):
+    """
+    Generate the yaml events for a represented value (without anchors)
+    """
+    if isinstance(node, yaml.ScalarNode):
+        detected = dumper.resolve(yaml.ScalarNode, node.value, (True, False))
+        default = dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+        yield yaml.ScalarEvent(
+            None, node.tag, (node.tag == detected, node.tag == default),
+            node.value, style=node.style)
+    elif isinstance(node, yaml.SequenceNode):
+        implicit = node.tag == dumper.resolve(
+            yaml.SequenceNode, node.value, True)
+        yield yaml.SequenceStartEvent(
+            None, node.tag, implicit, flow_style=node.flow_style)
+        for item in node.value:
+            for event in _node_events(dumper, item):
+                yield event
+        yield yaml.SequenceEndEvent()
+    else:
+        implicit = node.tag == dumper.resolve(
+            yaml.MappingNode, node.value, True)
+        yield yaml.MappingStartEvent(
+            None, node.tag, implicit, flow_style=node.flow_style)
+        for key, value in node.value:
+            for event in _node_events(dumper, key):
+                yield event
+            for event in _node_events(dumper, value):
+                yield event
+        yield yaml.MappingEndEvent()
 
 
 #    db    db  .d8b.   .o88b.  .d88b.  d8888b. db   dD  d888b
@@ -646,53 +3650,124 @@ class YacoDir(Yaco):
 
 class YacoPkg(Yaco):
 
+    """
+    As Yaco, but load the files from a python package (or a single
+    file in a package).
+
+    If a cache filename is given, the loaded data is stored there as a
+    binary snapshot, together with a manifest of the files in the
+    package. Next time, if the package files are unchanged, the
+    snapshot is loaded instead.
+
+    If the package directory has a prebuilt index (see
+    build_pkg_index, or `python -m Yaco build-index`) that is up to
+    date, it is loaded in one read instead of walking the directory
+    - unless index is False.
+    """
+
     def __init__(self, pkg_name, path,
                  pattern='*.config',
                  txt_pattern='*.txt',
                  leaf="",
                  base_path=None,
-                 prefix=None):
-
-        # lg.setLevel(logging.DEBUG)
-        thisleaf = None
-        if False:
-            lg.warning("pkg loading name: {0}".format(pkg_name))
-            lg.warning("            path: {0} {1}".format(path, pattern))
-            lg.warning("       base_path: {0}".format(base_path))
-
-            lg.warning("           isdir: {0}".format(
-                pkg_resources.resource_isdir(pkg_name, path)))
-            lg.warning("            leaf: {0}".format(leaf))
+                 prefix=None,
+                 cache=None,
+                 index=True):
 
         if leaf:
             leaf = leaf.strip('.')
 
-        # if base_path is None:
-        # leave leaf as iss
-        #     pass
-        # else:
-        #     leaf =  leaf + path.replace(base_path, '')\
-        #                     .strip('/')\
-        #                     .replace('/', '.')
+        manifest = None
+        if cache:
+            cache = os.path.expanduser(cache)
+            manifest = {'version': YACODIR_CACHE_VERSION,
+                        'pkg': pkg_name,
+                        'path': path,
+                        'pattern': pattern,
+                        'txt_pattern': txt_pattern,
+                        'leaf': leaf,
+                        'files': _pkg_signature(pkg_name, path,
+                                                pattern, txt_pattern)}
+            if manifest['files'] is None:
+                # cannot tell if the cache is stale - do not use it
+                manifest = None
+            else:
+                start = _timer()
+                data = _read_cache(cache, manifest)
+                if data is not None:
+                    lg.debug("YacoPkg loading from cache {0}".format(cache))
+                    self._merge_cached(cache, data, '', start)
+                    return
+
+        data = None
+        if index and base_path is None:
+            start = _timer()
+            data = _read_pkg_index(pkg_name, path, pattern, txt_pattern)
+        if data is not None:
+            lg.debug("YacoPkg loading from index {0} {1}".format(
+                pkg_name, path))
+            self._merge_cached(path.rstrip('/') + '/' + YACOPKG_INDEX,
+                               data, leaf, start)
+        else:
+            self.load(pkg_name, path, pattern, txt_pattern, leaf, base_path)
 
+        if manifest is not None and self:
+            _write_cache(cache, manifest, _raw_data(self))
+
+    def _merge_cached(self, source, data, leaf, start):
+        """
+        Merge data loaded from a cache or index (the read started at
+        start)
+        """
+        if not _profiling:
+            self[leaf].update(data)
+            return
+        event = _load_event('YacoPkg', source, cached=True)
+        event['read'] = _timer() - start
+        start = _timer()
+        self[leaf].update(data)
+        event['merge'] = _timer() - start
+        _emit_load(event, data)
+
+    def _load_resource(self, pkg_name, path, leaf):
+        """
+        Read, parse & merge a yaml resource into leaf
+        """
+        if not _profiling:
+            self[leaf].update(_yaml_load(_resource_string(pkg_name, path)))
+            return
+        event = _load_event('YacoPkg', path)
+        start = _timer()
+        raw = _resource_string(pkg_name, path)
+        read = _timer()
+        data = _yaml_load(raw)
+        parse = _timer()
+        self[leaf].update(data)
+        event['read'] = read - start
+        event['parse'] = parse - read
+        event['merge'] = _timer() - parse
+        event['bytes'] = len(raw)
+        _emit_load(event, data)
+
+    def load(self, pkg_name, path, pattern, txt_pattern, leaf, base_path):
+        """
+        Load the package resources
+        """
         lg.debug("leaf: ({0}) {1}".format(base_path, leaf))
 
-        if not pkg_resources.resource_isdir(pkg_name, path):
+        if not _resource_isdir(pkg_name, path):
             # this must be a file:
             lg.debug("loading file {0} {1}".format(pkg_name, path))
-            #print("loading file {} {}".format(pkg_name, path))
-            y = pkg_resources.resource_string(pkg_name, path)
-
-            self[leaf].update(yaml.load(y))
+            self._load_resource(pkg_name, path, leaf)
 
         else:
             lg.debug("loading from package {0} {1}".format(pkg_name, path))
 
-            for d in pkg_resources.resource_listdir(pkg_name, path):
+            for d in _resource_listdir(pkg_name, path):
                 nres = os.path.join(path, d)
 
                 lg.debug("checking for pkg load: {0}".format(nres))
-                if pkg_resources.resource_isdir(pkg_name, nres):
+                if _resource_isdir(pkg_name, nres):
                     if leaf:
                         newleaf = leaf + '.' + d.replace('/', '.')
                     else:
@@ -702,34 +3777,24 @@ class YacoPkg(Yaco):
 
                     if base_path is None:
                         base_path = path
-                    if False:
-                        lg.warning("loading subpackage")
-                        lg.warning("       leaf: %s", leaf)
-                        lg.warning("   new_leaf: %s", newleaf)
-                        lg.warning("    pkgname: %s", pkg_name)
-                        lg.warning("    newpath: %s", nres)
-                        lg.warning("   basepath: %s", base_path)
 
                     y = YacoPkgDir(pkg_name, nres,
                                    pattern=pattern,
                                    base_path=base_path,
-                                   leaf=newleaf)
+                                   leaf=newleaf,
+                                   index=False)
                     self.update(y)
                 else:
                     if fnmatch.fnmatch(d, pattern):
                         this_leaf = _get_leaf(leaf, d, pattern)
                         lg.debug("pkg load: loading file: {0}".format(nres))
-                        y = yaml.load(
-                            pkg_resources.resource_string(pkg_name, nres))
-                        lg.debug("pkg load: got: {0}".format(str(y)))
-                        #print('f', leaf, nres, this_leaf, str(y)[:50])
-                        self[this_leaf].update(y)
+                        self._load_resource(pkg_name, nres, this_leaf)
                     elif fnmatch.fnmatch(d, txt_pattern):
                         dl = d.replace('.txt', '')
                         this_leaf = _get_leaf(leaf, dl, pattern)
                         lg.debug("loading: %s", d)
                         lg.debug("   into: %s", this_leaf)
-                        val = pkg_resources.resource_string(
+                        val = _resource_string(
                             pkg_name, nres)
                         self[this_leaf] = val
 
@@ -772,69 +3837,138 @@ class PolyYaco(Yaco):
     (manually for the time being).
     """
 
+    _sources = None
+    _manifest = None
+
     def __init__(self, name="PY", files=[],
                  pattern='*.config',
-                 leaf=""):
+                 leaf="",
+                 cache=None,
+                 workers=None,
+                 executor='thread'):
         """
+        If a cache filename is given, the merged result is stored as
+        a binary snapshot, and reused as long as none of the sources
+        changed.
 
+        With workers > 1, the sources are loaded in parallel (see
+        PolyYaco.load)
         """
 
-        # if not items - set a default
-        if files is None:
-            files = [
-                '/etc/{0}.config'.format(name),
-                '~/.config/{0}/'.format(name)]
-
+        files = _poly_files(name, files)
         super(PolyYaco, self).__init__()
-        self.load(leaf, files, pattern)
+        self.__dict__['_sources'] = dict(
+            name=name, files=files, pattern=pattern, leaf=leaf,
+            cache=cache, workers=workers, executor=executor)
+        self.__dict__['_manifest'] = _poly_manifest(files, pattern, leaf)
+
+        manifest = None
+        if cache:
+            cache = os.path.expanduser(cache)
+            manifest = self._manifest
+            if manifest is not None:
+                data = _read_cache(cache, manifest)
+                if data is not None:
+                    lg.debug("PolyYaco loading from cache {0}".format(cache))
+                    self.update(data)
+                    return
+
+        self.load(leaf, files, pattern, workers, executor)
+
+        if manifest is not None and self:
+            _write_cache(cache, manifest, _raw_data(self))
+
+    def load(self, leaf, files, pattern, workers=None, executor='thread'):
+        """
+        Load all files (or directories, or pkg:// urls) on top of
+        each other.
 
-    def load(self, leaf, files, pattern):
+        With workers > 1, the sources are loaded in a thread (or,
+        with executor='process', a process) pool. They are still
+        merged one by one, in order - so the result is the same.
         """
+        if executor == 'process':
+            # Yaco objects do not travel well between processes
+            func = functools.partial(_load_source_data, pattern=pattern)
+        else:
+            func = functools.partial(_load_source, pattern=pattern)
 
+        sources = [os.path.expanduser(f) for f in files]
+        loaded = _map_parallel(func, sources, workers, executor)
+        for source, y in zip(sources, loaded):
+            if y is not None:
+                self._merge_source(leaf, source, y)
+
+    def _merge_source(self, leaf, source, y):
         """
-        for filename in files:
+        Merge a loaded source (a Yaco, or its data) into leaf
+        """
+        if not _profiling:
+            self[leaf].update(y)
+            return
+        # the source itself (& its keys) is reported by the loader
+        # that read it
+        event = _load_event('PolyYaco', source)
+        start = _timer()
+        self[leaf].update(y)
+        event['merge'] = _timer() - start
+        _emit_load(event)
+
+    def _reloaded(self):
+        """
+        If any of the sources changed, return a function that returns
+        the reloaded tree (a fresh copy) & the changed keys - None
+        otherwise
+        """
+        sources = self._sources
+        manifest = _poly_manifest(sources['files'], sources['pattern'],
+                                  sources['leaf'])
+        if manifest is not None and manifest == self._manifest:
+            return None
+        new = PolyYaco(**sources)
+        changed = _diff_keys(_raw_data(self), _raw_data(new), '')
+        if manifest is None and not changed:
+            return None
+        return (lambda: new), changed
+
+    def _source_signature(self):
+        sources = self._sources
+        return _poly_manifest(sources['files'], sources['pattern'],
+                              sources['leaf'])
+
+    def _watch_paths(self):
+        rv = []
+        for filename in self._sources['files']:
             filename = os.path.expanduser(filename)
-            lg.debug("Loading {0}".format(filename))
-            y = None
             if filename[:6] == 'pkg://':
-                # expecting pkg://Yaco/etc/config.yaml
-                base = filename[6:]
-                pkg, loc = base.split('/', 1)
-                this_pattern = pattern
-                if '*' in loc:
-                    if '/' in loc:
-                        loc, this_pattern = loc.rsplit('/', 1)
-                    else:
-                        loc, this_pattern = '/', loc
-
-                try:
-                    y = YacoPkg(pkg, loc, pattern=this_pattern)
-                except IOError:
-                    # file does probably not exists - ignore
-                    lg.debug("cannot load file {0}".format(loc))
-                    pass
-                except ImportError:
-                    # or the complete package does not exists - one of script?
-                    # ignore
-                    lg.debug("cannot find package {0}".format(pkg))
+                pkg, loc, this_pattern = _parse_pkg_url(
+                    filename, self._sources['pattern'])
+                filename = _pkg_path(pkg, loc)
+                if filename is None:
+                    continue
+            rv.extend(_watch_dirs(filename))
+        return rv
 
-                    pass
+    @classmethod
+    def aload(cls, name="PY", files=[], pattern='*.config', leaf="",
+              cache=None, executor=None):
+        """
+        Create a PolyYaco from asyncio (python 3.7+):
+        `y = await PolyYaco.aload(files=[...])`
 
-            elif os.path.isdir(filename):
-                y = YacoDir(filename, pattern=pattern)
-                #print('load dir')
-            elif os.path.isfile(filename):
-                y = Yaco()
-                y.load(filename)
-            else:
-                # nothing to load
-                continue
+        As the constructor - but all sources are loaded at the same
+        time in executor (by default, the default executor of the
+        running loop) & merged on the event loop, one by one, in
+        order. The cache is read & written in the default executor.
+        """
+        from Yaco import _aio
+        return _aio.load_poly(cls, name, files, pattern, leaf, cache,
+                              executor)
 
-            if not y is None:
-                #print("update", filename, leaf)
-                # print(y.plugin.plugin)
-                self[leaf].update(y)
-        # print(self.pretty())
+    def asave(self, *args, **kwargs):
+        lg.warning("PolyYaco save is disabled")
+        from Yaco import _aio
+        return _aio.nothing()
 
     def save(self):
         lg.warning("PolyYaco save is disabled")
@@ -844,15 +3978,771 @@ class PolyYaco(Yaco):
         # cyc.save(cfn)
 
 
-class PolyDynYaco():
+def _poly_files(name, files):
+    """
+    Return the PolyYaco sources - the defaults for name if files is None
+    """
+    # if not items - set a default
+    if files is None:
+        files = [
+            '/etc/{0}.config'.format(name),
+            '~/.config/{0}/'.format(name)]
+    return files
+
+
+def _load_source(filename, pattern):
+    """
+    Load one PolyYaco source - returns None if there is nothing to
+    load
+    """
+    lg.debug("Loading {0}".format(filename))
+    if filename[:6] == 'pkg://':
+        pkg, loc, this_pattern = _parse_pkg_url(filename, pattern)
+        try:
+            return YacoPkg(pkg, loc, pattern=this_pattern)
+        except IOError:
+            # file does probably not exists - ignore
+            lg.debug("cannot load file {0}".format(loc))
+        except ImportError:
+            # or the complete package does not exists - one of script?
+            # ignore
+            lg.debug("cannot find package {0}".format(pkg))
+    elif os.path.isdir(filename):
+        return YacoDir(filename, pattern=pattern)
+    elif os.path.isfile(filename):
+        y = Yaco()
+        y.load(filename)
+        return y
+    # nothing to load
+    return None
+
+
+def _load_source_data(filename, pattern):
+    """
+    As _load_source, but return plain data
+    """
+    y = _load_source(filename, pattern)
+    return None if y is None else _raw_data(y)
+
+
+def _parse_pkg_url(url, pattern):
+    """
+    Split a pkg:// url into package, location & pattern
+
+    >>> _parse_pkg_url('pkg://Yaco/etc/config.yaml', '*.config')
+    ('Yaco', 'etc/config.yaml', '*.config')
+    >>> _parse_pkg_url('pkg://Yaco/etc/*.yaml', '*.config')
+    ('Yaco', 'etc', '*.yaml')
+    """
+    # expecting pkg://Yaco/etc/config.yaml
+    base = url[6:]
+    pkg, loc = base.split('/', 1)
+    this_pattern = pattern
+    if '*' in loc:
+        if '/' in loc:
+            loc, this_pattern = loc.rsplit('/', 1)
+        else:
+            loc, this_pattern = '/', loc
+    return pkg, loc, this_pattern
+
+
+def _poly_manifest(files, pattern, leaf):
+    """
+    Build a cache manifest for the sources of a PolyYaco - None if
+    the state of one of the sources cannot be determined
+    """
+    sources = []
+    for filename in files:
+        filename = os.path.expanduser(filename)
+        if filename[:6] == 'pkg://':
+            pkg, loc, this_pattern = _parse_pkg_url(filename, pattern)
+            sig = _pkg_signature(pkg, loc, this_pattern, '*.txt')
+            if sig is None:
+                return None
+        elif os.path.isdir(filename):
+            sig = _dir_manifest(pattern, _scan_dir(filename, pattern))['files']
+        elif os.path.isfile(filename):
+            sig = list(_stat_signature(os.stat(filename)))
+        else:
+            sig = 'missing'
+        sources.append([filename, sig])
+    return {'version': YACODIR_CACHE_VERSION,
+            'pattern': pattern,
+            'leaf': leaf,
+            'sources': sources}
+
+
+#    db   d8b   db  .d8b.  d888888b  .o88b. db   db
+#    88   I8I   88 d8' `8b `~~88~~' d8P  Y8 88   88
+#    88   I8I   88 88ooo88    88    8P      88ooo88
+#    Y8   I8I   88 88~~~88    88    8b      88~~~88
+#    `8b d8'8b d8' 88   88    88    Y8b  d8 88   88
+#     `8b8' `8d8'  YP   YP    YP     `Y88P' YP   YP
+
+
+def _path_signature(path):
+    """
+    Return the (size, mtime_ns) signature of a file - None if it does
+    not exist
+    """
+    try:
+        return _stat_signature(os.stat(path))
+    except OSError:
+        return None
+
+
+def _watch_dirs(path):
+    """
+    Return the directories to watch for changes of path: all
+    directories under path if it is a directory, otherwise the
+    directory containing it (files are often replaced, not changed)
+    """
+    if os.path.isdir(path):
+        rv = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            rv.append(root)
+        return rv
+    parent = os.path.dirname(os.path.abspath(path))
+    return [parent] if os.path.isdir(parent) else []
+
+
+class _Inotify(object):
+
+    """
+    Minimal (ctypes) inotify interface - raises OSError if inotify
+    is not available
+    """
+
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+    # IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800
+    # the watch was removed (e.g. the directory was deleted)
+    IN_IGNORED = 0x8000
+
+    # wd, mask, cookie & length of the name that follows
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK |
+                                      getattr(os, 'O_CLOEXEC', 0))
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # path -> watch descriptor & back
+        self._watched = {}
+        self._paths = {}
+
+    def watch(self, paths):
+        """
+        Watch paths - those that are watched already are skipped
+        """
+        for path in paths:
+            if path in self._watched:
+                continue
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(path) if hasattr(os, 'fsencode')
+                else path, self.MASK)
+            if wd >= 0:
+                self._watched[path] = wd
+                self._paths[wd] = path
+
+    def wait(self, timeout):
+        """
+        Wait for events - returns True if there were any
+        """
+        import select
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # coalesce bursts of events (e.g. an editor saving a file)
+        time.sleep(0.05)
+        raw = b''
+        try:
+            while True:
+                chunk = os.read(self._fd, 65536)
+                if not chunk:
+                    break
+                raw += chunk
+        except OSError:
+            pass
+        self._forget(raw)
+        return True
+
+    def _forget(self, raw):
+        """
+        Forget the watches that were removed (so they are added
+        again if the path is recreated) - other watches are kept, so
+        no events are lost between waits
+        """
+        size = self._EVENT.size
+        offset = 0
+        while offset + size <= len(raw):
+            wd, mask, cookie, length = self._EVENT.unpack_from(raw, offset)
+            offset += size + length
+            if mask & self.IN_IGNORED:
+                path = self._paths.pop(wd, None)
+                if path is not None and self._watched.get(path) == wd:
+                    del self._watched[path]
+
+    def close(self):
+        os.close(self._fd)
+
+
+class YacoWatcher(object):
+
+    """
+    Keep a YacoFile, YacoDir or PolyYaco up to date with its sources
+    in a background thread.
+
+    The watcher never changes the tree it is reading from. When a
+    source changes, a new tree is built on the side and swapped in as
+    a whole, so readers of `watcher.config` always see a complete &
+    consistent tree. Keep a reference to `watcher.config` for as long
+    as a consistent view is needed (e.g. a request).
+
+    For a YacoDir, only the top level keys the changed files
+    contribute to are rebuilt (see YacoDir.refresh): the new tree
+    shares all other branches with the old one - so trees handed out
+    by a watcher should be treated as read-only.
+
+    Callbacks are registered on a dotted key prefix and called with
+    the new tree and the list of changed keys under that prefix::
+
+        def db_changed(config, keys):
+            reconnect(config.db)
+
+        watcher = YacoWatcher(YacoDir('/etc/app'))
+        watcher.on_change('db', db_changed)
+        watcher.start()
+        host = watcher.config.db.host
+
+    Changes are detected with inotify on linux, and by polling
+    (stat'ing all files) every `interval` seconds otherwise.
+
+    A file can be caught while it is being written. A reload is only
+    swapped in if the (size, mtime) signature of all files is the same
+    before parsing and `settle` seconds after - otherwise the files are
+    parsed again (up to `retries` times; after that the next change
+    event or poll tries again). Callbacks never see a partly written
+    file.
+    """
+
+    retries = 10
+
+    def __init__(self, source, interval=1.0, use_inotify=None,
+                 settle=0.05):
+        """
+        :param source: the tree to keep up to date
+        :type source: YacoFile, YacoDir or PolyYaco
+        :param interval: seconds between checks when polling
+        :type interval: float
+        :param use_inotify: None: use inotify if available, False:
+            always poll
+        :param settle: seconds the files must stay unchanged after
+            parsing for a reload to be used
+        :type settle: float
+        """
+        if getattr(type(source), '_reloaded', None) is None:
+            raise Exception("cannot watch a {0}".format(type(source)))
+        self.config = source
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.settle = settle
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def on_change(self, prefix, callback):
+        """
+        Call callback(config, changed_keys) when a key under prefix
+        (a dotted key, '' for all) changes
+        """
+        self._callbacks.append((prefix, callback))
+
+    def check(self):
+        """
+        Check for changes, swap in the new tree & call the callbacks.
+        Returns the list of changed keys.
+        """
+        with self._lock:
+            rv = self._reload()
+            if rv is None:
+                return []
+            new, changed = rv
+            # a single reference assignment - atomic for readers
+            self.config = new
+
+        for prefix, callback in list(self._callbacks):
+            keys = [k for k in changed if _key_matches(k, prefix)]
+            if not keys:
+                continue
+            try:
+                callback(new, keys)
+            except Exception:
+                lg.exception("YacoWatcher callback failed")
+        return changed
+
+    def _reload(self):
+        """
+        Return the reloaded tree & the changed keys (see _reloaded) -
+        once the signature of the files is stable across the parse
+        """
+        for _ in range(self.retries):
+            before = self.config._source_signature()
+            rv = self.config._reloaded()
+            if rv is None:
+                return None
+            time.sleep(self.settle)
+            if self.config._source_signature() == before:
+                apply, changed = rv
+                return apply(), changed
+            lg.debug("YacoWatcher: files changed while reloading")
+        return None
+
+    def start(self):
+        """
+        Start watching in a background (daemon) thread
+        """
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='YacoWatcher')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop watching
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _run(self):
+        inotify = None
+        if self.use_inotify is not False:
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                lg.debug("inotify not available, polling: {0}".format(e))
+        try:
+            if inotify is not None:
+                inotify.watch(self.config._watch_paths())
+            while not self._stop.is_set():
+                if inotify is not None:
+                    inotify.wait(self.interval)
+                else:
+                    self._stop.wait(self.interval)
+                if self._stop.is_set():
+                    break
+                try:
+                    if inotify is not None:
+                        # watch new directories before checking: what
+                        # changes in them from here on is an event
+                        inotify.watch(self.config._watch_paths())
+                    self.check()
+                except Exception:
+                    lg.exception("YacoWatcher failed to reload")
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+
+def _key_matches(key, prefix):
+    """
+    Check if a changed (dotted) key is relevant for a prefix
+
+    >>> _key_matches('db.host', 'db')
+    True
+    >>> _key_matches('db', 'db.host')
+    True
+    >>> _key_matches('dbx', 'db')
+    False
+    """
+    if not prefix or key == prefix:
+        return True
+    return key.startswith(prefix + '.') or prefix.startswith(key + '.')
+
+
+class _PolyDynView(object):
+
+    """
+    A read through view on (a branch of) the layers of a PolyDynYaco
+    """
+
+    __slots__ = ('_root', '_path', '_nodes', '_seen')
+
+    def __init__(self, root, path, nodes):
+        object.__setattr__(self, '_root', root)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_nodes', nodes)
+        object.__setattr__(self, '_seen', root._counter)
+
+    def _get_nodes(self):
+        """
+        Return the dicts (top layer first) that make up this branch
+        """
+        root = self._root
+        if self._seen != root._counter:
+            nodes = [layer for name, layer in reversed(root._stack)]
+            for key in self._path:
+                nodes = _dyn_resolve(nodes, key)
+                if not isinstance(nodes, list):
+                    nodes = []
+                    break
+            object.__setattr__(self, '_nodes', nodes)
+            object.__setattr__(self, '_seen', root._counter)
+        return self._nodes
+
+    def _get(self, key):
+        value = _dyn_resolve(self._get_nodes(), key)
+        if value is _NOTHING:
+            # no autovivification - just an empty view
+            return _PolyDynView(self._root, self._path + (key,), [])
+        elif isinstance(value, list):
+            return _PolyDynView(self._root, self._path + (key,), value)
+        return value[0]
+
+    def __getattr__(self, key):
+        if key[:2] == '__':
+            raise AttributeError(key)
+        return self._get(key)
+
+    def __getitem__(self, key):
+        if key == '':
+            return self
+        if not isinstance(key, str) or not '.' in key:
+            return self._get(key)
+        rv = self
+        for k in key.split('.'):
+            rv = rv[k]
+        return rv
+
+    def _resolve(self, key):
+        """
+        Look up a (dotted) key without creating anything - returns a
+        view, the value, or _NOTHING if it is missing (also if one of
+        its parents is not a branch)
+        """
+        if key == '':
+            return self
+        parts = _split_path(key) if isinstance(key, str) else (key,)
+        nodes = self._get_nodes()
+        for i, k in enumerate(parts):
+            value = _dyn_resolve(nodes, k)
+            if value is _NOTHING:
+                return _NOTHING
+            elif not isinstance(value, list):
+                return value[0] if i == len(parts) - 1 else _NOTHING
+            nodes = value
+        return _PolyDynView(self._root, self._path + tuple(parts), nodes)
+
+    def get(self, key, default=None):
+        value = self._resolve(key)
+        if value is _NOTHING:
+            return default
+        return value
+
+    def get_path(self, key, default=_NOTHING):
+        """
+        As Yaco.get_path
+        """
+        if isinstance(key, YacoPath):
+            key = key.key
+        value = self.get(key, _NOTHING)
+        if value is _NOTHING:
+            if default is _NOTHING:
+                raise KeyError(key)
+            return default
+        return value
+
+    def _top(self):
+        """
+        Return the branch of the top layer - created if need be
+        """
+        node = self._root._top_layer()
+        for key in self._path:
+            node = node.__getattr__(key)
+        return node
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __setitem__(self, key, value):
+        if isinstance(value, _PolyDynView):
+            value = value.merged()
+        self._top()[key] = value
+        self._root._changed()
+
+    def __delattr__(self, key):
+        """
+        Delete a key from the top layer - lower layers remain visible
+        """
+        top = self._top()
+        if key in top:
+            del top[key]
+        self._root._changed()
+
+    __delitem__ = __delattr__
+
+    def __contains__(self, key):
+        return self._resolve(key) is not _NOTHING
+
+    has_key = __contains__
+
+    def keys(self):
+        """
+        All keys, in order of appearance - bottom layer first
+        """
+        rv = []
+        seen = set()
+        for node in reversed(self._get_nodes()):
+            for key in node.keys():
+                if key not in seen:
+                    seen.add(key)
+                    rv.append(key)
+        return rv
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __bool__(self):
+        for node in self._get_nodes():
+            if node:
+                return True
+        return False
+
+    __nonzero__ = __bool__
+
+    def items(self):
+        return [(k, self._get(k)) for k in self.keys()]
+
+    def values(self):
+        return [self._get(k) for k in self.keys()]
+
+    def merged(self):
+        """
+        Return the merged branch as a (new) Yaco object
+        """
+        rv = Yaco()
+        for node in reversed(self._get_nodes()):
+            rv.update(node)
+        return rv
+
+    def get_data(self):
+        return self.merged().get_data()
+
+    def simple(self):
+        return self.merged().simple()
+
+    def dump(self):
+        return self.merged().dump()
+
+    def pretty(self):
+        return self.merged().pretty()
+
+    def __eq__(self, other):
+        if isinstance(other, _PolyDynView):
+            other = other.merged()
+        return self.merged() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(self.get_data())
+
+    def __repr__(self):
+        return repr(self.merged())
+
+
+def _dyn_resolve(nodes, key):
+    """
+    Look up a key in a list of dicts (top layer first), as if the
+    layers were merged with update: the first non-dict value wins,
+    dicts are merged - until a non-dict value in a lower layer (which
+    was replaced by the dict). Returns the list of dicts to merge for
+    a branch, a one item tuple for any other value, or _NOTHING.
+    """
+    branches = []
+    for node in nodes:
+        try:
+            value = dict.__getitem__(node, key)
+        except KeyError:
+            continue
+        if isinstance(value, dict):
+            branches.append(value)
+        elif branches:
+            break
+        else:
+            return (value,)
+    return branches or _NOTHING
+
+
+class PolyDynYaco(_PolyDynView):
 
     """
     As PolyYaco, but dynamic - does not merge the files, but
     resolves one by one
+
+    Each source is kept as a separate layer. A lookup walks the
+    layers from the top down and returns the first value it finds;
+    branches present in more than one layer are returned as a view
+    that resolves the same way. The result is the same as PolyYaco,
+    but swapping or reloading a single layer only costs loading that
+    layer. Missing keys return an empty view and are not created.
+
+    Changes are only made to the top layer:
+
+    >>> base = Yaco({'a': {'b': 1, 'c': 2}, 'd': [1, 2]})
+    >>> user = Yaco({'a': {'c': 3}})
+    >>> p = PolyDynYaco(layers=[base, user])
+    >>> (p.a.b, p.a.c, p.d)
+    (1, 3, [1, 2])
+    >>> p.a.e = 4
+    >>> user.a.e
+    4
+    >>> p.set_layer(1, Yaco({'a': {'c': 5}}))
+    >>> (p.a.c, 'e' in p.a)
+    (5, False)
+    >>> assert(not p.x.y)
+    >>> assert('x' not in p)
+
+    Views on branches remember which branch of each layer they are
+    made of, until the PolyDynYaco changes. So layers must only be
+    changed through the PolyDynYaco (by writing to it, or with push,
+    set_layer & reload_layer). Values written straight into a branch
+    of a layer do show up, but branches added to, replaced in or
+    removed from a layer do not - until set_layer is called with
+    that layer:
+
+    >>> a = p.a
+    >>> user = p.layer(1)
+    >>> del user.a
+    >>> user.a = {'f': 6}
+    >>> 'f' in a
+    False
+    >>> p.set_layer(1, user)
+    >>> (a.f, a.b, a.c)
+    (6, 1, 2)
     """
 
-    def __init__(self):
-        self._stack = []
+    __slots__ = ('_stack', '_sources', '_counter')
+
+    def __init__(self, name="PY", files=[],
+                 pattern='*.config',
+                 leaf="",
+                 layers=None):
+        """
+        :param files: sources to load (as PolyYaco), one layer each
+        :param layers: Yaco objects to use as layers (bottom first),
+            on top of the layers loaded from files
+        """
+        object.__setattr__(self, '_stack', [])
+        object.__setattr__(self, '_sources', {})
+        object.__setattr__(self, '_counter', 0)
+        super(PolyDynYaco, self).__init__(self, (), [])
+
+        if files is None:
+            files = [
+                '/etc/{0}.config'.format(name),
+                '~/.config/{0}/'.format(name)]
+        for filename in files:
+            self.push(self._load_layer(filename, pattern, leaf),
+                      name=filename)
+            self._sources[filename] = (pattern, leaf)
+        for layer in layers or []:
+            self.push(layer)
+
+    def _changed(self):
+        object.__setattr__(self, '_counter', self._counter + 1)
+
+    def _load_layer(self, filename, pattern, leaf):
+        y = _load_source(os.path.expanduser(filename), pattern)
+        if y is None:
+            y = Yaco()
+        if leaf:
+            layer = Yaco()
+            layer[leaf].update(y)
+            return layer
+        return y
+
+    def _index(self, name):
+        if isinstance(name, int):
+            return name
+        for i, (layer_name, layer) in enumerate(self._stack):
+            if layer_name == name:
+                return i
+        raise KeyError(name)
+
+    def _top_layer(self):
+        if not self._stack:
+            self.push(Yaco())
+        return self._stack[-1][1]
+
+    def push(self, layer, name=None):
+        """
+        Add a layer on top
+        """
+        if not isinstance(layer, Yaco):
+            layer = Yaco(layer)
+        if name is None:
+            name = len(self._stack)
+        self._stack.append([name, layer])
+        self._changed()
+
+    def layers(self):
+        """
+        Return the (name, layer) pairs, bottom layer first
+        """
+        return [tuple(x) for x in self._stack]
+
+    def layer(self, name):
+        """
+        Return a layer by name or index
+        """
+        return self._stack[self._index(name)][1]
+
+    def set_layer(self, name, layer):
+        """
+        Replace a layer (by name or index) - or, with the same layer,
+        make changes made to the layer directly visible
+        """
+        if not isinstance(layer, Yaco):
+            layer = Yaco(layer)
+        self._stack[self._index(name)][1] = layer
+        self._changed()
+
+    def reload_layer(self, name):
+        """
+        Reload a layer that was loaded from a file, directory or
+        package
+        """
+        name = self._stack[self._index(name)][0]
+        pattern, leaf = self._sources[name]
+        self.set_layer(name, self._load_layer(name, pattern, leaf))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Yaco command line tools
+
+    python -m Yaco build-index PKG_NAME [PATH] [--pattern '*.config']
+        [--txt-pattern '*.txt'] [--output FILE]
+    python -m Yaco load-report SOURCE [SOURCE ...] [--pattern '*.config']
+
+build-index prebuilds the configuration of a package directory (by
+default etc/) for YacoPkg - see Yaco.build_pkg_index
+
+load-report loads the sources (files, directories or pkg:// urls) as
+a PolyYaco does & shows where the time went - see Yaco.load_report
+"""
+from __future__ import print_function
+
+import argparse
+import sys
+
+import Yaco
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m Yaco', description='Yaco command line tools')
+    commands = parser.add_subparsers(dest='command')
+    index = commands.add_parser(
+        'build-index', help='prebuild the YacoPkg index of a package')
+    index.add_argument('pkg_name')
+    index.add_argument('path', nargs='?', default='etc/')
+    index.add_argument('--pattern', default='*.config')
+    index.add_argument('--txt-pattern', default='*.txt')
+    index.add_argument('--output', help='index file to write (default: '
+                       '{0} in the package directory)'.format(
+                           Yaco.YACOPKG_INDEX))
+    report = commands.add_parser(
+        'load-report', help='show the load times of config sources')
+    report.add_argument('sources', nargs='+')
+    report.add_argument('--pattern', default='*.config')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build-index':
+        to_file = Yaco.build_pkg_index(
+            args.pkg_name, args.path, pattern=args.pattern,
+            txt_pattern=args.txt_pattern, to_file=args.output)
+        print("wrote {0}".format(to_file))
+    elif args.command == 'load-report':
+        # importing yaml is not part of loading the first source
+        Yaco._import_yaml()
+        Yaco.profile_loads()
+        Yaco.PolyYaco(files=args.sources, pattern=args.pattern)
+        Yaco.profile_loads(False)
+        print_report(Yaco.load_report())
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+def print_report(report):
+    """
+    Print a load report as a table - times in milliseconds
+    """
+    line = "{0:>9} {1:>9} {2:>9} {3:>9} {4:>10} {5:>8}  {6}"
+    print(line.format('stat', 'read', 'parse', 'merge', 'bytes', 'keys',
+                      'source'))
+    for event in report['sources'] + [report['total']]:
+        source = event.get('source', 'total')
+        if event.get('cached'):
+            source += ' (cached)'
+        print(line.format(
+            *["{0:.2f}".format(event[k] * 1000)
+              for k in ('stat', 'read', 'parse', 'merge')] +
+            [event['bytes'], event['keys'],
+             '{0}: {1}'.format(event['loader'], source)
+             if 'loader' in event else source]))
+    print("lookups: {autovivified} autovivified, {missed} missed".format(
+        **report['lookups']))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
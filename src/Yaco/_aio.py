@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+The asyncio loaders & save of Yaco (python 3.7+) - see Yaco.aload,
+YacoFile.aload, YacoDir.aload, PolyYaco.aload & Yaco.asave.
+
+All file access & parsing is done in an executor - every file of a
+YacoDir (or source of a PolyYaco) as a job of its own, so they are
+read at the same time. Parsed files are merged on the event loop, in
+the same order as the blocking loaders do: the result is the same.
+
+This module is only imported by these methods - importing Yaco does
+not import asyncio.
+"""
+import asyncio
+import concurrent.futures
+import os
+
+import Yaco
+
+
+def _run(executor, func, *args):
+    """
+    Run func(*args) in executor (None for the default executor of the
+    loop) - return a future
+    """
+    return asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def _cancel(futures):
+    """
+    Cancel the futures that did not finish (after one of them failed)
+    """
+    for future in futures:
+        if not future.cancel() and not future.cancelled():
+            # mark a failure as retrieved - so it is not logged
+            future.exception()
+
+
+def _parse(fullname):
+    """
+    Parse a file - return the data & a load event (None if not
+    profiling)
+    """
+    if Yaco._profiling:
+        return Yaco._parse_file_profiled(fullname)
+    return Yaco._parse_file(fullname), None
+
+
+def _scan(dirname, pattern, cachefile):
+    """
+    Scan a YacoDir - return its entries, manifest & the cached data
+    (None without a valid cache)
+    """
+    to_load = Yaco._scan_dir(dirname, pattern)
+    manifest = Yaco._dir_manifest(pattern, to_load)
+    data = None
+    if cachefile is not None:
+        data = Yaco._read_cache(cachefile, manifest)
+    return to_load, manifest, data
+
+
+def _write_cache(cachefile, manifest, y):
+    Yaco._write_cache(cachefile, manifest, Yaco._raw_data(y))
+
+
+async def load(y, from_file, leaf, executor):
+    from_file = os.path.expanduser(
+        os.path.abspath(os.path.expanduser(from_file)))
+    data, event = await _run(executor, _parse, from_file)
+    if event is not None:
+        event['loader'] = type(y).__name__
+        start = Yaco._timer()
+    if leaf is None or leaf == '':
+        y.update(data)
+    else:
+        y[leaf].update(data)
+    if event is not None:
+        event['merge'] = Yaco._timer() - start
+        Yaco._emit_load(event, data)
+
+
+async def load_file(cls, filename, executor):
+    y = dict.__new__(cls)
+    y._filename = filename
+    y.__dict__['_signature'] = await _run(
+        None, Yaco._path_signature, filename)
+    await load(y, filename, None, executor)
+    return y
+
+
+async def load_dir(cls, dirname, pattern, cache, executor):
+    cachefile = os.path.join(dirname, Yaco.YACODIR_CACHEFILE)
+    if Yaco._profiling:
+        event = Yaco._load_event('YacoDir', cachefile, cached=True)
+        start = Yaco._timer()
+    to_load, manifest, data = await _run(
+        None, _scan, dirname, pattern, cachefile if cache else None)
+    y = dict.__new__(cls)
+    y._set_entries(dirname, pattern, to_load, (None, 'thread'))
+
+    if data is not None:
+        Yaco.lg.debug("YacoDir loading from cache {0}".format(cachefile))
+        y.__dict__['_root_keys'] = None
+        if Yaco._profiling:
+            # stat & read of the cache are not told apart here
+            event['read'] = Yaco._timer() - start
+            start = Yaco._timer()
+        y.update(data)
+        if Yaco._profiling:
+            event['merge'] = Yaco._timer() - start
+            Yaco._emit_load(event, data)
+        return y
+
+    parsing = [_run(executor, _parse, entry[1]) for entry in to_load]
+    try:
+        for entry, future in zip(to_load, parsing):
+            data, event = await future
+            y._merge_file(entry, data, event)
+    except BaseException:
+        _cancel(parsing)
+        raise
+
+    if y and cache:
+        # nothing else has y yet - it can be read in another thread
+        await _run(None, _write_cache, cachefile, manifest, y)
+    return y
+
+
+async def load_poly(cls, name, files, pattern, leaf, cache, executor):
+    files = Yaco._poly_files(name, files)
+    y = dict.__new__(cls)
+    y.__dict__['_sources'] = dict(
+        name=name, files=files, pattern=pattern, leaf=leaf,
+        cache=cache, workers=None, executor='thread')
+    manifest = await _run(None, Yaco._poly_manifest, files, pattern, leaf)
+    y.__dict__['_manifest'] = manifest
+
+    if cache:
+        cache = os.path.expanduser(cache)
+        if manifest is not None:
+            data = await _run(None, Yaco._read_cache, cache, manifest)
+            if data is not None:
+                Yaco.lg.debug("PolyYaco loading from cache {0}".format(cache))
+                y.update(data)
+                return y
+    else:
+        manifest = None
+
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        # Yaco objects do not travel well between processes
+        func = Yaco._load_source_data
+    else:
+        func = Yaco._load_source
+    sources = [os.path.expanduser(f) for f in files]
+    loading = [_run(executor, func, source, pattern)
+               for source in sources]
+    try:
+        for source, future in zip(sources, loading):
+            loaded = await future
+            if loaded is not None:
+                y._merge_source(leaf, source, loaded)
+    except BaseException:
+        _cancel(loading)
+        raise
+
+    if manifest is not None and y:
+        await _run(None, _write_cache, cache, manifest, y)
+    return y
+
+
+def _save(data, to_file):
+    """
+    Write exported data (see Yaco.get_data) as yaml to to_file
+    """
+    with Yaco._atomic_open(os.path.expanduser(to_file)) as F:
+        Yaco._emit_yaml(data, F)
+
+
+async def save(data, to_file, executor):
+    await _run(executor, _save, data, to_file)
+
+
+async def nothing():
+    pass
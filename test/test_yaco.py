@@ -1,8 +1,14 @@
 
+import asyncio
+import datetime
 import os
 import logging
 import shutil
+import subprocess
+import sys
 import tempfile
+import threading
+import time
 import unittest
 import yaml
 
@@ -60,6 +66,24 @@ class BasicYacoTest(unittest.TestCase):
         y['a.c.e'] = 4
         assert(y.a.c.e == 4)
 
+    def test_paths(self):
+        y = d()
+        p = Yaco.Yaco.compile_path('c.e')
+        self.assertTrue(p is Yaco.Yaco.compile_path('c.e'))
+        self.assertEqual(p.get(y), 4)
+        self.assertEqual(y.get_path('c.e'), 4)
+        self.assertEqual(y.get_path(p), 4)
+        self.assertRaises(KeyError, y.get_path, 'x.y')
+        self.assertRaises(KeyError, y.get_path, 'a.y')
+        self.assertRaises(KeyError, Yaco.Yaco.compile_path('x').get, y)
+        self.assertFalse('x' in y)
+
+        y.set_path('x.y.z', {'q': 1})
+        self.assertEqual(y.x.y.z.q, 1)
+        self.assertTrue(isinstance(y.x.y.z, Yaco.Yaco))
+        p.set(y, 5)
+        self.assertEqual(y['c.e'], 5)
+
     def test_yaco_has_attribute_access(self):
         y = d()
         self.assertEqual(y.a, 1)
@@ -118,13 +142,341 @@ class BasicYacoTest(unittest.TestCase):
         self.assertEqual(y.b.c.e, 4)
 
 
+    def test_snapshot(self):
+        y = Yaco.Yaco(test_set_1)
+        y.when = datetime.date(2014, 1, 2)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(tmpdir, 'snap')
+            y.save_snapshot(fn)
+            z = Yaco.Yaco()
+            z.load_snapshot(fn, 'leaf')
+            self.assertEqual(z.leaf.g[4].i, 7)
+            self.assertEqual(z.leaf.when, datetime.date(2014, 1, 2))
+            self.assertEqual(z.leaf.get_data(), y.get_data())
+
+            with open(fn, 'rb') as F:
+                raw = F.read()
+            with open(fn, 'wb') as F:
+                F.write(raw[:-1] + b'x')
+            self.assertRaises(ValueError, z.load_snapshot, fn)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_mapped_snapshot(self):
+        y = Yaco.Yaco(test_set_1)
+        y.when = datetime.date(2014, 1, 2)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(tmpdir, 'snap')
+            y.save_snapshot(fn, index=True)
+            z = Yaco.Yaco()
+            z.load_snapshot(fn)
+            self.assertEqual(z.get_data(), y.get_data())
+
+            m = Yaco.MappedYaco(fn)
+            self.assertEqual(sorted(m), sorted(y.keys()))
+            self.assertEqual(m.when, datetime.date(2014, 1, 2))
+            self.assertEqual(m['g'][4].i, 7)
+            self.assertEqual(m.get_path('c.e'), 4)
+            self.assertTrue(m.c is m.get('c'))
+            self.assertEqual(m.get('x'), None)
+            self.assertFalse('c.x' in m)
+            self.assertRaises(KeyError, m.get_path, 'a.b')
+            # missing keys are MISSING, at every level - and are
+            # not created (the branches are read-only)
+            self.assertTrue(m.x is Yaco.MISSING)
+            self.assertTrue(m['c.x'] is Yaco.MISSING)
+            self.assertFalse('x' in m)
+            self.assertTrue(m.c.x.y is Yaco.MISSING)
+            self.assertFalse('x' in m.c)
+            self.assertRaises(TypeError, setattr, m.c, 'd', 1)
+            self.assertEqual(m.get_data(), y.get_data())
+            m.close()
+            self.assertEqual(m.c.d, 3)
+            self.assertRaises(ValueError, m.get, 'b')
+
+            y.save_snapshot(fn)
+            self.assertRaises(ValueError, Yaco.MappedYaco, fn)
+            open(fn, 'w').close()
+            self.assertRaises(ValueError, Yaco.MappedYaco, fn)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_compact(self):
+        data = yaml.safe_load(Yaco.Yaco(test_set_1).dump())
+        data['r'] = list(range(10))
+        data['s'] = [0.5] * 10
+        c = Yaco.CompactYaco(data)
+        self.assertEqual(c.get_data(), data)
+        self.assertEqual(c.g[4].h, 6)
+        self.assertEqual(c['c.e'], 4)
+        self.assertEqual(c.r.typecode, 'q')
+        self.assertEqual(c.s.typecode, 'd')
+        self.assertFalse('c.x' in c)
+        self.assertEqual(c.get('x'), None)
+        self.assertTrue(c == Yaco.CompactYaco(data) == data)
+        self.assertTrue(c == Yaco.Yaco(data))
+        self.assertFalse(c != data)
+
+        other = Yaco.CompactYaco(data)
+        self.assertTrue(c.c._layout is other.c._layout)
+        c['c.x.y'] = {'z': [1]}
+        self.assertEqual(c.c.x.y.z, [1])
+        self.assertFalse(c.c._layout is other.c._layout)
+        self.assertEqual(other.get_data(), data)
+        del c.c.x
+        self.assertTrue(c.c._layout is other.c._layout)
+        self.assertEqual(c, other)
+
+        # missing keys are created on access, as with a Yaco
+        c.x.y = 1
+        c['p.q'].r = 2
+        self.assertEqual((c.x.y, c.p.q.r), (1, 2))
+        self.assertNotEqual(c, other)
+        del c.x, c.p
+
+        # non string keys
+        n = Yaco.CompactYaco("{1: one}")
+        self.assertEqual(n[1], 'one')
+        n[5] = 'v'
+        self.assertEqual((n[5], n.get(5), 1 in n, 2 in n),
+                         ('v', 'v', True, False))
+        del n[5]
+        self.assertEqual(n.get_data(), {1: 'one'})
+
+        # derived layouts are dropped once no node uses them
+        import gc
+        node = Yaco.CompactYaco({'k': 1})
+        for i in range(100):
+            node['n{0}'.format(i)] = i
+            del node['n{0}'.format(i)]
+        gc.collect()
+        self.assertEqual(len(node._layout.added), 0)
+
+        y = c.to_yaco()
+        self.assertTrue(isinstance(y.c, Yaco.Yaco))
+        self.assertEqual(y.get_data(), data)
+        self.assertEqual(Yaco.Yaco(c.dump()).get_data(), data)
+
+    def test_libyaml_option(self):
+        old = Yaco.USE_LIBYAML
+        try:
+            Yaco.USE_LIBYAML = False
+            self.assertTrue(issubclass(Yaco._yaml_loader(), yaml.SafeLoader))
+            y = Yaco.Yaco(Yaco.Yaco(test_set_1).dump())
+            self.assertEqual(y.g[4].h, 6)
+            if yaml.__with_libyaml__:
+                Yaco.USE_LIBYAML = None
+                self.assertTrue(
+                    issubclass(Yaco._yaml_loader(), yaml.CSafeLoader))
+                z = Yaco.Yaco(y.dump())
+                self.assertEqual(z.get_data(), y.get_data())
+        finally:
+            Yaco.USE_LIBYAML = old
+
+    def test_intern(self):
+        old = Yaco.USE_LIBYAML, Yaco.INTERN_KEYS, Yaco.INTERN_VALUES
+        raw = "a: {name: some value, key: [{name: some value}]}"
+        try:
+            # off by default: nothing is interned, nor counted
+            Yaco.intern_stats(reset=True)
+            y = Yaco.Yaco(raw)
+            y.update({'b': ['', 'x']})
+            self.assertEqual(Yaco.intern_stats(),
+                             {'keys': 0, 'values': 0,
+                              'duplicates': 0, 'bytes_saved': 0})
+
+            Yaco.INTERN_KEYS = True
+            for use_libyaml in (False, yaml.__with_libyaml__):
+                Yaco.USE_LIBYAML = use_libyaml
+                Yaco.INTERN_VALUES = 0
+                Yaco.intern_stats(reset=True)
+                y = Yaco.Yaco(raw)
+                z = Yaco.Yaco(raw)
+                key, = [k for k in y.a if k == 'name']
+                other, = [k for k in z.a.key[0] if k == 'name']
+                self.assertTrue(key is other)
+                self.assertFalse(y.a.name is z.a.name)
+                stats = Yaco.intern_stats()
+                self.assertEqual((stats['keys'], stats['values']), (8, 0))
+                self.assertTrue(stats['bytes_saved'] > 0)
+
+                Yaco.INTERN_VALUES = 16
+                y = Yaco.Yaco(raw)
+                self.assertTrue(y.a.name is y.a.key[0].name)
+                self.assertEqual(Yaco.intern_stats()['values'], 2)
+
+            Yaco.intern_stats(reset=True)
+            y = Yaco.Yaco()
+            y.update({''.join(['na', 'me']): 1})
+            key, = list(y)
+            self.assertTrue(key is Yaco._intern('name'))
+            self.assertEqual(Yaco.intern_stats()['keys'], 1)
+
+            # nested dicts & dicts in lists are interned as well
+            Yaco.intern_stats(reset=True)
+            y.update({'a': {''.join(['na', 'me']): 1},
+                      'b': [{''.join(['na', 'me']): 2}]})
+            self.assertTrue(list(y.a)[0] is Yaco._intern('name'))
+            self.assertTrue(list(y.b[0])[0] is Yaco._intern('name'))
+            self.assertEqual(Yaco.intern_stats()['keys'], 4)
+            y = Yaco.Yaco.from_data({'c': {''.join(['na', 'me']): 3}})
+            self.assertTrue(list(y.c)[0] is Yaco._intern('name'))
+        finally:
+            Yaco.USE_LIBYAML, Yaco.INTERN_KEYS, Yaco.INTERN_VALUES = old
+
+    def test_dump_tuple(self):
+        y = Yaco.Yaco()
+        y.t = (1, 2)
+        self.assertEqual(Yaco.Yaco(y.dump()).t, [1, 2])
+
+    def test_missing_modes(self):
+        y = Yaco.Yaco(test_set_1)
+        self.assertFalse('x.y' in y)
+        self.assertFalse(y.has_key('c.x'))
+        self.assertEqual(y.get_path('x.y', 3), 3)
+        self.assertEqual(Yaco.Yaco.compile_path('c.x').get(y, None), None)
+        self.assertEqual(y.get_data(), test_set_1)
+
+        y.set_missing('sentinel')
+        self.assertTrue(y.x.y is Yaco.MISSING)
+        self.assertTrue(y['c.x.z'] is Yaco.MISSING)
+        self.assertFalse(y.g[4].x)
+        self.assertRaises(TypeError, setattr, y.x, 'y', 1)
+        self.assertEqual(y.get_data(), test_set_1)
+        import copy
+        self.assertEqual(copy.deepcopy(y).get_data(), test_set_1)
+
+        y.set_missing('raise')
+        self.assertRaises(KeyError, getattr, y, 'x')
+        self.assertRaises(AttributeError, getattr, y.c, 'x')
+        self.assertRaises(Yaco.YacoKeyError, y.__getitem__, 'c.x')
+        y.update({'n': {'o': 1}})
+        self.assertRaises(KeyError, getattr, y.n, 'x')
+        y.set_path('p.q', 1)
+        self.assertRaises(KeyError, getattr, y.p, 'x')
+
+        y.set_missing('create')
+        self.assertEqual(y.x, {})
+        self.assertRaises(ValueError, y.set_missing, 'ignore')
+
+    def test_frozen(self):
+        y = Yaco.Yaco(test_set_1)
+        f = y.freeze()
+        self.assertTrue(isinstance(f.c, Yaco.FrozenYaco))
+        self.assertEqual(f.g[4].i, 7)
+        self.assertEqual(f.get_data(), y.freeze().get_data())
+        self.assertEqual(hash(f), hash(Yaco.FrozenYaco(test_set_1)))
+        self.assertTrue(f.x is Yaco.MISSING)
+        self.assertFalse('x' in f)
+        self.assertRaises(TypeError, setattr, f.c, 'd', 1)
+        self.assertRaises(TypeError, f.update, {'a': 2})
+        self.assertRaises(TypeError, f.__delitem__, 'a')
+
+        g = f.updated({'c': {'d': 9}, 'b': 2})
+        self.assertEqual((f.c.d, g.c.d, g.c.e), (3, 9, 4))
+        self.assertTrue(g.g is f.g)
+        h = g.with_path('c.d', 3)
+        self.assertEqual(h, f)
+        self.assertEqual(len(set([f, g, h])), 2)
+        self.assertTrue(f.with_path('c.d', 3).g is f.g)
+
+        z = f.thaw()
+        z.g[4].i = 8
+        z.g.append(9)
+        self.assertEqual(f.g[4].i, 7)
+        self.assertEqual(len(f.g), 5)
+        self.assertEqual(y.get_data(), test_set_1)
+
+        import pickle
+        self.assertEqual(pickle.loads(pickle.dumps(g)), g)
+        import copy
+        d = copy.deepcopy(g)
+        self.assertEqual(d, g)
+        self.assertTrue(isinstance(d.c, Yaco.FrozenYaco))
+
+    def test_from_data(self):
+        data = yaml.safe_load(Yaco.Yaco(test_set_1).dump())
+        y = Yaco.Yaco.from_data(data, trusted=False)
+        self.assertEqual(y.get_data(), test_set_1)
+        self.assertTrue(isinstance(y.g[4], Yaco.Yaco))
+        self.assertFalse(isinstance(data['g'][4], Yaco.Yaco))
+        y = Yaco.Yaco.from_data(data)
+        self.assertTrue(y.g is data['g'])
+        self.assertTrue(isinstance(data['g'][4], Yaco.Yaco))
+
+        deep = leaf = {}
+        for i in range(5000):
+            leaf['n'] = leaf = {}
+        leaf['x'] = [[{'y': 1}]]
+        y = Yaco.Yaco.from_data(deep)
+        self.assertEqual(y.get_path('n.' * 5000 + 'x')[0][0].y, 1)
+
+    def test_export(self):
+        y = Yaco.Yaco(test_set_1)
+        y.c._private = ['e']
+        y.c._hidden = 1
+        y.t = (1, [2, {'_u': 3, 'v': None}], (4,))
+        data = y.get_data()
+        self.assertEqual(data['c'], {'d': 3, 'f': 5})
+        # dicts in tuples are not converted to Yaco objects
+        self.assertEqual(data['t'], (1, [2, {'_u': 3, 'v': None}], (4,)))
+        self.assertFalse(isinstance(data['g'][4], Yaco.Yaco))
+        simple = y.simple()
+        self.assertEqual(simple['c']['_private'], ['e'])
+        self.assertEqual(simple['t'], (1, [2, {'_u': 3, 'v': 'None'}], (4,)))
+
+        # no recursion limit
+        deep = leaf = {}
+        for i in range(5000):
+            leaf['n'] = leaf = {}
+        y = Yaco.Yaco.from_data(deep)
+        for data in (y.get_data(), y.simple()):
+            for i in range(5000):
+                self.assertEqual(type(data), dict)
+                data = data['n']
+            self.assertEqual(data, {})
+
+    def test_copy(self):
+        y = Yaco.Yaco(test_set_1)
+        y.set_missing('sentinel')
+        z = y.copy()
+        self.assertEqual(z.get_data(), test_set_1)
+        self.assertFalse(z.get_path('g') is y.get_path('g'))
+        self.assertTrue(z.x is Yaco.MISSING)
+        z.g[4].i = 9
+        z.c.d = 9
+        self.assertEqual(y.get_data(), test_set_1)
+
+    def test_copy_isolated(self):
+        y = Yaco.Yaco(test_set_1)
+        held = y.c
+        z = y.copy()
+        self.assertFalse(z.get_path('c') is y.get_path('c'))
+
+        # writes through every access path stay in the copy
+        z.get('c')['d'] = 9
+        z.get_path('c')['e'] = 9
+        for key, value in z.items():
+            if key == 'g':
+                value[4].h = 9
+        self.assertEqual(y.get_data(), test_set_1)
+
+        # reads do not change the original - a branch held before
+        # the copy still belongs to it
+        y.c
+        self.assertTrue(y.get_path('c') is held)
+        held.d = 7
+        self.assertEqual((y.c.d, z.c.d), (7, 9))
+
     def test_save_and_yaml(self):
         y = Yaco.Yaco(test_set_1)
         tmpfile = tempfile.NamedTemporaryFile(delete=False)
         y.save(tmpfile.name)
         self.assertTrue(os.path.exists(tmpfile.name))
         with open(tmpfile.name) as F:
-            YY = yaml.load(F)
+            YY = yaml.safe_load(F)
         self.assertEqual(YY['a'], 1)
         self.assertEqual(YY['g'][4]['i'], 7)
 
@@ -162,6 +514,58 @@ class BasicYacoFileTest(unittest.TestCase):
         z = Yaco.YacoFile(self.filename)
         self.assertEqual(y.b, 3)
 
+    def test_load_all(self):
+        with open(self.filename, 'w') as F:
+            for i in range(100):
+                F.write("---\nrecord: {0}\nvals: [{{'n': {0}}}]\n".format(i))
+                F.write("r{0}: {{'x': {0}}}\n".format(i))
+        docs = Yaco.Yaco.iter_documents(self.filename)
+        first = next(docs)
+        self.assertEqual((first.record, first.vals[0].n, first.r0.x),
+                         (0, 0, 0))
+        self.assertEqual(len(list(docs)), 99)
+
+        y = Yaco.Yaco()
+        y.load_all(self.filename, 'leaf')
+        self.assertEqual(y.leaf.record, 99)
+        self.assertEqual(y.leaf.r50.x, 50)
+
+        with open(self.filename, 'w') as F:
+            F.write("a: 1\n---\n- 1\n")
+        self.assertRaises(Exception, list,
+                          Yaco.Yaco.iter_documents(self.filename))
+
+    def test_save_streaming(self):
+        y = Yaco.YacoFile(self.filename)
+        y.c._private = ['e']
+        y._hidden = 1
+        os.chmod(self.filename, 0o640)
+        y.save()
+        with open(self.filename) as F:
+            self.assertEqual(F.read(), y.dump())
+        self.assertEqual(os.stat(self.filename).st_mode & 0o777, 0o640)
+
+        Yaco.Yaco.save(y, self.filename, doNotSave=['a', 'c'])
+        data = yaml.safe_load(open(self.filename))
+        self.assertEqual(sorted(data.keys()), ['b', 'g'])
+        self.assertEqual(os.listdir(self.tmpdir), ['one.yaml'])
+
+    def test_save_symlink(self):
+        link = os.path.join(self.tmpdir, 'link.yaml')
+        os.symlink(self.filename, link)
+        Yaco.Yaco({'a': 99}).save(link)
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(Yaco.YacoFile(self.filename).a, 99)
+
+        umask = os.umask(0o027)
+        try:
+            new = os.path.join(self.tmpdir, 'new.yaml')
+            Yaco.Yaco({'a': 1}).save(new)
+        finally:
+            os.umask(umask)
+        mode = os.stat(new).st_mode & 0o777
+        self.assertTrue(mode in (0o640, 0o600))
+
     def tearDown(self):
         shutil.rmtree(self.tmpdir)
 
@@ -201,6 +605,144 @@ class BasicYacoDirTest(unittest.TestCase):
 
         self.assertEqual(y.sub_a.sub_c.three.a, 1)
 
+    def test_load_report(self):
+        events = []
+        Yaco.load_report(reset=True)
+        Yaco.profile_loads()
+        Yaco.add_load_hook(events.append)
+        try:
+            y = Yaco.YacoDir(self.tmpdir)
+            self.assertEqual(len(events), 4)
+            self.assertEqual(
+                sorted(os.path.basename(e['source']) for e in events),
+                ['_four.config', '_one.config', 'three.config',
+                 'two.config'])
+            for e in events:
+                self.assertEqual((e['loader'], e['cached']),
+                                 ('YacoDir', False))
+                self.assertTrue(e['bytes'] > 0 and e['parse'] > 0)
+            self.assertEqual(
+                sum(e['keys'] for e in events), Yaco._count_keys(
+                    [test_set_1, test_set_2, test_set_1, test_set_2]))
+
+            Yaco.YacoDir(self.tmpdir)
+            self.assertTrue(events[-1]['cached'])
+            Yaco.YacoDir(self.tmpdir, cache=False, lazy=True).sub_a
+            self.assertEqual(len(events), 7)
+            Yaco.PolyYaco(files=[self.filenameA, self.filenameB])
+            self.assertEqual([e['loader'] for e in events[7:]],
+                             ['Yaco', 'PolyYaco', 'Yaco', 'PolyYaco'])
+
+            report = Yaco.load_report(reset=True)
+            self.assertEqual(report['total']['sources'], 11)
+            y.x.y
+            y.set_missing('sentinel')
+            y.z
+            self.assertEqual(Yaco.load_report(reset=True)['lookups'],
+                             {'autovivified': 2, 'missed': 1})
+            self.assertEqual(Yaco.load_report()['sources'], [])
+        finally:
+            Yaco.remove_load_hook(events.append)
+            Yaco.profile_loads(False)
+        Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(len(events), 11)
+        self.assertFalse(Yaco._profiling)
+
+    def test_lazy(self):
+        y = Yaco.YacoDir(self.tmpdir)
+        z = Yaco.YacoDir(self.tmpdir, lazy=True, cache=False)
+        self.assertEqual(z._pending, set(['two', 'sub_a', 'sub_b']))
+        self.assertEqual(z.a, 1)
+        self.assertEqual(z.sub_a.sub_c.three.c.d, 3)
+        self.assertEqual(z._pending, set(['two', 'sub_b']))
+        self.assertEqual(z['two.b.k'], 9)
+        self.assertEqual(z._pending, set(['sub_b']))
+        self.assertEqual(sorted(z.keys()), sorted(y.keys()))
+        self.assertEqual(z.get_data(), y.get_data())
+        self.assertEqual(z.dump(), y.dump())
+
+    def test_lazy_paths(self):
+        z = Yaco.YacoDir(self.tmpdir, lazy=True, cache=False)
+        self.assertEqual(z.get_path('sub_a.sub_c.three.c.d'), 3)
+        self.assertEqual(Yaco.Yaco.compile_path('two.b.k').get(z), 9)
+        z.set_path('sub_b.new', 1)
+        self.assertEqual(z.sub_b.new, 1)
+        self.assertEqual(z.sub_b.b.m, 10)
+
+    def test_lazy_order(self):
+        # a root file and a subdirectory both contribute to `sub_b`
+        x = Yaco.Yaco({'sub_b': {'a': 'root', 'extra': 1}})
+        x.save(os.path.join(self.tmpdir, '_zero.config'))
+        y = Yaco.YacoDir(self.tmpdir, cache=False)
+        z = Yaco.YacoDir(self.tmpdir, lazy=True, cache=False)
+        self.assertEqual(z.sub_b.extra, 1)
+        self.assertEqual(z.sub_b.a, y.sub_b.a)
+        self.assertEqual(z.get_data(), y.get_data())
+
+    def test_parallel(self):
+        y = Yaco.YacoDir(self.tmpdir, cache=False)
+        for executor in ('thread', 'process'):
+            z = Yaco.YacoDir(self.tmpdir, cache=False, workers=3,
+                             executor=executor)
+            self.assertEqual(z.get_data(), y.get_data())
+        z = Yaco.YacoDir(self.tmpdir, cache=False, lazy=True, workers=3)
+        self.assertEqual(z.get_data(), y.get_data())
+
+    def test_refresh(self):
+        y = Yaco.YacoDir(self.tmpdir, cache=False)
+        self.assertEqual(y.refresh(), [])
+        held, sub_a = y.two, y.sub_a
+
+        x = Yaco.Yaco(test_set_2)
+        x.b.k = 'changed'
+        x.save(self.filenameB)
+        Yaco.Yaco({'new': 1}).save(os.path.join(self.tmpdir, 'sub_b',
+                                                 'five.config'))
+        os.unlink(os.path.join(self.tmpdir, 'sub_a', 'sub_c',
+                               'three.config'))
+        self.assertEqual(y.refresh(), ['sub_a', 'sub_b.five',
+                                       'two.b.k'])
+        # changed keys are built on the side & swapped in as a whole
+        self.assertEqual((held.b.k, y.two.b.k), (9, 'changed'))
+        self.assertFalse('sub_a' in y)
+        self.assertTrue('three' in sub_a.sub_c)
+        self.assertEqual(y.get_data(),
+                         Yaco.YacoDir(self.tmpdir, cache=False).get_data())
+
+        # a root file changes what it contributes
+        Yaco.Yaco({'a': 2, 'two': {'a': 'root'}}).save(self.filenameA)
+        self.assertEqual(y.refresh(), ['a', 'b', 'c', 'g'])
+        self.assertEqual(y.get_data(),
+                         Yaco.YacoDir(self.tmpdir, cache=False).get_data())
+        self.assertEqual(y.two.a, 18)
+
+    def test_refresh_parses_changed(self):
+        for i in range(4):
+            Yaco.Yaco({'root{0}'.format(i): i}).save(
+                os.path.join(self.tmpdir, '_root{0}.config'.format(i)))
+        y = Yaco.YacoDir(self.tmpdir, cache=False)
+        changed = os.path.join(self.tmpdir, 'sub_b', '_four.config')
+        Yaco.Yaco({'a': 180}).save(changed)
+        events = []
+        Yaco.add_load_hook(events.append)
+        try:
+            self.assertEqual(y.refresh(), ['sub_b.a', 'sub_b.b', 'sub_b.g'])
+        finally:
+            Yaco.remove_load_hook(events.append)
+        self.assertEqual([e['source'] for e in events], [changed])
+        self.assertEqual(y.get_data(),
+                         Yaco.YacoDir(self.tmpdir, cache=False).get_data())
+
+    def test_refresh_lazy(self):
+        y = Yaco.YacoDir(self.tmpdir, cache=False, lazy=True)
+        x = Yaco.Yaco(test_set_2)
+        x.b.k = 'changed'
+        x.save(self.filenameB)
+        self.assertEqual(y.refresh(), ['two'])
+        self.assertEqual(y.two.b.k, 'changed')
+        self.assertEqual(y.get_data(),
+                         Yaco.YacoDir(self.tmpdir, cache=False).get_data())
+
     def test_cache(self):
         y = Yaco.YacoDir(self.tmpdir)
         self.assertTrue(os.path.exists(
@@ -208,6 +750,49 @@ class BasicYacoDirTest(unittest.TestCase):
         #hmm - loading it twice should activate cache loading
         y = Yaco.YacoDir(self.tmpdir)
 
+    def test_cache_is_used(self):
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(y.two.a, 18)
+        # change the contents but keep size & mtime: the manifest
+        # still matches, so the cached tree is returned
+        st = os.stat(self.filenameB)
+        with open(self.filenameB) as F:
+            content = F.read()
+        with open(self.filenameB, 'w') as F:
+            F.write(content.replace('a: 18', 'a: 19'))
+        os.utime(self.filenameB, ns=(st.st_atime_ns, st.st_mtime_ns))
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(y.two.a, 18)
+        y = Yaco.YacoDir(self.tmpdir, cache=False)
+        self.assertEqual(y.two.a, 19)
+
+    def test_cache_is_invalidated(self):
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(y.two.a, 18)
+        x = Yaco.Yaco(test_set_2)
+        x.a = 180
+        x.save(self.filenameB)
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(y.two.a, 180)
+        # new files invalidate the cache as well
+        Yaco.Yaco({'z': 1}).save(os.path.join(self.tmpdir, 'zz.config'))
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertEqual(y.zz.z, 1)
+
+    def test_cache_is_not_unpickled(self):
+        cachefile = os.path.join(self.tmpdir, Yaco.YACODIR_CACHEFILE)
+        manifest = Yaco._dir_manifest(
+            '*.config', Yaco._scan_dir(self.tmpdir, '*.config'))
+        # a date cannot be marshalled - this snapshot is pickled
+        Yaco._write_snapshot(cachefile, {
+            'manifest': manifest,
+            'data': {'x': datetime.date(2000, 1, 1)}})
+        y = Yaco.YacoDir(self.tmpdir)
+        self.assertFalse('x' in y)
+        self.assertEqual(y.two.a, 18)
+        self.assertEqual(Yaco._read_snapshot(cachefile)['data'],
+                         Yaco._raw_data(y))
+
 
     def tearDown(self):
         shutil.rmtree(self.tmpdir)
@@ -260,6 +845,86 @@ class BasicPolyYacoTest(unittest.TestCase):
         self.assertEqual(y.Mus, 'musculus')
         #self.assertEqual(y.Sus, 'scrofa')
 
+    def test_parallel(self):
+        files = ['pkg://Yaco/etc/*.config', self.filenameB,
+                 self.filenameA, self.subdir]
+        y = Yaco.PolyYaco(files=files)
+        for executor in ('thread', 'process'):
+            z = Yaco.PolyYaco(files=files, workers=4, executor=executor)
+            self.assertEqual(z.get_data(), y.get_data())
+        self.assertEqual(z.b, 2)
+
+    def test_polydyn(self):
+        files = ['pkg://Yaco/etc/*.config', self.filenameA,
+                 self.filenameB, self.subdir]
+        y = Yaco.PolyYaco(files=files, leaf='x')
+        z = Yaco.PolyDynYaco(files=files, leaf='x')
+        self.assertEqual(z.get_data(), y.get_data())
+        self.assertEqual(z.x.b.k, 9)
+        self.assertEqual(z['x.c.e'], 4)
+        self.assertEqual(z.x.g, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(sorted(z.x.keys()), sorted(y.x.keys()))
+        self.assertTrue('x.c.f' in z)
+        self.assertFalse('x.c.zz' in z)
+        self.assertFalse(z.x.nothing.here)
+        # the parent of a dotted key is not a branch
+        p = Yaco.PolyDynYaco(files=[], layers=[{'a': 'xyz', 'n': 1}])
+        self.assertFalse('a.x' in p or 'n.x' in p or 'n.x.y' in p)
+        self.assertEqual(p.get_path('n.x', 'dflt'), 'dflt')
+        self.assertEqual(p.get('a.x'), None)
+        self.assertRaises(KeyError, p.get_path, 'a.x')
+        self.assertEqual(z.get_data(), y.get_data())
+
+        z.x.c.e = 40
+        self.assertEqual(z.layer(self.subdir).x.c.e, 40)
+        self.assertEqual(z.layer(self.filenameA).x.c.e, 4)
+        del z.x.c.e
+        self.assertEqual(z.x.c.e, 4)
+
+        # a branch replaced in a layer directly is only seen once the
+        # layer is set again
+        view = z.x.c
+        self.assertEqual(view.f, 5)
+        top = z.layer(self.subdir)
+        top.x.c = 'flat'
+        z.set_layer(self.subdir, top)
+        self.assertEqual(z.x.c, 'flat')
+        self.assertFalse(view)
+        del top.x.c
+        z.set_layer(self.subdir, top)
+        self.assertEqual(view.f, 5)
+
+        x = Yaco.Yaco(test_set_2)
+        x.b = 'flat'
+        x.save(self.filenameB)
+        z.reload_layer(self.filenameB)
+        self.assertEqual(z.x.b, 'flat')
+        self.assertEqual(z.get_data(),
+                         Yaco.PolyYaco(files=files, leaf='x').get_data())
+
+    def test_cache(self):
+        cache = os.path.join(self.tmpdir, 'cache')
+        files = ['pkg://Yaco/etc/*.config', self.filenameA, self.subdir]
+        y = Yaco.PolyYaco(files=files, cache=cache)
+        self.assertTrue(os.path.exists(cache))
+
+        load = Yaco.PolyYaco.load
+        try:
+            def fail(*args):
+                raise AssertionError("cache not used")
+            Yaco.PolyYaco.load = fail
+            z = Yaco.PolyYaco(files=files, cache=cache)
+        finally:
+            Yaco.PolyYaco.load = load
+        self.assertEqual(z.get_data(), y.get_data())
+        self.assertEqual(z.Mus, 'musculus')
+
+        x = Yaco.Yaco(test_set_1)
+        x.c.e = 'changed'
+        x.save(self.filenameA)
+        z = Yaco.PolyYaco(files=files, cache=cache)
+        self.assertEqual(z.c.e, 'changed')
+
     def tearDown(self):
         shutil.rmtree(self.tmpdir)
 
@@ -287,4 +952,410 @@ class BasicYacoPkgTest(unittest.TestCase):
         y = Yaco.YacoPkg("Yaco", 'etc/subset_a/')
         self.assertEqual(y.Sus, 'scrofa')
 
+    def test_cache(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            cache = os.path.join(tmpdir, 'cache')
+            y = Yaco.YacoPkg("Yaco", "etc/", cache=cache)
+            self.assertTrue(os.path.exists(cache))
+            load = Yaco.YacoPkg.load
+            try:
+                def fail(*args):
+                    raise AssertionError("cache not used")
+                Yaco.YacoPkg.load = fail
+                z = Yaco.YacoPkg("Yaco", "etc/", cache=cache)
+            finally:
+                Yaco.YacoPkg.load = load
+            self.assertEqual(z.subset_a.Sus, 'scrofa')
+            self.assertEqual(z.get_data(), y.get_data())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_pkg_resources_fallback(self):
+        y = Yaco.YacoPkg("Yaco", "etc/")
+        pkg_resource = Yaco._pkg_resource
+        try:
+            Yaco._pkg_resource = lambda pkg_name, path: None
+            z = Yaco.YacoPkg("Yaco", "etc/")
+        finally:
+            Yaco._pkg_resource = pkg_resource
+        self.assertEqual(z.get_data(), y.get_data())
+
+    def test_index(self):
+        tmpdir = tempfile.mkdtemp()
+        sys.path.insert(0, tmpdir)
+        try:
+            etc = os.path.join(tmpdir, 'yaco_test_pkg', 'etc')
+            os.makedirs(os.path.join(etc, 'sub'))
+            open(os.path.join(tmpdir, 'yaco_test_pkg', '__init__.py'),
+                 'w').close()
+            Yaco.Yaco({'a': 1}).save(os.path.join(etc, '__root__.config'))
+            Yaco.Yaco({'c': 2}).save(os.path.join(etc, 'sub', 'b.config'))
+            y = Yaco.YacoPkg('yaco_test_pkg', 'etc/')
+
+            from Yaco.__main__ import main
+            self.assertEqual(main(['build-index', 'yaco_test_pkg']), 0)
+            index = os.path.join(etc, Yaco.YACOPKG_INDEX)
+            # as if built by another python version
+            with open(index, 'rb') as F:
+                raw = bytearray(F.read())
+            raw[11] = (raw[11] + 1) % 256
+            with open(index, 'wb') as F:
+                F.write(raw)
+            load = Yaco.YacoPkg.load
+            try:
+                def fail(*args):
+                    raise AssertionError("index not used")
+                Yaco.YacoPkg.load = fail
+                z = Yaco.YacoPkg('yaco_test_pkg', 'etc/')
+                self.assertEqual(z.get_data(), y.get_data())
+                self.assertEqual(z.sub.b.c, 2)
+                z = Yaco.YacoPkg('yaco_test_pkg', 'etc/', leaf='x.y')
+                self.assertEqual(z.x.y.sub.b.c, 2)
+                # the index is for the default patterns only
+                self.assertRaises(AssertionError, Yaco.YacoPkg,
+                                  'yaco_test_pkg', 'etc/', pattern='*.yaml')
+            finally:
+                Yaco.YacoPkg.load = load
+
+            # a changed file makes the index stale
+            Yaco.Yaco({'c': 3}).save(os.path.join(etc, 'sub', 'b.config'))
+            self.assertEqual(Yaco.YacoPkg('yaco_test_pkg', 'etc/').sub.b.c, 3)
+        finally:
+            sys.path.remove(tmpdir)
+            sys.modules.pop('yaco_test_pkg', None)
+            shutil.rmtree(tmpdir)
+
+    def test_index_is_packaged(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for name in ('setup.py', 'MANIFEST.in', 'README.md'):
+                shutil.copy(os.path.join(root, name), tmpdir)
+            shutil.copytree(os.path.join(root, 'src', 'Yaco'),
+                            os.path.join(tmpdir, 'src', 'Yaco'))
+            index = os.path.join('Yaco', 'etc', Yaco.YACOPKG_INDEX)
+            Yaco.build_pkg_index(
+                'Yaco', to_file=os.path.join(tmpdir, 'src', index))
+            with open(os.devnull, 'w') as devnull:
+                self.assertEqual(subprocess.call(
+                    [sys.executable, 'setup.py', 'sdist', '-d', 'dist',
+                     'build_py', '-d', 'build'],
+                    cwd=tmpdir, stdout=devnull, stderr=devnull), 0)
+            # in the wheel (as built by build_py) & the sdist
+            self.assertTrue(os.path.exists(
+                os.path.join(tmpdir, 'build', index)))
+            import tarfile
+            sdist, = os.listdir(os.path.join(tmpdir, 'dist'))
+            with tarfile.open(os.path.join(tmpdir, 'dist', sdist)) as tar:
+                names = [n.split('/', 1)[1] for n in tar.getnames()
+                         if '/' in n]
+            self.assertTrue('src/Yaco/etc/' + Yaco.YACOPKG_INDEX in names)
+            self.assertTrue('src/Yaco/etc/__root__.config' in names)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_lazy_imports(self):
+        code = ("import sys, Yaco; "
+                "assert 'pkg_resources' not in sys.modules; "
+                "assert 'yaml' not in sys.modules; "
+                "Yaco.YacoPkg('Yaco', 'etc/'); "
+                "assert 'pkg_resources' not in sys.modules")
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(Yaco.__file__))
+        self.assertEqual(
+            subprocess.call([sys.executable, '-c', code], env=env), 0)
+
+
+class ConcurrentYacoTest(unittest.TestCase):
+
+    def test_stress(self):
+        c = Yaco.ConcurrentYaco({'a': {'x': 0, 'y': 0}, 'n': 0})
+        errors = []
+        stop = threading.Event()
+        writers, rounds = 4, 300
+
+        def read():
+            try:
+                while not stop.is_set():
+                    tree = c.snapshot()
+                    if tree.a.x != tree.a.y:
+                        errors.append("half applied update")
+                    if c.missing.key is not Yaco.MISSING or 'b.x' in c:
+                        errors.append("missing key found")
+                    c['a.x']
+                    c.get_data()
+            except Exception as e:
+                errors.append(e)
+
+        def write(w):
+            try:
+                # from 1: soft_update overwrites falsy values
+                for i in range(1, rounds + 1):
+                    c.update({'a': {'x': i, 'y': i}})
+                    c.apply(lambda tree: tree.with_path('n', tree.n + 1))
+                    c['w.{0}'.format(w)] = i
+                    c.soft_update({'a': {'x': -1, 'z': w}})
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            readers = [threading.Thread(target=read) for _ in range(8)]
+            for t in readers:
+                t.start()
+            threads = [threading.Thread(target=write, args=(w,))
+                       for w in range(writers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            stop.set()
+            for t in readers:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(c.n, writers * rounds)
+        self.assertEqual(sorted(c.keys()), ['a', 'n', 'w'])
+        self.assertEqual(c.a.x, rounds)
+        self.assertTrue(c.a.z in range(writers))
+        self.assertEqual(dict(c.w), dict([(str(w), rounds)
+                                          for w in range(writers)]))
+
+
+class AsyncYacoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp("AsyncYacoTest")
+        self.dirname = os.path.join(self.tmpdir, 'dir')
+        os.makedirs(os.path.join(self.dirname, 'sub_a', 'sub_c'))
+        self.filenameA = os.path.join(self.dirname, '_one.config')
+        self.filenameB = os.path.join(self.dirname, 'two.config')
+        Yaco.Yaco(test_set_1).save(self.filenameA)
+        Yaco.Yaco(test_set_2).save(self.filenameB)
+        Yaco.Yaco(test_set_2).save(
+            os.path.join(self.dirname, 'sub_a', 'sub_c', 'three.config'))
 
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_aload(self):
+        y = Yaco.Yaco()
+        asyncio.run(y.aload(self.filenameA, 'leaf'))
+        self.assertEqual(y.get_data(), {'leaf': test_set_1})
+
+        y = asyncio.run(Yaco.YacoFile.aload(self.filenameB))
+        self.assertTrue(isinstance(y, Yaco.YacoFile))
+        self.assertEqual(y, Yaco.YacoFile(self.filenameB))
+        self.assertEqual(y._reloaded(), None)
+
+    def test_yacodir(self):
+        expected = Yaco.YacoDir(self.dirname, cache=False)
+        cachefile = os.path.join(self.dirname, Yaco.YACODIR_CACHEFILE)
+        y = asyncio.run(Yaco.YacoDir.aload(self.dirname))
+        self.assertTrue(isinstance(y, Yaco.YacoDir))
+        self.assertEqual(y, expected)
+        self.assertTrue(os.path.exists(cachefile))
+        # from the cache
+        y = asyncio.run(Yaco.YacoDir.aload(self.dirname))
+        self.assertEqual(y, expected)
+        self.assertEqual(y._reloaded(), None)
+
+        # the loop keeps running while files are read & parsed
+        os.makedirs(os.path.join(self.dirname, 'sub_b'))
+        for i in range(200):
+            Yaco.Yaco(test_set_1).save(
+                os.path.join(self.dirname, 'sub_b', '{0}.config'.format(i)))
+        expected = Yaco.YacoDir(self.dirname, cache=False)
+        ticks = []
+
+        async def load():
+            async def tick():
+                while True:
+                    ticks.append(1)
+                    await asyncio.sleep(0)
+            ticker = asyncio.ensure_future(tick())
+            y = await Yaco.YacoDir.aload(self.dirname, cache=False)
+            ticker.cancel()
+            return y
+
+        self.assertEqual(asyncio.run(load()), expected)
+        self.assertTrue(len(ticks) > 1)
+
+    def test_polyyaco(self):
+        files = [self.filenameA, os.path.join(self.dirname, 'sub_a'),
+                 os.path.join(self.tmpdir, 'nonexisting.config')]
+        cache = os.path.join(self.tmpdir, 'poly.cache')
+        expected = Yaco.PolyYaco(files=files, leaf='x')
+        y = asyncio.run(Yaco.PolyYaco.aload(files=files, leaf='x',
+                                            cache=cache))
+        self.assertTrue(isinstance(y, Yaco.PolyYaco))
+        self.assertEqual(y, expected)
+        self.assertEqual(y._reloaded(), None)
+        y = asyncio.run(Yaco.PolyYaco.aload(files=files, leaf='x',
+                                            cache=cache))
+        self.assertEqual(y, expected)
+
+    def test_asave(self):
+        y = Yaco.YacoFile(self.filenameA)
+        y.c.d = 30
+        filename = os.path.join(self.tmpdir, 'saved.config')
+
+        async def save():
+            saving = y.asave()
+            # not saved: asave saves the Yaco as it was when called
+            y.c.e = 40
+            await saving
+            await Yaco.Yaco.asave(y, filename)
+
+        asyncio.run(save())
+        self.assertEqual(Yaco.YacoFile(self.filenameA).c.get_data(),
+                         {'d': 30, 'e': 4, 'f': 5})
+        self.assertEqual(Yaco.YacoFile(filename).c.get_data(),
+                         {'d': 30, 'e': 40, 'f': 5})
+        self.assertRaises(Exception, Yaco.YacoDir(self.dirname).asave)
+
+    def test_asave_held_branch(self):
+        big = Yaco.Yaco(test_set_1)
+        for i in range(2000):
+            big['k{0}'.format(i)] = {'v': i}
+        held = big.c
+        filename = os.path.join(self.tmpdir, 'held.config')
+
+        async def save():
+            saving = big.asave(filename, doNotSave=['a'])
+            held.d = 'AFTER'
+            big['new'] = 1
+            await saving
+
+        asyncio.run(save())
+        saved = Yaco.YacoFile(filename)
+        self.assertEqual(saved.c.d, 3)
+        self.assertFalse('new' in saved or 'a' in saved)
+        self.assertEqual(len(saved.get_data()), len(big) - 2)
+
+
+class YacoWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp("YacoWatcherTest")
+        os.makedirs(os.path.join(self.tmpdir, 'db'))
+        self.filename = os.path.join(self.tmpdir, 'db', 'main.config')
+        Yaco.Yaco({'host': 'a', 'port': 1}).save(self.filename)
+        Yaco.Yaco({'x': 1}).save(os.path.join(self.tmpdir, 'other.config'))
+
+    def change(self, **kwargs):
+        y = Yaco.Yaco({'host': 'a', 'port': 1})
+        y.update(kwargs)
+        # make sure the file signature changes
+        y.extra = 'x' * len(str(time.time()))
+        y.save(self.filename)
+
+    def test_check(self):
+        watcher = Yaco.YacoWatcher(Yaco.YacoDir(self.tmpdir, cache=False))
+        old = watcher.config
+        held = old.db
+        calls = []
+        watcher.on_change('db.main.host', lambda c, k: calls.append(k))
+        watcher.on_change('other', lambda c, k: calls.append(k))
+        self.assertEqual(watcher.check(), [])
+
+        self.change(host='b')
+        self.assertEqual(watcher.check(), ['db.main.extra', 'db.main.host'])
+        self.assertEqual(calls, [['db.main.host']])
+        self.assertEqual(watcher.config.db.main.host, 'b')
+        # the old tree is never modified - the new one only shares
+        # the unchanged branches with it
+        self.assertFalse(watcher.config is old)
+        self.assertEqual((old.db.main.host, held.main.host), ('a', 'a'))
+        self.assertTrue(watcher.config.get_path('other') is
+                        old.get_path('other'))
+
+    def test_consistent_swap(self):
+        root = os.path.join(self.tmpdir, '_x.config')
+        Yaco.Yaco({'a': 1, 'b': 1}).save(root)
+        watcher = Yaco.YacoWatcher(Yaco.YacoDir(self.tmpdir, cache=False))
+        old = watcher.config
+        Yaco.Yaco({'a': 2, 'b': 2, 'extra': 'xx'}).save(root)
+        self.assertEqual(watcher.check(), ['a', 'b', 'extra'])
+        self.assertEqual((old.a, old.b), (1, 1))
+        self.assertEqual((watcher.config.a, watcher.config.b), (2, 2))
+
+    def test_file_and_poly(self):
+        for source in (Yaco.YacoFile(self.filename),
+                       Yaco.PolyYaco(files=[self.filename])):
+            watcher = Yaco.YacoWatcher(source)
+            self.change(port=2)
+            self.assertEqual(watcher.check(), ['extra', 'port'])
+            self.assertEqual(watcher.config.port, 2)
+            self.assertEqual(watcher.check(), [])
+
+    def test_partial_write(self):
+        source = Yaco.YacoFile(self.filename)
+        watcher = Yaco.YacoWatcher(source, settle=0)
+        seen = []
+        watcher.on_change('', lambda c, k: seen.append(c.get('port')))
+        # the file is caught truncated - & the write is finished right
+        # after it is parsed
+        open(self.filename, 'w').close()
+        written = threading.Event()
+        reloaded = source._reloaded
+
+        def finish_write():
+            rv = reloaded()
+            if not written.is_set():
+                with open(self.filename, 'w') as F:
+                    F.write('host: a\nport: 5\n')
+                written.set()
+            return rv
+        source.__dict__['_reloaded'] = finish_write
+        watcher.check()
+        self.assertTrue(written.is_set())
+        self.assertEqual(seen, [5])
+        self.assertEqual(watcher.config.port, 5)
+
+    def test_inotify_keeps_watches(self):
+        try:
+            inotify = Yaco._Inotify()
+        except (OSError, AttributeError):
+            return
+        try:
+            sub = os.path.join(self.tmpdir, 'sub')
+            os.makedirs(sub)
+            inotify.watch([self.tmpdir, sub])
+            Yaco.Yaco({'x': 2}).save(os.path.join(sub, 'a.config'))
+            self.assertTrue(inotify.wait(1))
+            self.assertEqual(sorted(inotify._watched),
+                             sorted([self.tmpdir, sub]))
+            # a removed directory is forgotten - & watched again once
+            # it is recreated
+            shutil.rmtree(sub)
+            self.assertTrue(inotify.wait(1))
+            self.assertEqual(list(inotify._watched), [self.tmpdir])
+            os.makedirs(sub)
+            inotify.watch([self.tmpdir, sub])
+            self.assertTrue(sub in inotify._watched)
+        finally:
+            inotify.close()
+
+    def test_thread(self):
+        for use_inotify in (None, False):
+            watcher = Yaco.YacoWatcher(
+                Yaco.YacoDir(self.tmpdir, cache=False),
+                interval=0.05, use_inotify=use_inotify)
+            seen = []
+            watcher.on_change('db', lambda c, k: seen.append(c.db.main.port))
+            with watcher:
+                time.sleep(0.1)
+                self.change(port=use_inotify is None and 3 or 4)
+                for _ in range(100):
+                    if seen:
+                        break
+                    time.sleep(0.02)
+            self.assertEqual(seen, [use_inotify is None and 3 or 4])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)